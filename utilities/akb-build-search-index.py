@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""akb-build-search-index.py - Build and query a full-text search index of the AKB.
+
+Indexes every article dispatch.md lists (see akb-generate-dispatch.py) into
+search-index.json, a compact inverted index for BM25 ranking that a RAG
+service or agent can load once and query locally, instead of fetching
+dispatch.md and crawling pages. Each article contributes these fields,
+weighted by FIELD_WEIGHTS: its title, its `questions`, its `products` and
+`topics` tags, its headings, and its body text (minus frontmatter, comments
+and link targets). Terms are lowercased words; there is no stemming.
+
+The index also carries precomputed filters: the articles under each topic
+tag, publication_status and doc_type, so a query can be narrowed before
+anything is scored.
+
+build-site.py writes the index into agent-docs/assistant/, next to
+dispatch.md, on every build. This script can also write one from any
+assistant tree, and query an index file (or, without --index, a freshly
+built in-memory index of --assistant-dir):
+
+    python utilities/akb-build-search-index.py --output /tmp/search-index.json
+    python utilities/akb-build-search-index.py --query "curb ramp slope" --status published
+    python utilities/akb-build-search-index.py --index /tmp/search-index.json \\
+        --query "sidewalk width" --topic os-connect --json
+
+From Python, load_index() plus search() is the whole query API.
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from frontmatter import FRONTMATTER_RE, as_list, parse_lenient
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+DEFAULT_ASSISTANT_DIR = REPO_ROOT / "docs" / "assistant"
+
+INDEX_FILENAME = "search-index.json"
+INDEX_VERSION = 1
+
+# Per-field multipliers applied to term frequencies and document lengths
+# (a simplified BM25F): a match in a title or question outranks one in body text.
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "questions": 2.5,
+    "tags": 2.0,
+    "headings": 2.0,
+    "body": 1.0,
+}
+
+# BM25 parameters: term-frequency saturation and length normalization.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# The filters search() accepts, each mapped to the article record key it matches.
+FILTERS = {"topic": "topics", "status": "status", "doc_type": "doc_type"}
+
+DEFAULT_LIMIT = 10
+
+STOPWORDS = frozenset("""
+    a an and are as at be but by can do does for from has have how i if in is it
+    its of on or so that the their them then there these this to was were what
+    when where which who why will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_HEADING_RE = re.compile(r"^#{1,6}[ \t]+(.*?)[ \t#]*$", re.MULTILINE)
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+
+
+def _import_dispatch_generator():
+    """Import utilities/akb-generate-dispatch.py despite its hyphenated filename."""
+    module_path = SCRIPT_DIR / "akb-generate-dispatch.py"
+    spec = importlib.util.spec_from_file_location(
+        "akb_generate_dispatch", module_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"could not load module spec from {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# =============================================================================
+# Tokenizing
+# =============================================================================
+
+def tokenize(text):
+    """Return the index terms of text: lowercased words, minus STOPWORDS.
+
+    Words are runs of letters and digits, so ``is_sidepath:of:name`` yields
+    ``is``, ``sidepath``, ``of`` and ``name`` (then loses the stopwords).
+    """
+    return [term for term in _TOKEN_RE.findall(text.lower()) if term not in STOPWORDS]
+
+
+def article_fields(text, title, fm):
+    """Return {field: text} for one article's page text, title and nested frontmatter."""
+    match = FRONTMATTER_RE.match(text)
+    body = _HTML_COMMENT_RE.sub("", text[match.end():] if match else text)
+    body = _LINK_RE.sub(r"\1", body)
+    headings = _HEADING_RE.findall(body)
+    return {
+        "title": title,
+        "questions": "\n".join(as_list(fm.get("questions"))),
+        "tags": "\n".join(as_list(fm.get("products")) + as_list(fm.get("topics"))),
+        "headings": "\n".join(headings),
+        "body": _HEADING_RE.sub("", body),
+    }
+
+
+# =============================================================================
+# Building
+# =============================================================================
+
+def iter_articles(assistant_dir: Path, frontmatter=None):
+    """Yield (assistant-relative path, topic name, dispatch row) for every listed article.
+
+    frontmatter is passed to akb-generate-dispatch.py's scan_topics().
+    """
+    dispatch = _import_dispatch_generator()
+    for topic in dispatch.scan_topics(assistant_dir, frontmatter):
+        for doc_type, _label in dispatch.DOC_TYPE_SECTIONS:
+            for row in topic["sections"][doc_type]:
+                yield f"{topic['name']}/{doc_type}/{row['file']}", topic["name"], row
+
+
+def build_index(assistant_dir: Path, texts=None, frontmatter=None):
+    """Return the search index (search-index.json's content) for assistant_dir.
+
+    texts optionally maps assistant-relative POSIX paths (e.g.
+    ``alpha/concept/x.md``) to page text already in memory, and frontmatter
+    to parsed flat frontmatter (see akb-generate-dispatch.py's scan_topic()),
+    letting a caller that has already read the tree (build-site.py) skip
+    re-reading it. Any page missing from them is read from disk.
+
+    "docs" lists one record per article: its site-relative "path", "title",
+    "topic" (directory), "topics" (tags, always including the directory),
+    "doc_type", "status", "authority" and weighted "length". "postings" maps
+    each term to a flat [doc number, weighted term frequency, ...] list, and
+    "filters" maps each FILTERS name to {value: [doc numbers]}.
+    """
+    docs = []
+    postings = {}
+    texts = texts or {}
+    for rel, topic_name, row in iter_articles(assistant_dir, frontmatter):
+        text = texts.get(rel)
+        if text is None:
+            text = (assistant_dir / rel).read_text(encoding="utf-8")
+        fm = parse_lenient(text, f"assistant/{rel}")
+        fields = article_fields(text, row["title"], fm)
+        frequencies = Counter()
+        length = 0.0
+        for field, field_text in fields.items():
+            terms = tokenize(field_text)
+            weight = FIELD_WEIGHTS[field]
+            length += weight * len(terms)
+            for term in terms:
+                frequencies[term] += weight
+        number = len(docs)
+        for term, frequency in frequencies.items():
+            postings.setdefault(term, []).extend((number, frequency))
+        tags = [topic_name] + [tag for tag in as_list(fm.get("topics")) if tag != topic_name]
+        docs.append({
+            "path": f"assistant/{rel}",
+            "title": row["title"],
+            "topic": topic_name,
+            "topics": tags,
+            "doc_type": row["doc_type"],
+            "status": row["status"],
+            "authority": row["authority"],
+            "length": length,
+        })
+
+    filters = {}
+    for name, key in FILTERS.items():
+        values = {}
+        for number, doc in enumerate(docs):
+            for value in as_list(doc[key]):
+                values.setdefault(value, []).append(number)
+        filters[name] = dict(sorted(values.items()))
+
+    return {
+        "version": INDEX_VERSION,
+        "fields": FIELD_WEIGHTS,
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "avg_length": sum(doc["length"] for doc in docs) / len(docs) if docs else 0.0,
+        "docs": docs,
+        "filters": filters,
+        "postings": dict(sorted(postings.items())),
+    }
+
+
+def render_index(index):
+    """Return index as compact, deterministic JSON text."""
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def write_index(index, output_path: Path):
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(render_index(index), encoding="utf-8", newline="\n")
+    return output_path
+
+
+# =============================================================================
+# Querying
+# =============================================================================
+
+def load_index(path: Path):
+    """Return the index stored at path, raising ValueError if it is not a usable one."""
+    index = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        raise ValueError(f"{path}: not a version {INDEX_VERSION} search index")
+    return index
+
+
+def _allowed(index, filters):
+    """Return the set of doc numbers passing every given filter, or None for all."""
+    allowed = None
+    for name, wanted in filters.items():
+        if wanted is None:
+            continue
+        if name not in FILTERS:
+            raise ValueError(f"unknown filter {name!r}; expected one of {sorted(FILTERS)}")
+        table = index["filters"][name]
+        values = [wanted] if isinstance(wanted, str) else wanted
+        matches = {number for value in values for number in table.get(value, ())}
+        allowed = matches if allowed is None else allowed & matches
+    return allowed
+
+
+def search(index, query, limit=DEFAULT_LIMIT, **filters):
+    """Return the top articles in index for query, best first.
+
+    filters narrow the candidates by topic=, status= and/or doc_type=, each
+    one value or an iterable of accepted values (e.g. status=("published",
+    "draft")). Each result is the article's doc record plus its "score";
+    ties are broken by path.
+    """
+    allowed = _allowed(index, filters)
+    docs = index["docs"]
+    k1, b = index["k1"], index["b"]
+    avg_length = index["avg_length"] or 1.0
+    scores = {}
+    for term in dict.fromkeys(tokenize(query)):
+        posting = index["postings"].get(term)
+        if not posting:
+            continue
+        df = len(posting) // 2
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for i in range(0, len(posting), 2):
+            number, frequency = posting[i], posting[i + 1]
+            if allowed is not None and number not in allowed:
+                continue
+            norm = k1 * (1 - b + b * docs[number]["length"] / avg_length)
+            scores[number] = scores.get(number, 0.0) + (
+                idf * frequency * (k1 + 1) / (frequency + norm))
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], docs[item[0]]["path"]))
+    return [{**docs[number], "score": round(score, 4)} for number, score in ranked[:limit]]
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--assistant-dir", type=Path, default=DEFAULT_ASSISTANT_DIR,
+        help="Assistant knowledge-base directory to index "
+        "(default: docs/assistant/ relative to the repo root).",
+    )
+    parser.add_argument(
+        "--output", type=Path,
+        help=f"Write the index to this file (build-site.py writes {INDEX_FILENAME} "
+        "next to dispatch.md).",
+    )
+    parser.add_argument(
+        "--index", type=Path,
+        help="Query this index file instead of indexing --assistant-dir.",
+    )
+    parser.add_argument("--query", help="Search for these words and print the results.")
+    parser.add_argument("--topic", action="append", help="Only articles with this topic tag.")
+    parser.add_argument("--status", action="append",
+                        help="Only articles with this publication_status.")
+    parser.add_argument("--doc-type", action="append", choices=("concept", "workflow"),
+                        help="Only articles of this doc_type.")
+    parser.add_argument(
+        "--limit", type=int, default=DEFAULT_LIMIT,
+        help=f"Maximum results (default: {DEFAULT_LIMIT}).",
+    )
+    parser.add_argument("--json", dest="print_json", action="store_true",
+                        help="Print the results as JSON.")
+    args = parser.parse_args(argv)
+
+    if args.output is None and args.query is None:
+        parser.error("nothing to do: give --output and/or --query")
+    if args.index is not None and args.output is not None:
+        parser.error("--index and --output cannot be combined")
+
+    if args.index is not None:
+        try:
+            index = load_index(args.index)
+        except (OSError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+    else:
+        assistant_dir = args.assistant_dir.resolve()
+        if not assistant_dir.is_dir():
+            print(f"error: assistant directory not found: {assistant_dir}", file=sys.stderr)
+            return 1
+        index = build_index(assistant_dir)
+        if args.output is not None:
+            write_index(index, args.output)
+            print(f"Indexed {len(index['docs'])} articles, {len(index['postings'])} "
+                  f"terms: {args.output}")
+
+    if args.query is not None:
+        results = search(index, args.query, limit=args.limit, topic=args.topic,
+                         status=args.status, doc_type=args.doc_type)
+        if args.print_json:
+            print(json.dumps(results, ensure_ascii=False, indent=1))
+        elif not results:
+            print("No matches.")
+        else:
+            for result in results:
+                print(f"{result['score']:8.3f}  {result['path']}  "
+                      f"[{result['status']}] {result['title']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""akb-export-chunks.py - Export the AKB as section-level chunks for RAG ingestion.
+
+Splits every article dispatch.md lists (see akb-generate-dispatch.py) into
+one chunk per `## ` section (Short Answer, Significance, ... Related
+Concepts; see REQUIRED_SECTIONS in test_akb_content.py), plus a lead chunk
+for any text between the `# ` title and the first section. Chunks are
+written to chunks.ndjson, one compact JSON record per line, in dispatch
+order:
+
+  - "id"       stable chunk ID: the page's site path plus the section's
+               heading anchor (``assistant/accessmap/concept/x.md#example``),
+               so it doubles as a link to the rendered section
+  - "path", "anchor", "section" (heading text), "level" (1 for the lead
+    chunk, 2 for sections) and "ordinal" (position within the page)
+  - the article's dispatch fields ("topic", "title", "doc_type", "status",
+    "authority", "retrieval_priority", "last_reviewed") and frontmatter
+    "topics", "products" and "audiences" lists, for metadata filtering
+  - "tokens"   an estimate of the text's token count (CHARS_PER_TOKEN)
+  - "sha256"   hash of "text" alone
+  - "text"     the section's Markdown, minus its heading and HTML comments
+
+Placeholder sections (just "TODO", as in stubs) and empty ones are left
+out. An ingestion job can compare a new export with the previous one by id
+and sha256 and re-embed only the chunks whose text changed; diff_chunks()
+(or --previous) does that comparison, also reporting chunks whose text is
+unchanged but whose metadata is not.
+
+build-site.py writes chunks.ndjson into agent-docs/assistant/, next to
+dispatch.md, on every build, from the agent-layer (stripped) pages. This
+script can also export any assistant tree:
+
+    python utilities/akb-export-chunks.py --output /tmp/chunks.ndjson
+    python utilities/akb-export-chunks.py --output /tmp/new.ndjson --previous /tmp/chunks.ndjson
+    python utilities/akb-export-chunks.py | head -n 3
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import re
+import sys
+from pathlib import Path
+
+from frontmatter import FRONTMATTER_RE, as_list, parse_lenient
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent
+DEFAULT_ASSISTANT_DIR = REPO_ROOT / "docs" / "assistant"
+
+CHUNKS_FILENAME = "chunks.ndjson"
+
+# Rough tokens-per-character ratio of English prose under common BPE
+# tokenizers; "tokens" is meant for batching and context budgeting, not billing.
+CHARS_PER_TOKEN = 4
+
+# Section bodies that are authoring placeholders rather than content.
+PLACEHOLDER_TEXTS = frozenset({"", "TODO"})
+
+# Frontmatter lists copied onto every chunk of an article.
+LIST_FIELDS = ("topics", "products", "audiences")
+
+# Dispatch row fields copied onto every chunk of an article.
+ROW_FIELDS = ("title", "doc_type", "status", "authority", "retrieval_priority",
+              "last_reviewed")
+
+# The fields diff_chunks() compares besides "sha256".
+_METADATA_FIELDS = ("path", "anchor", "section", "level", "ordinal", "topic",
+                    *ROW_FIELDS, *LIST_FIELDS)
+
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_HEADING_RE = re.compile(r"^([ \t]*)(#{1,6})[ \t]+(.*?)[ \t#]*$")
+_HEADING_ATTR_LIST_RE = re.compile(r"\s*\{:?([^}]*)\}\s*$")
+_ATTR_ID_RE = re.compile(r"(?:^|\s)#([\w:.-]+)")
+_FENCE_RE = re.compile(r"^[ \t]*(`{3,}|~{3,})")
+_BLANK_RUN_RE = re.compile(r"\n{3,}")
+
+
+def _import_utility(filename, module_name):
+    """Import a sibling utilities/ script despite its hyphenated filename."""
+    module_path = SCRIPT_DIR / filename
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"could not load module spec from {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# =============================================================================
+# Splitting
+# =============================================================================
+
+def estimate_tokens(text):
+    """Return an estimate of text's token count: one per CHARS_PER_TOKEN characters."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _scan_page(text):
+    """Return (sections, headings) for a page; see split_sections().
+
+    sections is a list of [level, heading, body lines, heading number],
+    where heading number indexes headings (None for an untitled lead), and
+    headings lists (text, explicit id or None) for every heading on the
+    page, of any level, in order.
+    """
+    match = FRONTMATTER_RE.match(text)
+    body = _HTML_COMMENT_RE.sub("", text[match.end():] if match else text)
+    sections = [[1, "", [], None]]
+    headings = []
+    fence = None
+    for line in body.splitlines():
+        opener = _FENCE_RE.match(line)
+        if fence is not None:
+            if opener and opener.group(1)[0] == fence[0] and len(opener.group(1)) >= len(fence):
+                fence = None
+        elif opener:
+            fence = opener.group(1)
+        else:
+            heading = _HEADING_RE.match(line)
+            if heading:
+                indent, level, title = heading.group(1), len(heading.group(2)), heading.group(3)
+                attrs = _HEADING_ATTR_LIST_RE.search(title)
+                explicit = attrs and _ATTR_ID_RE.search(attrs.group(1))
+                if attrs:
+                    title = title[:attrs.start()]
+                headings.append((title, explicit.group(1) if explicit else None))
+                if not indent and level == 2:
+                    sections.append([2, title, [], len(headings) - 1])
+                    continue
+                if not indent and level == 1 and len(sections) == 1 and not sections[0][1]:
+                    sections[0][1], sections[0][3] = title, len(headings) - 1
+                    continue
+        sections[-1][2].append(line)
+    return sections, headings
+
+
+def split_sections(text):
+    """Return [(level, heading, body)] for a page: its lead and each `## ` section.
+
+    The lead is everything above the first `## ` heading, with heading the
+    page's `# ` title (or "" if it has none). HTML comments are removed and
+    bodies stripped. Headings inside fenced code blocks do not split the
+    page, and deeper headings stay in their section.
+    """
+    return [(level, heading, _BLANK_RUN_RE.sub("\n\n", "\n".join(lines)).strip())
+            for level, heading, lines, _number in _scan_page(text)[0]]
+
+
+def section_anchors(text, heading_slug):
+    """Return the anchor of each split_sections() section, as the toc extension sets them.
+
+    Every heading on the page counts towards toc's numbering, whatever its
+    level, as in build-site.py's heading_anchors(): heading_slug is its
+    heading_slug(), a repeated slug gets a ``_1``, ``_2``, ... suffix and an
+    attr_list ``{#id}`` replaces the slug. An untitled lead gets "".
+    """
+    sections, headings = _scan_page(text)
+    anchors, seen = [], set()
+    for title, explicit in headings:
+        if explicit:
+            candidate = explicit
+        else:
+            slug = heading_slug(title)
+            candidate, count = slug, 0
+            while candidate in seen or not candidate:
+                count += 1
+                candidate = f"{slug}_{count}"
+        seen.add(candidate)
+        anchors.append(candidate)
+    return ["" if number is None else anchors[number] for *_rest, number in sections]
+
+
+def article_chunks(path, topic_name, row, text, heading_slug):
+    """Return the chunk records for one article's page text.
+
+    path is the site-relative page path, and row its scan_topic() row.
+    """
+    fm = parse_lenient(text, path)
+    sections = split_sections(text)
+    anchors = section_anchors(text, heading_slug)
+    metadata = {"topic": topic_name}
+    metadata.update((field, row[field]) for field in ROW_FIELDS)
+    metadata.update((field, as_list(fm.get(field))) for field in LIST_FIELDS)
+    chunks = []
+    for ordinal, ((level, heading, body), anchor) in enumerate(zip(sections, anchors)):
+        if body in PLACEHOLDER_TEXTS:
+            continue
+        chunks.append({
+            "id": f"{path}#{anchor}" if anchor else path,
+            "path": path,
+            "anchor": anchor,
+            "section": heading,
+            "level": level,
+            "ordinal": ordinal,
+            **metadata,
+            "tokens": estimate_tokens(body),
+            "sha256": hashlib.sha256(body.encode("utf-8")).hexdigest(),
+            "text": body,
+        })
+    return chunks
+
+
+# =============================================================================
+# Exporting
+# =============================================================================
+
+def build_chunks(assistant_dir: Path, texts=None, frontmatter=None, heading_slug=None):
+    """Return the chunk records (chunks.ndjson's content) for assistant_dir.
+
+    texts and frontmatter are as for akb-build-search-index.py's
+    build_index(): page text and parsed flat frontmatter already in memory,
+    keyed by assistant-relative POSIX path, so build-site.py can skip
+    re-reading the tree. Any page missing from them is read from disk.
+
+    heading_slug is build-site.py's heading_slug(), which build-site.py
+    passes in; standalone callers may leave it out to have build-site.py
+    imported for it.
+    """
+    dispatch = _import_utility("akb-generate-dispatch.py", "akb_generate_dispatch")
+    if heading_slug is None:
+        heading_slug = _import_utility("build-site.py", "build_site").heading_slug
+    texts = texts or {}
+    chunks = []
+    for topic in dispatch.scan_topics(assistant_dir, frontmatter):
+        for doc_type, _label in dispatch.DOC_TYPE_SECTIONS:
+            for row in topic["sections"][doc_type]:
+                rel = f"{topic['name']}/{doc_type}/{row['file']}"
+                text = texts.get(rel)
+                if text is None:
+                    text = (assistant_dir / rel).read_text(encoding="utf-8")
+                chunks.extend(article_chunks(f"assistant/{rel}", topic["name"], row,
+                                             text, heading_slug))
+    return chunks
+
+
+def render_chunks(chunks):
+    """Return chunks as NDJSON (one compact JSON object per line)."""
+    return "".join(json.dumps(chunk, ensure_ascii=False, separators=(",", ":")) + "\n"
+                   for chunk in chunks)
+
+
+def write_chunks(chunks, output_path: Path):
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(render_chunks(chunks), encoding="utf-8", newline="\n")
+    return output_path
+
+
+def load_chunks(path: Path):
+    """Return the chunk records stored in the NDJSON file at path."""
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def diff_chunks(previous, current):
+    """Compare two exports; return what an ingestion job must (re-)process.
+
+    Returns {"added": [...], "changed": [...], "updated": [...],
+    "removed": [...], "unchanged": count}, each list of chunk ids in
+    current (or, for removed, previous) order. "changed" chunks have new
+    text and need re-embedding; "updated" ones have the same text (sha256)
+    but different metadata, so only their stored metadata needs refreshing.
+    """
+    old = {chunk["id"]: chunk for chunk in previous}
+    new_ids = {chunk["id"] for chunk in current}
+    diff = {"added": [], "changed": [], "updated": [], "removed": [], "unchanged": 0}
+    for chunk in current:
+        before = old.get(chunk["id"])
+        if before is None:
+            diff["added"].append(chunk["id"])
+        elif before.get("sha256") != chunk["sha256"]:
+            diff["changed"].append(chunk["id"])
+        elif any(before.get(field) != chunk.get(field) for field in _METADATA_FIELDS):
+            diff["updated"].append(chunk["id"])
+        else:
+            diff["unchanged"] += 1
+    diff["removed"] = [chunk["id"] for chunk in previous if chunk["id"] not in new_ids]
+    return diff
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--assistant-dir", type=Path, default=DEFAULT_ASSISTANT_DIR,
+        help="Assistant knowledge-base directory to export "
+        "(default: docs/assistant/ relative to the repo root).",
+    )
+    parser.add_argument(
+        "--output", type=Path,
+        help=f"Write the chunks to this file (build-site.py writes {CHUNKS_FILENAME} "
+        "next to dispatch.md). Without it (and --previous), they go to stdout.",
+    )
+    parser.add_argument(
+        "--previous", type=Path,
+        help="Compare with this earlier export and report the chunks that changed.",
+    )
+    parser.add_argument("--json", dest="print_json", action="store_true",
+                        help="With --previous, print the comparison as JSON.")
+    args = parser.parse_args(argv)
+
+    assistant_dir = args.assistant_dir.resolve()
+    if not assistant_dir.is_dir():
+        print(f"error: assistant directory not found: {assistant_dir}", file=sys.stderr)
+        return 1
+    chunks = build_chunks(assistant_dir)
+
+    if args.output is None and args.previous is None:
+        sys.stdout.write(render_chunks(chunks))
+        return 0
+    if args.output is not None:
+        write_chunks(chunks, args.output)
+        articles = len({chunk["path"] for chunk in chunks})
+        print(f"Exported {len(chunks)} chunks from {articles} articles "
+              f"(~{sum(chunk['tokens'] for chunk in chunks)} tokens): {args.output}")
+    if args.previous is not None:
+        try:
+            previous = load_chunks(args.previous)
+        except (OSError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+        diff = diff_chunks(previous, chunks)
+        if args.print_json:
+            print(json.dumps(diff, ensure_ascii=False, indent=1))
+        else:
+            print(f"{len(diff['added'])} added, {len(diff['changed'])} changed, "
+                  f"{len(diff['updated'])} metadata-only, {len(diff['removed'])} removed, "
+                  f"{diff['unchanged']} unchanged")
+            for name in ("added", "changed", "updated", "removed"):
+                for chunk_id in diff[name]:
+                    print(f"  {name:<8} {chunk_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
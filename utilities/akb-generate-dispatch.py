@@ -7,6 +7,31 @@ subdirectories of articles, and writes a dispatch.md registry file listing
 every article on disk together with its `publication_status` and
 `authority_level` frontmatter values.
 
+The same scan is also written as dispatch.json, a machine-readable registry
+for agents: one record per article with its path, title, doc_type, status,
+authority level, retrieval_priority, SHA-256 content hash and byte size, so
+an agent can look pages up (and validate its cached copies) from one small
+fetch instead of parsing the Markdown tables. It is a site build artifact,
+so it is only written on request (--registry; build-site.py always writes
+it into agent-docs/). --ndjson also writes the records one per line to
+dispatch.ndjson.
+
+Parsed frontmatter (and, for the registry, content hashes) are cached in
+.build-cache/dispatch-frontmatter.json, keyed by each file's size and mtime,
+so a regeneration only re-reads the articles that changed since the last
+run. --no-cache ignores the cache.
+
+The generated file's own last_reviewed date comes from --last-reviewed:
+"preserve" (the default) keeps the existing file's date, and leaves the file
+untouched, unless the registry content changed; "articles" uses the newest
+last_reviewed among the scanned articles; "today" always stamps today's
+date. The first two make dispatch.md byte-stable while nothing changes, so
+it does not churn commits, caches or incremental builds day to day.
+
+--check writes nothing: it exits non-zero if dispatch.md is out of date with
+the articles on disk (ignoring its last_reviewed date), e.g. for a
+pre-commit hook.
+
 dispatch.md is a GENERATED build artifact. It must never be hand-edited;
 re-run this script (directly, or via utilities/build-site.py) whenever a
 page is added, removed, or re-statused under the assistant tree.
@@ -17,16 +42,24 @@ the agent-docs/ copy).
 """
 
 import argparse
+import hashlib
+import json
 import re
 import sys
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
+from frontmatter import load as load_frontmatter, parse as parse_frontmatter, read_header
+
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent
 DEFAULT_ASSISTANT_DIR = REPO_ROOT / "docs" / "assistant"
 
+CACHE_PATH = REPO_ROOT / ".build-cache" / "dispatch-frontmatter.json"
+CACHE_VERSION = 2
+
 # Top-level files that live directly in the assistant root and are never
 # treated as topic directories or tabled as registry rows.
 TOP_LEVEL_PEERS = {"index.md", "dispatch.md", "schema.md", "intents.md"}
@@ -37,14 +70,24 @@ DOC_TYPE_SECTIONS = [
     ("workflow", "Workflows"),
 ]
 
+# Machine-readable registry files written next to dispatch.md.
+REGISTRY_JSON_FILENAME = "dispatch.json"
+REGISTRY_NDJSON_FILENAME = "dispatch.ndjson"
+REGISTRY_VERSION = 1
+
 # Statuses appear in the legend in this order.
 STATUS_ORDER = ("stub", "draft", "published", "archived")
 AUTHORITY_ORDER = ("provisional", "explanatory", "official")
 
-FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+LAST_REVIEWED_RE = re.compile(r"(?m)^last_reviewed:[ \t]*(\S+)")
+ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Where the generated file's last_reviewed date comes from; see the module
+# docstring and last_reviewed_date().
+LAST_REVIEWED_SOURCES = ("preserve", "articles", "today")
 
 # Static frontmatter for the generated file. `{last_reviewed}` is substituted
-# with today's date at generation time; every other field is fixed.
+# at generation time (see last_reviewed_date()); every other field is fixed.
 FRONTMATTER_TEMPLATE = """---
 title: Assistant Knowledge Base — Dispatch
 slug: dispatch
@@ -127,7 +170,7 @@ A stable registry decouples retrieval pipelines from the filesystem. Authors use
 
 ## How To Use This
 
-**Agents**: Fetch `dispatch.md`, parse the registry tables, filter by `Status` or topic heading, then retrieve individual pages by constructing their URL as `https://taskarcenteratuw.github.io/tcat-wiki/` + the `Base:` path shown under the relevant heading + the filename in the table.
+**Agents**: Fetch `dispatch.md`, parse the registry tables, filter by `Status` or topic heading, then retrieve individual pages by constructing their URL as `https://taskarcenteratuw.github.io/tcat-wiki/` + the `Base:` path shown under the relevant heading + the filename in the table. The same registry is published as `dispatch.json` (one record per article with its `path`, `title`, `doc_type`, `status`, `authority`, `retrieval_priority`, `sha256` and `size`), which needs no Markdown parsing; compare an article's `sha256` with that of a cached copy to tell whether it must be re-fetched.
 
 **Authors**: Write or edit files directly under `docs/assistant/`; do not hand-edit this file. Re-run `utilities/akb-generate-dispatch.py` (or the full `utilities/build-site.py` pipeline) to refresh the registry after adding a page or changing its `publication_status`.
 
@@ -160,45 +203,105 @@ This page should be fetched fresh rather than cached aggressively; its registry
 """
 
 
-def parse_frontmatter(text):
-    """Parse YAML frontmatter into a flat dict of top-level scalar keys.
+def topic_title_fallback(dir_name):
+    """Return a human-readable title for a topic directory lacking an index.md title."""
+    return dir_name.replace("-", " ").title()
+
 
-    Only extracts simple ``key: value`` pairs at zero indentation (not nested
-    maps or lists), which is sufficient for reading ``title`` and
-    ``publication_status`` and ``authority_level``.
+# =============================================================================
+# Frontmatter cache
+# =============================================================================
+
+def load_cache(assistant_dir: Path, cache_path=CACHE_PATH):
+    """Return the cached {assistant-relative path: entry} mapping for assistant_dir.
+
+    Each entry records the file's "size" and "mtime_ns" and, once computed,
+    its parsed "frontmatter" and content "sha256". Returns {} if the cache is
+    absent, unusable, or was written for another assistant_dir.
     """
-    match = FRONTMATTER_RE.match(text)
-    if not match:
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
         return {}
-    props = {}
-    for line in match.group(1).split("\n"):
-        if not line or line[0] in " \t#-":
-            continue
-        if ":" not in line:
-            continue
-        key, _, value = line.partition(":")
-        key = key.strip()
-        value = value.strip()
-        if len(value) >= 2 and value[0] in "'\"" and value[-1] == value[0]:
-            value = value[1:-1]
-        if value:
-            props[key] = value
-    return props
+    if (not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION
+            or cache.get("assistant_dir") != str(assistant_dir.resolve())):
+        return {}
+    return cache.get("files", {})
 
 
-def topic_title_fallback(dir_name):
-    """Return a human-readable title for a topic directory lacking an index.md title."""
-    return dir_name.replace("-", " ").title()
+def save_cache(cache, assistant_dir: Path, cache_path=CACHE_PATH):
+    """Write cache (see load_cache()), dropping entries for files that no longer exist."""
+    files = {key: entry for key, entry in sorted(cache.items())
+             if (assistant_dir / key).is_file()}
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"version": CACHE_VERSION, "assistant_dir": str(assistant_dir.resolve()),
+                    "files": files}, ensure_ascii=False, indent=1) + "\n",
+        encoding="utf-8", newline="\n")
 
 
-def scan_topic(topic_dir: Path):
-    """Return a dict describing one topic directory's index title and article rows."""
+def _cache_entry(cache, key, path: Path):
+    """Return cache[key] for path, replaced by a fresh entry if the file changed."""
+    stat = path.stat()
+    entry = cache.get(key)
+    if (entry is None or entry.get("size") != stat.st_size
+            or entry.get("mtime_ns") != stat.st_mtime_ns):
+        entry = cache[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return entry
+
+
+def _read_frontmatter(path: Path, key, frontmatter=None, cache=None):
+    """Return the parsed frontmatter of path, preferring frontmatter[key] if given.
+
+    Otherwise uses (and fills in) cache, if given (see load_cache()).
+    """
+    if frontmatter is not None and key in frontmatter:
+        return frontmatter[key]
+    if cache is None:
+        return load_frontmatter(path)
+    entry = _cache_entry(cache, key, path)
+    if "frontmatter" not in entry:
+        entry["frontmatter"] = parse_frontmatter(read_header(path))
+    return entry["frontmatter"]
+
+
+def _file_digest(path: Path, key, cache=None):
+    """Return (sha256 hex digest, size) of path, using cache if given."""
+    if cache is not None:
+        entry = _cache_entry(cache, key, path)
+        if "sha256" in entry:
+            return entry["sha256"], entry["size"]
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if cache is not None:
+        entry["sha256"] = digest
+    return digest, len(data)
+
+
+# =============================================================================
+# Scanning
+# =============================================================================
+
+def scan_topic(topic_dir: Path, frontmatter=None, cache=None):
+    """Return a dict describing one topic directory's index title and article rows.
+
+    Each row is a dict of the article's "file" name and its "title",
+    "doc_type", "status" (publication_status), "authority" (authority_level)
+    "retrieval_priority" and "last_reviewed" frontmatter, with the registry's
+    defaults for missing values.
+
+    frontmatter optionally maps assistant-relative POSIX paths (e.g.
+    ``alpha/concept/x.md``) to already-parsed frontmatter dicts, letting a
+    caller that has already read the tree (build-site.py) skip re-reading it.
+    cache is an optional frontmatter cache (see load_cache()), keyed the same
+    way, consulted for any page not in frontmatter.
+    """
     index_path = topic_dir / "index.md"
     title = None
     has_index = index_path.exists()
     if has_index:
-        title = parse_frontmatter(
-            index_path.read_text(encoding="utf-8")).get("title")
+        title = _read_frontmatter(
+            index_path, f"{topic_dir.name}/index.md", frontmatter, cache).get("title")
     if not title:
         title = topic_title_fallback(topic_dir.name)
 
@@ -208,10 +311,18 @@ def scan_topic(topic_dir: Path):
         rows = []
         if doc_dir.is_dir():
             for md_file in sorted(doc_dir.glob("*.md"), key=lambda p: p.name):
-                fm = parse_frontmatter(md_file.read_text(encoding="utf-8"))
-                status = fm.get("publication_status", "stub")
-                authority = fm.get("authority_level", "provisional")
-                rows.append((md_file.name, status, authority))
+                fm = _read_frontmatter(
+                    md_file, f"{topic_dir.name}/{doc_type}/{md_file.name}",
+                    frontmatter, cache)
+                rows.append({
+                    "file": md_file.name,
+                    "title": fm.get("title") or md_file.stem,
+                    "doc_type": fm.get("doc_type", doc_type),
+                    "status": fm.get("publication_status", "stub"),
+                    "authority": fm.get("authority_level", "provisional"),
+                    "retrieval_priority": fm.get("retrieval_priority"),
+                    "last_reviewed": fm.get("last_reviewed"),
+                })
         sections[doc_type] = rows
 
     return {
@@ -222,15 +333,23 @@ def scan_topic(topic_dir: Path):
     }
 
 
-def scan_topics(assistant_dir: Path):
-    """Return a list of topic dicts for every subdirectory of assistant_dir, alphabetical."""
-    topics = []
+def scan_topics(assistant_dir: Path, frontmatter=None, cache=None, jobs=None):
+    """Return a list of topic dicts for every subdirectory of assistant_dir, alphabetical.
+
+    Topics are scanned concurrently on up to jobs threads (default: the
+    ThreadPoolExecutor default; 1 scans serially), which overlaps the many
+    small reads on slow or network filesystems. See scan_topic() for
+    frontmatter and cache.
+    """
     if not assistant_dir.is_dir():
-        return topics
-    for entry in sorted(assistant_dir.iterdir(), key=lambda p: p.name):
-        if entry.is_dir():
-            topics.append(scan_topic(entry))
-    return topics
+        return []
+    topic_dirs = [entry for entry in sorted(assistant_dir.iterdir(), key=lambda p: p.name)
+                  if entry.is_dir()]
+    if jobs == 1 or len(topic_dirs) < 2:
+        return [scan_topic(topic_dir, frontmatter, cache) for topic_dir in topic_dirs]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(lambda topic_dir: scan_topic(topic_dir, frontmatter, cache),
+                             topic_dirs))
 
 
 def count_statuses(topics):
@@ -238,8 +357,7 @@ def count_statuses(topics):
     counts = Counter()
     for topic in topics:
         for doc_type, _label in DOC_TYPE_SECTIONS:
-            counts.update(status for _filename, status, _authority
-                          in topic["sections"][doc_type])
+            counts.update(row["status"] for row in topic["sections"][doc_type])
     return counts
 
 
@@ -248,8 +366,7 @@ def count_authority_levels(topics):
     counts = Counter()
     for topic in topics:
         for doc_type, _label in DOC_TYPE_SECTIONS:
-            counts.update(authority for _filename, _status, authority
-                          in topic["sections"][doc_type])
+            counts.update(row["authority"] for row in topic["sections"][doc_type])
     return counts
 
 
@@ -304,8 +421,8 @@ def render_topic(topic):
         lines.append("")
         lines.append("| File | Status |")
         lines.append("| :--- | :----- |")
-        for fname, status, _authority in rows:
-            lines.append(f"| `{fname}` | {status} |")
+        for row in rows:
+            lines.append(f"| `{row['file']}` | {row['status']} |")
         lines.append("")
 
     return "\n".join(lines).rstrip("\n")
@@ -317,26 +434,160 @@ def render_registry(topics):
     return "\n\n".join(blocks) + "\n"
 
 
-def build_dispatch(assistant_dir: Path, today: str | None = None) -> str:
-    """Return the complete generated dispatch.md content for assistant_dir."""
-    if today is None:
-        today = date.today().isoformat()
-    topics = scan_topics(assistant_dir)
-    frontmatter = FRONTMATTER_TEMPLATE.format(last_reviewed=today)
+def newest_last_reviewed(topics):
+    """Return the latest ISO last_reviewed date of any article in topics, or None."""
+    return max((row["last_reviewed"] for topic in topics
+                for doc_type, _label in DOC_TYPE_SECTIONS
+                for row in topic["sections"][doc_type]
+                if ISO_DATE_RE.fullmatch(row["last_reviewed"] or "")), default=None)
+
+
+def render_dispatch(topics, last_reviewed):
+    """Return the dispatch.md content for a scan_topics() result."""
+    frontmatter = FRONTMATTER_TEMPLATE.format(last_reviewed=last_reviewed)
     body_prefix = BODY_PREFIX.format(
         status_legend=render_status_legend(count_statuses(topics)),
         authority_legend=render_authority_legend(count_authority_levels(topics)))
     return frontmatter + body_prefix + render_registry(topics)
 
 
-def write_dispatch(assistant_dir: Path, today: str | None = None) -> Path:
-    """Generate dispatch.md content and write it into assistant_dir. Return the path written."""
-    content = build_dispatch(assistant_dir, today=today)
+def _existing_dispatch(assistant_dir: Path):
+    """Return (text, last_reviewed) of assistant_dir's dispatch.md, or (None, None)."""
+    try:
+        text = (assistant_dir / "dispatch.md").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None, None
+    match = LAST_REVIEWED_RE.search(text)
+    return text, match.group(1) if match else None
+
+
+def last_reviewed_date(assistant_dir: Path, topics, source="preserve"):
+    """Return the last_reviewed date to stamp into dispatch.md for topics.
+
+    source is one of LAST_REVIEWED_SOURCES: "preserve" keeps the date of the
+    existing dispatch.md if re-rendering with it reproduces the file;
+    "articles" takes newest_last_reviewed(topics). Both fall back to today.
+    """
+    if source not in LAST_REVIEWED_SOURCES:
+        raise ValueError(f"unknown last_reviewed source: {source!r}")
+    if source == "preserve":
+        existing, existing_date = _existing_dispatch(assistant_dir)
+        if existing_date and render_dispatch(topics, existing_date) == existing:
+            return existing_date
+    elif source == "articles":
+        newest = newest_last_reviewed(topics)
+        if newest:
+            return newest
+    return date.today().isoformat()
+
+
+def build_dispatch(assistant_dir: Path, today: str | None = None,
+                   frontmatter=None, topics=None, cache=None,
+                   last_reviewed="today") -> str:
+    """Return the complete generated dispatch.md content for assistant_dir.
+
+    See scan_topic() for frontmatter and cache. topics, if given, is an
+    existing scan_topics() result to render instead of scanning again.
+    The last_reviewed date is today, if given, or else comes from the
+    last_reviewed source (see last_reviewed_date()).
+    """
+    if topics is None:
+        topics = scan_topics(assistant_dir, frontmatter, cache)
+    if today is None:
+        today = last_reviewed_date(assistant_dir, topics, last_reviewed)
+    return render_dispatch(topics, today)
+
+
+def build_registry(assistant_dir: Path, topics, cache=None):
+    """Return the machine-readable registry (dispatch.json) for a scan_topics() result.
+
+    Each article record carries its site-relative "path" (e.g.
+    ``assistant/alpha/concept/x.md``), "topic", the scan_topic() row fields,
+    and the "sha256" and "size" in bytes of the file on disk in assistant_dir
+    (taken from cache, if given and still current; see load_cache()).
+    """
+    articles = []
+    for topic in topics:
+        for doc_type, _label in DOC_TYPE_SECTIONS:
+            for row in topic["sections"][doc_type]:
+                key = f"{topic['name']}/{doc_type}/{row['file']}"
+                digest, size = _file_digest(assistant_dir / key, key, cache)
+                articles.append({
+                    "path": f"assistant/{topic['name']}/{doc_type}/{row['file']}",
+                    "topic": topic["name"],
+                    "title": row["title"],
+                    "doc_type": row["doc_type"],
+                    "status": row["status"],
+                    "authority": row["authority"],
+                    "retrieval_priority": row["retrieval_priority"],
+                    "last_reviewed": row["last_reviewed"],
+                    "sha256": digest,
+                    "size": size,
+                })
+    return {"version": REGISTRY_VERSION, "articles": articles}
+
+
+def render_registry_json(registry):
+    return json.dumps(registry, ensure_ascii=False, indent=1) + "\n"
+
+
+def render_registry_ndjson(registry):
+    """Return registry's article records as NDJSON (one compact JSON object per line)."""
+    return "".join(json.dumps(article, ensure_ascii=False, separators=(",", ":")) + "\n"
+                   for article in registry["articles"])
+
+
+def write_registry(assistant_dir: Path, topics, ndjson=False, cache=None):
+    """Write dispatch.json (and, with ndjson=True, dispatch.ndjson) into assistant_dir.
+
+    See build_registry() for cache. Returns the paths written.
+    """
+    registry = build_registry(assistant_dir, topics, cache)
+    outputs = [(assistant_dir / REGISTRY_JSON_FILENAME, render_registry_json(registry))]
+    if ndjson:
+        outputs.append((assistant_dir / REGISTRY_NDJSON_FILENAME,
+                        render_registry_ndjson(registry)))
+    for path, text in outputs:
+        path.write_text(text, encoding="utf-8", newline="\n")
+    return [path for path, _text in outputs]
+
+
+def write_dispatch(assistant_dir: Path, today: str | None = None,
+                   frontmatter=None, registry=False, ndjson=False, cache=None,
+                   last_reviewed="today") -> Path:
+    """Generate dispatch.md content and write it into assistant_dir. Return the path.
+
+    The file is left untouched if its content (ignoring line endings) would
+    not change. With registry=True, dispatch.json (and, with ndjson=True,
+    dispatch.ndjson) are written from the same scan; see write_registry().
+    See scan_topic() for frontmatter and cache, and build_dispatch() for
+    today and last_reviewed.
+    """
+    topics = scan_topics(assistant_dir, frontmatter, cache)
+    content = build_dispatch(assistant_dir, today=today, topics=topics,
+                             last_reviewed=last_reviewed)
     output_path = assistant_dir / "dispatch.md"
-    output_path.write_text(content, encoding="utf-8", newline="\r\n")
+    if _existing_dispatch(assistant_dir)[0] != content:
+        output_path.write_text(content, encoding="utf-8", newline="\r\n")
+    if registry:
+        write_registry(assistant_dir, topics, ndjson=ndjson, cache=cache)
     return output_path
 
 
+def check_dispatch(assistant_dir: Path, frontmatter=None, cache=None):
+    """Return True if assistant_dir's dispatch.md matches what would be generated.
+
+    The existing file's last_reviewed date is kept for the comparison, so a
+    file only counts as stale when the registry content itself changed. Line
+    endings are ignored. Nothing is written.
+    """
+    current, current_date = _existing_dispatch(assistant_dir)
+    if current is None:
+        return False
+    topics = scan_topics(assistant_dir, frontmatter, cache)
+    return current == render_dispatch(topics, current_date or date.today().isoformat())
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -352,6 +603,45 @@ def main(argv=None):
         action="store_true",
         help="Print the generated content to stdout instead of writing dispatch.md.",
     )
+    parser.add_argument(
+        "--json",
+        dest="print_json",
+        action="store_true",
+        help="With --print, print the dispatch.json registry instead of dispatch.md.",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Write nothing; exit 1 if dispatch.md is out of date.",
+    )
+    parser.add_argument(
+        "--last-reviewed",
+        choices=LAST_REVIEWED_SOURCES,
+        default="preserve",
+        help="Where dispatch.md's last_reviewed date comes from (default: "
+        "preserve the existing date unless the registry changed).",
+    )
+    parser.add_argument(
+        "--registry",
+        action="store_true",
+        help="Also write the dispatch.json registry next to dispatch.md.",
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="With --registry, also write it one article per line to dispatch.ndjson.",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=CACHE_PATH,
+        help="Frontmatter cache file (default: .build-cache/dispatch-frontmatter.json).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-read every article, ignoring (and not updating) the cache.",
+    )
     args = parser.parse_args(argv)
 
     assistant_dir = args.assistant_dir.resolve()
@@ -360,13 +650,35 @@ def main(argv=None):
             f"error: assistant directory not found: {assistant_dir}", file=sys.stderr)
         return 1
 
-    if args.print_only:
-        print(build_dispatch(assistant_dir), end="")
+    cache = None if args.no_cache else load_cache(assistant_dir, args.cache)
+    try:
+        if args.check:
+            if check_dispatch(assistant_dir, cache=cache):
+                print(f"Up to date: {assistant_dir / 'dispatch.md'}")
+                return 0
+            print(f"error: {assistant_dir / 'dispatch.md'} is out of date; re-run "
+                  "utilities/akb-generate-dispatch.py", file=sys.stderr)
+            return 1
+
+        if args.print_only:
+            topics = scan_topics(assistant_dir, cache=cache)
+            if args.print_json:
+                registry = build_registry(assistant_dir, topics, cache)
+                print(render_registry_json(registry), end="")
+            else:
+                print(build_dispatch(assistant_dir, topics=topics,
+                                     last_reviewed=args.last_reviewed), end="")
+            return 0
+
+        output_path = write_dispatch(assistant_dir, registry=args.registry,
+                                     ndjson=args.ndjson, cache=cache,
+                                     last_reviewed=args.last_reviewed)
+        print(f"Wrote {output_path}")
         return 0
-
-    output_path = write_dispatch(assistant_dir)
-    print(f"Wrote {output_path}")
-    return 0
+    finally:
+        # --check only reads: it may use the cache, but never updates it.
+        if cache is not None and not args.check:
+            save_cache(cache, assistant_dir, args.cache)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""bench-build-site.py - Benchmark build-site.py over synthetic large docs trees.
+
+Generates a deterministic synthetic docs/ tree for each requested size
+(product guides plus an assistant knowledge base, with realistic frontmatter,
+cross-links with #anchors, images, inline images, `@format` pragmas and
+<img-comparison-slider> blocks), then times these build-site.py stages on
+it, keeping the best of --repeat runs:
+
+  - prepare              the full prep pipeline
+  - filter_human_docs    on a fresh human-docs/ copy
+  - strip_agent_docs     on a fresh agent-docs/ copy
+  - overlay_agent_layer  onto an empty site/
+
+Prints seconds and pages/second per stage and size. With --save-baseline the
+results are written as the baseline (default .build-cache/bench-baseline.json);
+otherwise, when a baseline exists, each result is compared against it and
+the script exits non-zero if any stage got slower than the baseline by more
+than --threshold (a fraction; default 0.25, i.e. 25%). Baselines are only
+meaningful on the machine that recorded them.
+
+This is not part of the pytest suite; run it by hand or from CI:
+
+    python utilities/bench-build-site.py --sizes 1000 10000 50000 --save-baseline
+    python utilities/bench-build-site.py --sizes 1000 10000 50000
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import posixpath
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.resolve()
+
+BASELINE_PATH = REPO_ROOT / ".build-cache" / "bench-baseline.json"
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (1000, 10000, 50000)
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+
+BENCHMARKS = ("prepare", "filter_human_docs", "strip_agent_docs", "overlay_agent_layer")
+
+# Shape of the synthetic tree: roughly the real wiki's mix of product guides
+# and assistant articles.
+PRODUCT_COUNT = 20
+IMAGES_PER_PRODUCT = 10
+IMAGE_BYTES = 16 * 1024
+ASSISTANT_SHARE = 0.3
+ARTICLES_PER_TOPIC = 50
+STATUS_WEIGHTS = {"published": 6, "draft": 3, "stub": 1}
+AUTHORITY_LEVELS = ("provisional", "explanatory", "official")
+SECTIONS = ("Overview", "Before You Begin", "Steps", "Troubleshooting")
+LINKS_PER_PAGE = 4
+SLIDER_EVERY = 10
+
+WORDS = (
+    "sidewalk crossing curb ramp path network accessibility pedestrian route "
+    "mapping survey tag schema edge node feature dataset workspace project "
+    "validation export import review contributor imagery quality report "
+    "transit stop elevation incline surface width barrier entrance"
+).split()
+
+
+def _import_build_site():
+    """Import utilities/build-site.py despite its hyphenated filename."""
+    module_path = SCRIPT_DIR / "build-site.py"
+    spec = importlib.util.spec_from_file_location("build_site", module_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"could not load module spec from {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# =============================================================================
+# Synthetic docs tree
+# =============================================================================
+
+def _paragraph(rng, words=60):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def _frontmatter(fields):
+    lines = ["---"]
+    for key, value in fields.items():
+        if isinstance(value, list):
+            lines.append(f"{key}:")
+            lines.extend(f"    - {item}" for item in value)
+        else:
+            lines.append(f"{key}: {value}")
+    lines.append("---")
+    return "\n".join(lines) + "\n\n"
+
+
+def _page_text(rng, rel, fields, links, images, slider):
+    """Return one synthetic page: frontmatter, pragma, sections, links, images."""
+    parts = [_frontmatter(fields), "<!-- @format -->\n\n", f"# {fields['title']}\n\n",
+             _paragraph(rng), "\n\n"]
+    page_dir = posixpath.dirname(rel)
+    for index, section in enumerate(SECTIONS):
+        parts.append(f"## {section}\n\n{_paragraph(rng)}\n\n")
+        if index < len(links):
+            target, anchor = links[index]
+            href = posixpath.relpath(target, page_dir or ".")
+            parts.append(f"See [{section.lower()} details]({href}#{anchor}).\n\n")
+        if images and index == 0:
+            image = posixpath.relpath(rng.choice(images), page_dir or ".")
+            parts.append(f"![Screenshot]({image})\n\n")
+            parts.append(f"Inline icon ![icon]({image}#only-light) in text.\n\n")
+    if slider and images:
+        first, second = (posixpath.relpath(rng.choice(images), page_dir or ".")
+                         for _ in range(2))
+        parts.append(
+            "<img-comparison-slider>\n"
+            f'<img slot="first" src="{first}">\n'
+            f'<img slot="second" src="{second}">\n'
+            "</img-comparison-slider>\n\n")
+    return "".join(parts)
+
+
+def _section_anchor(rng):
+    section = rng.choice(SECTIONS)
+    return section.lower().replace(" ", "-")
+
+
+def generate_tree(docs_dir, pages, seed=0):
+    """Write a deterministic synthetic docs tree of about `pages` Markdown pages.
+
+    Every internal link resolves and every published page only links to
+    published pages, so the tree passes build-site.py's validation. Returns
+    the number of Markdown pages written.
+    """
+    rng = random.Random(seed)
+    assistant_pages = int(pages * ASSISTANT_SHARE)
+    topic_count = max(1, assistant_pages // (ARTICLES_PER_TOPIC + 1))
+    articles = []
+    for index in range(max(0, assistant_pages - topic_count - 2)):
+        topic = f"topic-{index % topic_count:03d}"
+        doc_type = "concept" if index % 3 else "workflow"
+        status = rng.choices(list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values()))[0]
+        articles.append((f"assistant/{topic}/{doc_type}/article-{index:05d}.md", status))
+    published = [rel for rel, status in articles if status == "published"]
+
+    guide_count = max(1, pages - assistant_pages - 1)
+    guides = [f"product-{index % PRODUCT_COUNT:02d}/guide-{index:05d}.md"
+              for index in range(guide_count)]
+    images = [f"product-{product:02d}/images/shot-{image}.png"
+              for product in range(PRODUCT_COUNT) for image in range(IMAGES_PER_PRODUCT)]
+
+    for rel in images:
+        path = docs_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(rng.randbytes(IMAGE_BYTES))
+
+    written = []
+
+    def write(rel, text):
+        path = docs_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8", newline="\n")
+        written.append(rel)
+
+    write("index.md", _page_text(rng, "index.md", {"title": "Home"},
+                                 [(guide, "overview") for guide in guides[:LINKS_PER_PAGE]],
+                                 images, False))
+    for number, rel in enumerate(guides):
+        targets = rng.sample(guides, min(LINKS_PER_PAGE - 1, len(guides)))
+        if published:
+            targets.append(rng.choice(published))
+        links = [(target, _section_anchor(rng)) for target in targets]
+        product_images = [image for image in images
+                          if image.startswith(rel.split("/", 1)[0] + "/")]
+        write(rel, _page_text(
+            rng, rel, {"title": f"Guide {number}", "tags": ["guide", "mapping"]},
+            links, product_images, number % SLIDER_EVERY == 0))
+
+    for rel in ("assistant/index.md", "assistant/schema.md"):
+        write(rel, _page_text(
+            rng, rel, {"title": "Assistant", "publication_status": "published"},
+            [], [], False))
+    for topic in range(topic_count):
+        rel = f"assistant/topic-{topic:03d}/index.md"
+        write(rel, _page_text(
+            rng, rel, {"title": f"Topic {topic}", "publication_status": "published"},
+            [], [], False))
+    for rel, status in articles:
+        pool = published if status == "published" else published + [
+            other for other, _status in articles[:LINKS_PER_PAGE]]
+        targets = rng.sample(pool, min(LINKS_PER_PAGE, len(pool)))
+        links = [(target, _section_anchor(rng)) for target in targets if target != rel]
+        write(rel, _page_text(
+            rng, rel,
+            {"title": f"Article {posixpath.basename(rel)[8:-3]}",
+             "doc_type": rel.split("/")[2], "publication_status": status,
+             "authority_level": rng.choice(AUTHORITY_LEVELS),
+             "last_reviewed": "2026-01-01", "products": ["OpenSidewalks", "TDEI"]},
+            links, [], False))
+    return len(written)
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def _reset(*paths):
+    for path in paths:
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+
+
+def run_benchmarks(build_site, docs_dir, work_dir, repeat=DEFAULT_REPEAT, jobs=None):
+    """Time each of BENCHMARKS on docs_dir; return {name: best seconds}.
+
+    Outputs are written under work_dir, which is recreated for every run.
+    """
+    human_dir, agent_dir = work_dir / "human-docs", work_dir / "agent-docs"
+    site_dir = work_dir / "site"
+    source_config = work_dir / "zensical.toml"
+    build_config = work_dir / "zensical.build.toml"
+    manifest_path = work_dir / ".build-cache" / "manifest.json"
+    documents = build_site.scan_documents(docs_dir)
+    best = {name: float("inf") for name in BENCHMARKS}
+
+    for _ in range(repeat):
+        _reset(work_dir)
+        work_dir.mkdir(parents=True)
+        source_config.write_text('[project]\nsite_name = "Benchmark"\n', encoding="utf-8")
+
+        seconds, summary = _timed(
+            build_site.prepare, docs_dir, human_dir, agent_dir, source_config,
+            build_config, manifest_path=manifest_path, jobs=jobs)
+        best["prepare"] = min(best["prepare"], seconds)
+
+        seconds, _ = _timed(build_site.overlay_agent_layer, agent_dir, site_dir,
+                            pages=summary["pages"])
+        best["overlay_agent_layer"] = min(best["overlay_agent_layer"], seconds)
+
+        _reset(human_dir, agent_dir)
+        build_site.copy_layers(docs_dir, human_dir, agent_dir)
+        seconds, _ = _timed(build_site.filter_human_docs, human_dir, documents)
+        best["filter_human_docs"] = min(best["filter_human_docs"], seconds)
+        seconds, _ = _timed(build_site.strip_agent_docs, agent_dir, documents, jobs)
+        best["strip_agent_docs"] = min(best["strip_agent_docs"], seconds)
+
+    _reset(work_dir)
+    return best
+
+
+def benchmark_sizes(sizes, work_root, repeat=DEFAULT_REPEAT, jobs=None, seed=0):
+    """Generate and benchmark a tree per size; return a results dict (see compare())."""
+    build_site = _import_build_site()
+    results = {}
+    for size in sizes:
+        docs_dir = work_root / f"docs-{size}"
+        _reset(docs_dir)
+        page_count = generate_tree(docs_dir, size, seed)
+        timings = run_benchmarks(build_site, docs_dir, work_root / f"out-{size}",
+                                 repeat, jobs)
+        results[str(size)] = {
+            name: {"seconds": round(seconds, 6),
+                   "pages_per_second": round(page_count / seconds, 1)}
+            for name, seconds in timings.items()
+        }
+        _reset(docs_dir)
+    return {
+        "version": RESULTS_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpu_count": os.cpu_count()},
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return regressions of results against baseline, as a list of dicts.
+
+    A regression is a (size, stage) present in both whose seconds exceed the
+    baseline's by more than threshold (a fraction). Each dict has "size",
+    "stage", "baseline", "current" (seconds) and "ratio".
+    """
+    regressions = []
+    for size, stages in results["results"].items():
+        for stage, current in stages.items():
+            previous = baseline.get("results", {}).get(size, {}).get(stage)
+            if not previous or not previous["seconds"]:
+                continue
+            ratio = current["seconds"] / previous["seconds"]
+            if ratio > 1 + threshold:
+                regressions.append({"size": size, "stage": stage,
+                                    "baseline": previous["seconds"],
+                                    "current": current["seconds"],
+                                    "ratio": round(ratio, 3)})
+    return regressions
+
+
+def format_results(results):
+    """Return a plain-text table of a benchmark_sizes() result."""
+    lines = [f"{'pages':>7}  {'stage':<20}  {'seconds':>9}  {'pages/s':>10}"]
+    for size, stages in results["results"].items():
+        for stage, timing in stages.items():
+            lines.append(f"{size:>7}  {stage:<20}  {timing['seconds']:>9.3f}  "
+                         f"{timing['pages_per_second']:>10.0f}")
+    return "\n".join(lines)
+
+
+def _write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8", newline="\n")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), metavar="PAGES",
+        help="Synthetic tree sizes, in pages (default: 1000 10000 50000).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT,
+        help=f"Runs per size; the fastest is kept (default: {DEFAULT_REPEAT}).",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None,
+        help="Passed to build-site.py's strip stage (default: CPU count).",
+    )
+    parser.add_argument(
+        "--work-dir", type=Path, default=None,
+        help="Where to generate trees and outputs (default: a temporary directory).",
+    )
+    parser.add_argument(
+        "--baseline", type=Path, default=BASELINE_PATH,
+        help="Baseline results file (default: .build-cache/bench-baseline.json).",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="Write these results as the new baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown versus the baseline, as a fraction "
+        f"(default: {DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None,
+        help="Also write these results as JSON to this path.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1 or any(size < 1 for size in args.sizes):
+        print("error: --repeat and --sizes must be at least 1", file=sys.stderr)
+        return 1
+
+    if args.work_dir is None:
+        with tempfile.TemporaryDirectory(prefix="tcat-bench-") as tmp:
+            results = benchmark_sizes(args.sizes, Path(tmp), args.repeat, args.jobs)
+    else:
+        results = benchmark_sizes(args.sizes, args.work_dir, args.repeat, args.jobs)
+    print(format_results(results))
+    if args.output:
+        _write_json(args.output, results)
+
+    if args.save_baseline:
+        _write_json(args.baseline, results)
+        print(f"Baseline written: {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}.")
+        return 0
+    print(f"error: {len(regressions)} stage(s) regressed beyond {args.threshold:.0%}:",
+          file=sys.stderr)
+    for item in regressions:
+        print(f"  {item['size']} pages, {item['stage']}: {item['baseline']:.3f}s -> "
+              f"{item['current']:.3f}s ({item['ratio']:.2f}x)", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
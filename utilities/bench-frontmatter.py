@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""bench-frontmatter.py - Benchmark utilities/frontmatter.py against PyYAML.
+
+Reads the frontmatter block of every Markdown page under docs/ once, then
+times parsing all of them (best of --repeat runs) with:
+
+  - flat         frontmatter.parse(text)
+  - nested       frontmatter.parse(text, nested=True)
+  - load_cached  frontmatter.load(path) with every page already memoized
+  - yaml         yaml.safe_load(block), PyYAML's pure-Python loader
+  - yaml_c       yaml.load(block, CSafeLoader), if PyYAML was built with libyaml
+
+Blocks that PyYAML rejects are left out of every timing. Exits non-zero if
+the nested parse (the like-for-like comparison) is not faster than
+yaml.safe_load. The PyYAML rows are skipped if PyYAML is not installed.
+
+This is not part of the pytest suite; run it by hand or from CI:
+
+    python utilities/bench-frontmatter.py
+    python utilities/bench-frontmatter.py --docs-dir docs/assistant --repeat 10
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import frontmatter
+
+try:
+    import yaml
+except ImportError:  # optional: only the frontmatter.py rows are timed
+    yaml = None
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.resolve()
+
+DOCS_DIR = REPO_ROOT / "docs"
+DEFAULT_REPEAT = 5
+
+
+def collect_headers(docs_dir):
+    """Return [(path, frontmatter block)] for every page under docs_dir that has one.
+
+    Pages whose frontmatter PyYAML rejects are skipped (when it is installed).
+    """
+    headers = []
+    for path in sorted(docs_dir.rglob("*.md")):
+        header = frontmatter.read_header(path)
+        if not header:
+            continue
+        if yaml is not None:
+            try:
+                yaml.safe_load(frontmatter.FRONTMATTER_RE.match(header).group(1))
+            except yaml.YAMLError:
+                continue
+        headers.append((path, header))
+    return headers
+
+
+def _best_of(repeat, func, items):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_benchmarks(headers, repeat=DEFAULT_REPEAT):
+    """Time each parser over headers; return {name: best seconds for all of them}."""
+    texts = [header for _, header in headers]
+    paths = [path for path, _ in headers]
+    results = {
+        "flat": _best_of(repeat, frontmatter.parse, texts),
+        "nested": _best_of(repeat, lambda text: frontmatter.parse(text, nested=True), texts),
+    }
+    for path in paths:
+        frontmatter.load(path)
+    results["load_cached"] = _best_of(repeat, frontmatter.load, paths)
+    if yaml is not None:
+        blocks = [frontmatter.FRONTMATTER_RE.match(text).group(1) for text in texts]
+        results["yaml"] = _best_of(repeat, yaml.safe_load, blocks)
+        if hasattr(yaml, "CSafeLoader"):
+            results["yaml_c"] = _best_of(
+                repeat, lambda block: yaml.load(block, Loader=yaml.CSafeLoader), blocks)
+    return results
+
+
+def format_results(results, count):
+    """Return a table of total and per-page times, relative to yaml.safe_load."""
+    lines = [f"{count} frontmatter blocks"]
+    for name, seconds in results.items():
+        line = f"  {name:<12} {seconds * 1000:9.2f} ms  {seconds / max(count, 1) * 1e6:8.1f} us/page"
+        if "yaml" in results:
+            line += f"  {results['yaml'] / seconds:6.1f}x vs yaml"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--docs-dir", type=Path, default=DOCS_DIR,
+        help="Markdown tree to read frontmatter from (default: docs/).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT,
+        help=f"Runs per parser; the fastest is reported (default: {DEFAULT_REPEAT}).",
+    )
+    args = parser.parse_args(argv)
+
+    headers = collect_headers(args.docs_dir)
+    if not headers:
+        print(f"error: no frontmatter found under {args.docs_dir}", file=sys.stderr)
+        return 1
+    results = run_benchmarks(headers, max(args.repeat, 1))
+    print(format_results(results, len(headers)))
+
+    if "yaml" in results and results["nested"] >= results["yaml"]:
+        print("error: frontmatter.parse(nested=True) is not faster than yaml.safe_load",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,7 +7,10 @@ Produces two parallel copies of docs/ used to build/serve the site:
                  any docs/assistant/**/*.md whose publication_status frontmatter
                  is not "published". Zensical builds the HTML site from this copy.
   - agent-docs/  Full copy (all review statuses, including support/). The
-                 assistant dispatch registry is regenerated into this copy,
+                 assistant dispatch registry (dispatch.md, and its
+                 machine-readable dispatch.json and dispatch.ndjson forms),
+                 the search-index.json full-text index and the chunks.ndjson
+                 section-level RAG export are regenerated into this copy,
                  and each Markdown file has agent-irrelevant syntax (images,
                  the `@format` pragma, and <img-comparison-slider> blocks)
                  stripped. After `zensical build`, every file in this copy is
@@ -15,6 +18,11 @@ Produces two parallel copies of docs/ used to build/serve the site:
                  page also has a parallel raw-Markdown copy at the same URL
                  with an `.md` extension.
 
+Files are placed into both copies as copy-on-write reflinks or hardlinks
+where the filesystem allows (see --link-mode), falling back to plain copies;
+any file the pipeline rewrites is replaced rather than edited in place, so
+docs/ is never modified through a shared link.
+
 Both copies, plus the generated zensical.build.toml (a copy of zensical.toml
 with docs_dir pointed at human-docs/), are build artifacts: gitignored, and
 never mutate docs/ or the committed zensical.toml.
@@ -24,50 +32,199 @@ file's repo):
 
     python utilities/build-site.py            # prep only (copy/filter/strip/config)
     python utilities/build-site.py --build     # prep, then `zensical build -c`, then overlay
+    python utilities/build-site.py --build --no-clean   # as --build, keeping site/
+    python utilities/build-site.py --build --compress   # also write .gz/.br sidecars
     python utilities/build-site.py --serve     # prep, then `zensical serve` (blocking)
+    python utilities/build-site.py --incremental   # prep, reusing the last run's output
+    python utilities/build-site.py --watch     # incremental prep + serve, re-prepping on edits
+    python utilities/build-site.py --build --profile   # also report per-stage timings
+
+--incremental compares docs/ against the manifest written by the previous
+prep (.build-cache/manifest.json: size, mtime, SHA-256 and assistant
+publication_status per file) and only re-copies, re-filters and re-strips the
+files that changed, deleting outputs whose sources vanished. It falls back to
+a full prep when there is no usable manifest.
+
+--watch does an incremental prep, starts `zensical serve` in the background,
+then polls docs/, includes/ and zensical.toml and re-runs the incremental prep
+after every change (dispatch.md is only regenerated when an assistant page's
+status, authority level, title or last_reviewed date changes), so the
+server's own live reload picks up edits without restarting.
+
+The overlay only writes agent-docs pages whose site/ copy is missing or
+differs, and deletes overlaid *.md files in site/ whose source is gone, so
+with --no-clean (`zensical build` without -c) an unchanged page keeps its
+mtime and an rsync-based deploy does not re-upload it.
+
+--compress (with --build) then writes pre-compressed sidecars next to each
+overlaid page and llms.txt (page.md.gz, plus page.md.br when the optional
+brotli module is installed), so a static server can send compressed bodies
+without compressing per request. Files under COMPRESS_MIN_BYTES are skipped,
+only sources changed since their sidecars were written are recompressed, and
+stale sidecars are deleted.
+
+--profile (combinable with any mode) times each prep stage, plus `zensical
+build` and the overlay under --build, recording wall time and the number of
+files and bytes read and written by each. It prints a summary table and
+writes a JSON report (default .build-cache/profile.json) that CI can keep as
+an artifact to track build performance over time.
 
 Exits non-zero, with a list of offending pages, if a published human-docs page
 links to an assistant page that was filtered out of the human layer (a stub,
 a draft, or anything under assistant/support/) — this is treated as an
 authoring error, per the project's human/agent layer split (see
 docs/assistant/schema.md).
+
+Every build also validates every other internal link on the site: in each
+layer, a relative link must point at a file or directory that exists there,
+and a `#fragment` on a link to a Markdown page must match one of that page's
+heading anchors. All broken links are listed at once, and the build exits
+non-zero.
 """
 
 import argparse
+import gzip
+import hashlib
 import importlib.util
+import json
+import multiprocessing
+import os
+import posixpath
 import re
 import shutil
 import subprocess
 import sys
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import unquote
+
+try:
+    import fcntl
+except ImportError:  # Windows: no FICLONE ioctl; reflinks fall back to copies
+    fcntl = None
 
 import tomlkit
 
+try:
+    import brotli
+except ImportError:  # optional: --compress then writes .gz sidecars only
+    brotli = None
+
+from frontmatter import FRONTMATTER_RE, parse as parse_frontmatter
+
 SCRIPT_DIR = Path(__file__).parent
 REPO_ROOT = SCRIPT_DIR.parent.resolve()
 
 DOCS_DIR = REPO_ROOT / "docs"
+INCLUDES_DIR = REPO_ROOT / "includes"
 HUMAN_DOCS_DIR = REPO_ROOT / "human-docs"
 AGENT_DOCS_DIR = REPO_ROOT / "agent-docs"
 SITE_DIR = REPO_ROOT / "site"
 SOURCE_CONFIG_PATH = REPO_ROOT / "zensical.toml"
 BUILD_CONFIG_PATH = REPO_ROOT / "zensical.build.toml"
 
-ASSISTANT_SUBDIR = "assistant"
-SUPPORT_SUBDIR = "support"
+# Build-state files (the incremental manifest, etc.) live in a cache directory
+# next to the generated layers, so fixture trees get their own cache.
+BUILD_CACHE_DIRNAME = ".build-cache"
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 7
+
+# How copy_layers() places docs/ files into the generated layers. "auto"
+# tries a copy-on-write reflink, then a hardlink, then falls back to a copy.
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+
+# Linux FICLONE ioctl request number (_IOW(0x94, 9, int)).
+_FICLONE = 0x40049409
 
-FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
+# Seconds between --watch polls of docs/, includes/ and zensical.toml.
+WATCH_INTERVAL = 0.25
 
-# Markdown link targets that should never be treated as internal file paths.
-_EXTERNAL_LINK_PREFIXES = ("http://", "https://", "mailto:", "//")
+ASSISTANT_SUBDIR = "assistant"
+SUPPORT_SUBDIR = "support"
 
-# Agent-strip regexes. Kept small and independently testable.
-_IMAGE_LINE_RE = re.compile(r"(?m)^[ \t]*!\[[^\]]*\]\([^)]*\)[ \t]*\n?")
-_IMAGE_INLINE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
-_FORMAT_PRAGMA_RE = re.compile(r"(?m)^<!--\s*@format\s*-->[ \t]*\n?")
-_SLIDER_BLOCK_RE = re.compile(
-    r"(?s)<img-comparison-slider[^>]*>.*?</img-comparison-slider>\n?")
-_EXCESS_BLANK_LINES_RE = re.compile(r"\n{3,}")
+# Markdown link targets that should never be treated as internal file paths:
+# protocol-relative URLs, plus anything with a URL scheme (https:, mailto:, ...).
+_URL_SCHEME_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+
+# Link/anchor scanning ignores the same regions utilities/check-links.ps1 does:
+# frontmatter, HTML comments, fenced code, and (for links) inline code.
+_HTML_COMMENT_RE = re.compile(r"(?s)<!--.*?-->")
+_FENCED_CODE_RE = re.compile(r"(?ms)^[ \t]*(`{3,}|~{3,}).*?^[ \t]*\1[ \t]*$")
+_INLINE_CODE_RE = re.compile(r"`[^`\n]*`")
+_LINK_RE = re.compile(r"\[[^\]]*\]\(([^)]+)\)")
+_LINK_TITLE_RE = re.compile(r"""\s+(?:"[^"]*"|'[^']*')$""")
+
+# Heading anchors, as generated by the toc extension (see heading_slug()),
+# plus explicit ids from attr_list (`{#id}`) and raw HTML (id=/name=).
+_HEADING_RE = re.compile(r"(?m)^[ \t]*(#{1,6})[ \t]+(.+?)[ \t]*$")
+_HEADING_ATTR_LIST_RE = re.compile(r"\s*\{:?([^}]*)\}\s*$")
+_ATTR_ID_RE = re.compile(r"(?:^|\s)#([\w:.-]+)")
+_HTML_ID_RE = re.compile(r"""<[^>]*?\b(?:id|name)\s*=\s*["']([^"']+)["']""")
+_HEADING_MARKUP_RES = (
+    (re.compile(r"!?\[([^\]]*)\]\([^)]*\)"), r"\1"),  # links/images -> text
+    (re.compile(r"`([^`]*)`"), r"\1"),                 # inline code -> text
+    (re.compile(r"<[^>]+>"), ""),                       # raw HTML tags
+    (re.compile(r"&[#a-zA-Z0-9]+;"), ""),               # entities
+    (re.compile(r":[a-z0-9_+-]+:"), ""),                # emoji shortcodes
+    (re.compile(r"\*+|~~|==|\^\^"), ""),                # emphasis markers
+    (re.compile(r"(?<!\w)_+(?=\S)|(?<=\S)_+(?!\w)"), ""),  # _emphasis_
+)
+
+# --profile: default report path, and the I/O counters recorded per stage.
+PROFILE_REPORT_PATH = REPO_ROOT / BUILD_CACHE_DIRNAME / "profile.json"
+PROFILE_VERSION = 1
+_IO_KEYS = ("files_read", "bytes_read", "files_written", "bytes_written")
+
+# strip_agent_docs() only fans out to worker processes for trees at least
+# this large; below it, pool startup costs more than the stripping itself.
+PARALLEL_STRIP_MIN_FILES = 500
+
+# JSON registries akb-generate-dispatch.py writes next to dispatch.md, in
+# the agent layer only (relative to assistant/).
+DISPATCH_REGISTRY_FILES = ("dispatch.json", "dispatch.ndjson")
+
+# Full-text search index akb-build-search-index.py and section chunks
+# akb-export-chunks.py write next to them, and every generated data file in
+# the agent layer's assistant/ directory.
+SEARCH_INDEX_FILE = "search-index.json"
+SECTION_CHUNKS_FILE = "chunks.ndjson"
+ASSISTANT_DATA_FILES = DISPATCH_REGISTRY_FILES + (SEARCH_INDEX_FILE, SECTION_CHUNKS_FILE)
+
+# compress_site_files(): site/ files (besides the overlaid Markdown pages)
+# that get pre-compressed sidecars, and the size below which a file is left
+# uncompressed because the saving is not worth a sidecar.
+COMPRESS_EXTRA_FILES = ("llms.txt",)
+COMPRESS_MIN_BYTES = 1024
+
+# Agent-strip substitutions, applied in this order by strip_markdown_text(),
+# each with a literal every match contains, on the line the match starts on.
+# No match can start before the line holding the literal's first occurrence,
+# so the substitution only runs from there (and not at all without one).
+# The pragma and blank-run patterns are written to lead with their literal,
+# which lets the regex engine skip ahead to it: "<!--(?<![^\n]<!--)" is
+# "(?m)^<!--" (nothing but a newline, or the start, before the "<!--"), and
+# "\n\n\n+" is "\n{3,}".
+_STRIP_SUBSTITUTIONS = (
+    ("<img-comparison-slider", re.compile(
+        r"(?s)<img-comparison-slider[^>]*>.*?</img-comparison-slider>\n?"), ""),
+    ("![", re.compile(r"(?m)^[ \t]*!\[[^\]]*\]\([^)]*\)[ \t]*\n?"), ""),  # image lines
+    ("![", re.compile(r"!\[[^\]]*\]\([^)]*\)"), ""),                       # inline images
+    ("<!--", re.compile(r"<!--(?<![^\n]<!--)\s*@format\s*-->[ \t]*\n?"), ""),
+    ("\n\n\n", re.compile(r"\n\n\n+"), "\n\n"),
+)
+# A fenced code block, from the start of its opening line to the end of its
+# closing fence (not the newline after it), or to the end of the text if it
+# is never closed. As in CommonMark, a backtick fence's info string cannot
+# contain backticks, so a line starting with inline code (```x``` text) does
+# not open one.
+_FENCED_BLOCK_RE = re.compile(
+    r"(?ms)^[ \t]*(?:(`{3,})[^`\n]*|(~{3,})[^\n]*)$"
+    r"(?:.*?\n[ \t]*(?:\1|\2)[`~]*[ \t]*$|.*\Z)")
 
 
 class HumanDocsValidationError(Exception):
@@ -84,11 +241,24 @@ class HumanDocsValidationError(Exception):
         )
 
 
-def _import_dispatch_generator():
-    """Import utilities/akb-generate-dispatch.py despite its hyphenated filename."""
-    module_path = SCRIPT_DIR / "akb-generate-dispatch.py"
-    spec = importlib.util.spec_from_file_location(
-        "akb_generate_dispatch", module_path)
+class LinkValidationError(Exception):
+    """Raised when internal links in either generated layer do not resolve.
+
+    ``errors`` is a list of (layer, page, target, problem) tuples: layer is
+    "human-docs" or "agent-docs" and page is relative to that layer's root.
+    problem is "missing target" (target is the resolved docs-relative path)
+    or "missing anchor" (target is the link as written).
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"{len(errors)} broken internal link(s)")
+
+
+def _import_utility(filename, module_name):
+    """Import a sibling utilities/ script despite its hyphenated filename."""
+    module_path = SCRIPT_DIR / filename
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
     if spec is None or spec.loader is None:
         raise ImportError(f"could not load module spec from {module_path}")
     module = importlib.util.module_from_spec(spec)
@@ -96,25 +266,208 @@ def _import_dispatch_generator():
     return module
 
 
-def parse_frontmatter(text):
-    """Parse simple top-level ``key: value`` YAML frontmatter into a dict."""
+def _import_dispatch_generator():
+    """Import utilities/akb-generate-dispatch.py."""
+    return _import_utility("akb-generate-dispatch.py", "akb_generate_dispatch")
+
+
+def _import_search_indexer():
+    """Import utilities/akb-build-search-index.py."""
+    return _import_utility("akb-build-search-index.py", "akb_build_search_index")
+
+
+def _import_chunk_exporter():
+    """Import utilities/akb-export-chunks.py."""
+    return _import_utility("akb-export-chunks.py", "akb_export_chunks")
+
+
+# =============================================================================
+# Profiling
+# =============================================================================
+
+# Running totals of the file I/O this process has done, sampled before and
+# after each stage by profile_stage(). Every read or write of file content
+# in this module goes through _record_io().
+IO_STATS = Counter()
+
+
+def _record_io(direction, nbytes):
+    """Count one file "read" or "written", of nbytes bytes."""
+    IO_STATS[f"files_{direction}"] += 1
+    IO_STATS[f"bytes_{direction}"] += nbytes
+
+
+def new_profile():
+    """Return an empty profile for profile_stage() to record into."""
+    return {"stages": []}
+
+
+@contextmanager
+def profile_stage(profile, name):
+    """Time the enclosed block as stage name and append its record to profile.
+
+    Each record holds "stage", wall-clock "seconds", and the files/bytes read
+    and written during the stage (see IO_STATS). bytes_written counts data
+    actually copied, so a reflinked or hardlinked file adds a file but no
+    bytes. A profile of None records nothing.
+    """
+    if profile is None:
+        yield
+        return
+    before = IO_STATS.copy()
+    start = time.perf_counter()
+    yield
+    record = {"stage": name, "seconds": round(time.perf_counter() - start, 6)}
+    for key in _IO_KEYS:
+        record[key] = IO_STATS[key] - before[key]
+    profile["stages"].append(record)
+
+
+def profile_report(profile, mode):
+    """Return the JSON-serializable --profile report for a finished profile."""
+    totals = {"seconds": round(sum(stage["seconds"] for stage in profile["stages"]), 6)}
+    for key in _IO_KEYS:
+        totals[key] = sum(stage[key] for stage in profile["stages"])
+    return {
+        "version": PROFILE_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "mode": mode,
+        "stages": profile["stages"],
+        "total": totals,
+    }
+
+
+def format_profile_table(report):
+    """Return a plain-text summary table of a profile_report()."""
+    rows = [(stage["stage"], stage) for stage in report["stages"]]
+    rows.append(("total", report["total"]))
+    width = max(len(name) for name, _ in rows)
+    lines = [f"{'stage':<{width}}  {'seconds':>8}  {'files read':>10}  "
+             f"{'MB read':>8}  {'files written':>13}  {'MB written':>10}"]
+    for name, stage in rows:
+        lines.append(
+            f"{name:<{width}}  {stage['seconds']:>8.3f}  {stage['files_read']:>10}  "
+            f"{stage['bytes_read'] / 1e6:>8.1f}  {stage['files_written']:>13}  "
+            f"{stage['bytes_written'] / 1e6:>10.1f}")
+    return "\n".join(lines)
+
+
+def write_profile_report(report, report_path=PROFILE_REPORT_PATH):
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=1) + "\n",
+                           encoding="utf-8", newline="\n")
+    return report_path
+
+
+def _record_tree_written(root):
+    """Count every file under root as written (for output of a subprocess)."""
+    for path in root.rglob("*"):
+        if path.is_file():
+            _record_io("written", path.stat().st_size)
+
+
+# =============================================================================
+# Document index
+# =============================================================================
+
+def _without_frontmatter_and_code(text):
+    """Return text minus frontmatter, HTML comments and fenced code blocks."""
     match = FRONTMATTER_RE.match(text)
-    if not match:
-        return {}
-    props = {}
-    for line in match.group(1).split("\n"):
-        if not line or line[0] in " \t#-":
-            continue
-        if ":" not in line:
+    if match:
+        text = text[match.end():]
+    return _FENCED_CODE_RE.sub("", _HTML_COMMENT_RE.sub("", text))
+
+
+def _iter_markdown_link_targets(text):
+    """Yield link target strings from Markdown inline links `[text](target)`.
+
+    Links inside frontmatter, HTML comments and code are skipped, and a
+    trailing link title (`[text](target "title")`) is dropped.
+    """
+    body = _INLINE_CODE_RE.sub("", _without_frontmatter_and_code(text))
+    for match in _LINK_RE.finditer(body):
+        yield _LINK_TITLE_RE.sub("", match.group(1).strip())
+
+
+def heading_slug(text):
+    """Return the anchor id the toc extension generates for heading text.
+
+    Mirrors Python-Markdown's toc.slugify() applied to the rendered heading:
+    inline markup is reduced to its text, then the result is transliterated
+    to ASCII, stripped of punctuation, lowercased and hyphen-joined.
+    """
+    for pattern, replacement in _HEADING_MARKUP_RES:
+        text = pattern.sub(replacement, text)
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = re.sub(r"[^\w\s-]", "", text).strip().lower()
+    return re.sub(r"[-\s]+", "-", text)
+
+
+def heading_anchors(text):
+    """Return the sorted anchor ids a page defines.
+
+    That is one per ATX heading (an attr_list `{#id}` overrides the generated
+    slug, and repeated slugs get toc's `_1`, `_2`, ... suffixes), plus any
+    raw HTML id/name attribute. Headings inside code are ignored.
+    """
+    body = _without_frontmatter_and_code(text)
+    anchors = set(_HTML_ID_RE.findall(body))
+    for match in _HEADING_RE.finditer(body):
+        heading = match.group(2).rstrip("#").rstrip()
+        attrs = _HEADING_ATTR_LIST_RE.search(heading)
+        explicit = attrs and _ATTR_ID_RE.search(attrs.group(1))
+        if explicit:
+            anchors.add(explicit.group(1))
             continue
-        key, _, value = line.partition(":")
-        key = key.strip()
-        value = value.strip()
-        if len(value) >= 2 and value[0] in "'\"" and value[-1] == value[0]:
-            value = value[1:-1]
-        if value:
-            props[key] = value
-    return props
+        if attrs:
+            heading = heading[:attrs.start()]
+        slug = heading_slug(heading)
+        candidate, count = slug, 0
+        while candidate in anchors or not candidate:
+            count += 1
+            candidate = f"{slug}_{count}"
+        anchors.add(candidate)
+    return sorted(anchors)
+
+
+def read_document(path):
+    """Read and parse one Markdown file into a document dict.
+
+    Keys: "text" (decoded, with newlines normalized as by Path.read_text()),
+    "frontmatter" (parse_frontmatter()), "links" (inline link targets, see
+    _iter_markdown_link_targets()), "anchors" (heading_anchors()) and
+    "sha256" (of the raw bytes on disk).
+
+    A documents index is a dict mapping docs-relative POSIX paths to these
+    dicts. prepare() builds one while scanning docs/ and hands it to every
+    stage, so each Markdown file is read and parsed once per build; stages
+    given no index (or a partial one) read any missing page themselves.
+    """
+    data = path.read_bytes()
+    _record_io("read", len(data))
+    text = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    return {
+        "text": text,
+        "frontmatter": parse_frontmatter(text),
+        "links": list(_iter_markdown_link_targets(text)),
+        "anchors": heading_anchors(text),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def scan_documents(docs_dir):
+    """Return a documents index (see read_document()) of every Markdown file in docs_dir."""
+    return {
+        md_file.relative_to(docs_dir).as_posix(): read_document(md_file)
+        for md_file in sorted(docs_dir.rglob("*.md"))
+    }
+
+
+def _get_document(documents, root, rel):
+    """Return documents[rel], reading root/rel if the index lacks it."""
+    if documents is not None and rel in documents:
+        return documents[rel]
+    return read_document(root / rel)
 
 
 # =============================================================================
@@ -131,19 +484,102 @@ def clean_generated(human_dir=HUMAN_DOCS_DIR, agent_dir=AGENT_DOCS_DIR,
         build_config.unlink()
 
 
-def copy_layers(docs_dir=DOCS_DIR, human_dir=HUMAN_DOCS_DIR, agent_dir=AGENT_DOCS_DIR):
-    """Copy docs_dir into human_dir and agent_dir. Never mutates docs_dir."""
-    shutil.copytree(docs_dir, human_dir)
-    shutil.copytree(docs_dir, agent_dir)
+def _reflink(src, dest):
+    """Clone src to dest as a copy-on-write reflink, or raise OSError."""
+    if fcntl is None:
+        raise OSError("reflinks are not supported on this platform")
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+    shutil.copystat(src, dest)
+
+
+def materialize_file(src, dest, link_mode="auto"):
+    """Place src's content at dest, sharing storage with src where possible.
+
+    link_mode is one of LINK_MODES. Any existing dest is unlinked first (it
+    may be a hardlink to src itself). Returns the method actually used:
+    "reflink", "hardlink", or "copy".
+
+    Hardlinked outputs share an inode with docs/, so they must only ever be
+    replaced, never written in place; see write_output_text().
+    """
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if link_mode in ("auto", "reflink"):
+        try:
+            _reflink(src, dest)
+            _record_io("written", 0)
+            return "reflink"
+        except OSError:
+            dest.unlink(missing_ok=True)
+    if link_mode in ("auto", "hardlink"):
+        try:
+            os.link(src, dest)
+            _record_io("written", 0)
+            return "hardlink"
+        except OSError:
+            pass
+    shutil.copy2(src, dest)
+    size = dest.stat().st_size
+    _record_io("read", size)
+    _record_io("written", size)
+    return "copy"
+
+
+def materialize_tree(src_dir, dest_dir, link_mode="auto"):
+    """Materialize every file under src_dir into dest_dir; return method counts.
+
+    Once a method fails, the rest of the tree skips straight to the next
+    fallback instead of re-probing the filesystem for every file.
+    """
+    methods = Counter()
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    for src in sorted(src_dir.rglob("*")):
+        dest = dest_dir / src.relative_to(src_dir)
+        if src.is_dir():
+            dest.mkdir(parents=True, exist_ok=True)
+            continue
+        method = materialize_file(src, dest, link_mode)
+        methods[method] += 1
+        if method != "reflink":
+            link_mode = method
+    return methods
+
+
+def write_output_text(path, text):
+    """Write text to a generated file, replacing (not modifying) any existing one.
+
+    Unlinking first gives copy-on-write semantics for hardlinked layer files,
+    so rewriting an output can never reach through to the docs/ source.
+    """
+    data = text.encode("utf-8")
+    path.unlink(missing_ok=True)
+    path.write_bytes(data)
+    _record_io("written", len(data))
+
+
+def copy_layers(docs_dir=DOCS_DIR, human_dir=HUMAN_DOCS_DIR, agent_dir=AGENT_DOCS_DIR,
+                link_mode="auto"):
+    """Materialize docs_dir into human_dir and agent_dir. Never mutates docs_dir.
+
+    See materialize_file() for link_mode. Returns the combined method counts.
+    """
+    methods = materialize_tree(docs_dir, human_dir, link_mode)
+    methods.update(materialize_tree(docs_dir, agent_dir, link_mode))
+    return methods
 
 
 # =============================================================================
 # Step 2: filter human-docs
 # =============================================================================
 
-def delete_non_published_assistant_pages(human_dir):
+def delete_non_published_assistant_pages(human_dir, documents=None):
     """Remove assistant/support/ and any non-published assistant page from human_dir.
 
+    documents is an optional documents index (see read_document()) used
+    instead of re-reading each page's frontmatter.
+
     Returns a dict with keys:
       - "removed": sorted list of removed file paths, relative to human_dir
             - "non_published_index_topics": sorted list of topic dir names (relative
@@ -164,14 +600,15 @@ def delete_non_published_assistant_pages(human_dir):
         for md_file in sorted(assistant_dir.rglob("*.md")):
             if not md_file.exists():
                 continue  # already removed as part of support/ above
-            frontmatter = parse_frontmatter(
-                md_file.read_text(encoding="utf-8"))
+            rel = md_file.relative_to(human_dir).as_posix()
+            frontmatter = _get_document(
+                documents, human_dir, rel)["frontmatter"]
             if frontmatter.get("publication_status") != "published":
                 if md_file.name == "index.md":
                     topic = md_file.parent.relative_to(assistant_dir)
                     if str(topic) != ".":
                         non_published_index_topics.append(topic.as_posix())
-                removed.append(md_file.relative_to(human_dir).as_posix())
+                removed.append(rel)
                 md_file.unlink()
 
     return {
@@ -180,74 +617,301 @@ def delete_non_published_assistant_pages(human_dir):
     }
 
 
-def _iter_markdown_link_targets(text):
-    """Yield raw link target strings from Markdown inline links `[text](target)`."""
-    for match in re.finditer(r"\[[^\]]*\]\(([^)]+)\)", text):
-        yield match.group(1).strip()
+def resolve_link_target(page_rel, target):
+    """Return the docs-relative POSIX path an inline link on page_rel points at.
+
+    Returns None for same-page anchors, external URLs, and paths that escape
+    the docs root. Any ``#fragment`` or ``?query`` is dropped, and
+    percent-escapes (``%20``) are decoded.
+    """
+    if not target or target.startswith("#"):
+        return None
+    if target.startswith("//") or _URL_SCHEME_RE.match(target):
+        return None
+    path_part = unquote(re.split(r"[#?]", target, 1)[0].strip())
+    if not path_part:
+        return None
+    resolved = posixpath.normpath(
+        posixpath.join(posixpath.dirname(page_rel), path_part))
+    if resolved == ".." or resolved.startswith(("../", "/")):
+        return None
+    return resolved
+
+
+def link_graph(documents):
+    """Return {page: sorted internal link targets} for a documents index.
+
+    Targets are resolved with resolve_link_target(), so each page's outgoing
+    edges are docs-relative paths that can be checked by set membership.
+    """
+    graph = {}
+    for rel, doc in documents.items():
+        targets = {resolve_link_target(rel, target) for target in doc["links"]}
+        targets.discard(None)
+        graph[rel] = sorted(targets)
+    return graph
 
 
-def find_broken_assistant_links(human_dir):
+def reverse_link_graph(graph):
+    """Invert a link_graph() mapping into {target: set of referring pages}."""
+    referrers = {}
+    for page, targets in graph.items():
+        for target in targets:
+            referrers.setdefault(target, set()).add(page)
+    return referrers
+
+
+def layer_paths(files):
+    """Return the set of file paths in files plus every ancestor directory path.
+
+    Links may point at a directory (e.g. ``assistant/alpha/``), which exists
+    as long as any file below it survives.
+    """
+    paths = set()
+    for rel in files:
+        paths.add(rel)
+        parent = posixpath.dirname(rel)
+        while parent and parent not in paths:
+            paths.add(parent)
+            parent = posixpath.dirname(parent)
+    return paths
+
+
+def _is_assistant_target(resolved):
+    return resolved == ASSISTANT_SUBDIR or resolved.startswith(ASSISTANT_SUBDIR + "/")
+
+
+def find_broken_assistant_links(human_dir, pages=None, documents=None, surviving=None):
     """Return a list of (offending_page, link_target) for links into a missing assistant page.
 
     Only internal links whose resolved target falls under human_dir/assistant/
     are checked (that is the only subtree this filter step removes files
     from); links elsewhere are assumed valid (validated separately by
     utilities/check-links.ps1 against the source docs/ tree).
+
+    pages optionally limits the check to those Markdown files (human_dir-
+    relative POSIX paths); by default every page in human_dir is checked.
+    documents is an optional documents index supplying each page's links.
+    surviving is the set of human_dir-relative file and directory paths (see
+    layer_paths()); by default human_dir is walked once to build it, and each
+    link is then validated by set membership alone. A directory left empty by
+    the filter does not count as surviving, since nothing there is published.
     """
-    assistant_dir = (human_dir / ASSISTANT_SUBDIR).resolve()
+    if surviving is None:
+        surviving = layer_paths(path.relative_to(human_dir).as_posix()
+                                for path in human_dir.rglob("*") if path.is_file())
+    if pages is None:
+        pages = (rel for rel in surviving if rel.endswith(".md"))
     errors = []
-    for md_file in sorted(human_dir.rglob("*.md")):
-        text = md_file.read_text(encoding="utf-8")
-        for target in _iter_markdown_link_targets(text):
-            if not target or target.startswith("#"):
-                continue
-            if target.startswith(_EXTERNAL_LINK_PREFIXES):
+    for rel in sorted(pages):
+        for target in _get_document(documents, human_dir, rel)["links"]:
+            resolved = resolve_link_target(rel, target)
+            if resolved is None or not _is_assistant_target(resolved):
                 continue
-            path_part = target.split("#", 1)[0].strip()
-            if not path_part:
-                continue
-            try:
-                resolved = (md_file.parent / path_part).resolve()
-            except OSError:
-                continue
-            try:
-                resolved.relative_to(assistant_dir)
-            except ValueError:
-                continue  # not a link into the assistant tree
-            if not resolved.exists():
-                errors.append(
-                    (md_file.relative_to(human_dir).as_posix(), target))
+            if resolved not in surviving:
+                errors.append((rel, target))
     return errors
 
 
-def filter_human_docs(human_dir=HUMAN_DOCS_DIR):
+def filter_human_docs(human_dir=HUMAN_DOCS_DIR, documents=None):
     """Filter human_dir in place; raise HumanDocsValidationError on broken links.
 
     Returns the same info dict as delete_non_published_assistant_pages() on
-    success.
+    success. documents is an optional documents index (see read_document()).
     """
-    info = delete_non_published_assistant_pages(human_dir)
-    if info["non_published_index_topics"]:
+    info = delete_non_published_assistant_pages(human_dir, documents)
+    _warn_non_published_index_topics(info["non_published_index_topics"])
+    errors = find_broken_assistant_links(human_dir, documents=documents)
+    if errors:
+        raise HumanDocsValidationError(errors)
+    return info
+
+
+def _warn_non_published_index_topics(topics):
+    if topics:
         print(
             "warning: the following assistant topics have a non-published "
             "index.md and will have no human-facing landing page: "
-            + ", ".join(info["non_published_index_topics"]),
+            + ", ".join(topics),
             file=sys.stderr,
         )
-    errors = find_broken_assistant_links(human_dir)
+
+
+# =============================================================================
+# Link validation (both layers)
+# =============================================================================
+
+def _split_fragment(page_rel, target):
+    """Return (resolved_page, fragment) for a link target carrying a ``#fragment``.
+
+    resolved_page is page_rel itself for same-page anchors, or None when the
+    target is external or escapes the docs root.
+    """
+    path_part, _, fragment = target.partition("#")
+    fragment = unquote(fragment.strip())
+    if not path_part.strip():
+        return page_rel, fragment
+    return resolve_link_target(page_rel, target), fragment
+
+
+def find_broken_links(entries, pages=None):
+    """Return LinkValidationError-style errors for a scan_source_tree() result.
+
+    Generalizes find_broken_assistant_links() to every internal link and
+    ``#anchor`` on the site. Each Markdown page is checked against the layer
+    that keeps the fewest files it could link to: the human layer if it is
+    published there, otherwise the agent layer (which holds everything).
+    A link passes when its resolved target is a file or directory in that
+    layer; a fragment on a link to a Markdown page (or a directory's
+    index.md) must also be one of that page's heading anchors. Fragments on
+    other targets (such as the `#only-light` image suffix) are not anchors
+    and are ignored.
+
+    Everything is checked by set lookups against the link targets and
+    anchors recorded in entries, so no page is read. pages optionally limits
+    which pages' links are checked.
+    """
+    human = human_layer_paths(entries)
+    agent = layer_paths(entries)
+    anchors = {rel: entry["anchors"] for rel, entry in entries.items()
+               if "anchors" in entry}
+    if pages is None:
+        pages = anchors
+    errors = []
+    for rel in sorted(pages):
+        entry = entries[rel]
+        if is_human_layer_file(rel, entry.get("status")):
+            layer, surviving = "human-docs", human
+        else:
+            layer, surviving = "agent-docs", agent
+        for target in entry["links"]:
+            if target not in surviving:
+                errors.append((layer, rel, target, "missing target"))
+        for target in entry["anchor_links"]:
+            resolved, fragment = _split_fragment(rel, target)
+            if resolved is None or not fragment or resolved not in surviving:
+                continue  # external, or already reported as a missing target
+            if resolved not in anchors:
+                resolved = posixpath.join(resolved, "index.md")
+            if resolved in anchors and fragment not in anchors[resolved]:
+                errors.append((layer, rel, target, "missing anchor"))
+    return errors
+
+
+def validate_links(entries):
+    """Raise LinkValidationError if find_broken_links() reports anything."""
+    errors = find_broken_links(entries)
     if errors:
-        raise HumanDocsValidationError(errors)
-    return info
+        raise LinkValidationError(errors)
 
 
 # =============================================================================
-# Step 3: generate dispatch (agent-docs only)
+# Step 3: generate dispatch, the search index and chunks (agent-docs only)
 # =============================================================================
 
-def generate_dispatch(agent_dir=AGENT_DOCS_DIR):
-    """Regenerate assistant/dispatch.md inside agent_dir."""
+def generate_dispatch(agent_dir=AGENT_DOCS_DIR, documents=None, strip=False,
+                      registry_only=False):
+    """Regenerate assistant/dispatch.md and its JSON registries inside agent_dir.
+
+    The registries (DISPATCH_REGISTRY_FILES: dispatch.json and
+    dispatch.ndjson) come from the same scan and hash the agent-layer copy of
+    each article, so they must be written after stripping. registry_only=True
+    rewrites just the registries, for edits that change article hashes but
+    not dispatch.md.
+
+    documents is an optional documents index whose assistant-page
+    frontmatter is passed to the generator instead of re-reading each page.
+    With strip=True the content is passed through strip_markdown_text()
+    before it is written, as for every other agent-layer page.
+    """
     module = _import_dispatch_generator()
-    return module.write_dispatch(agent_dir / ASSISTANT_SUBDIR)
+    frontmatter = None
+    if documents is not None:
+        prefix = ASSISTANT_SUBDIR + "/"
+        frontmatter = {
+            rel[len(prefix):]: doc["frontmatter"]
+            for rel, doc in documents.items() if rel.startswith(prefix)
+        }
+    assistant_dir = agent_dir / ASSISTANT_SUBDIR
+    output_path = assistant_dir / "dispatch.md"
+    topics = module.scan_topics(assistant_dir, frontmatter)
+
+    registry = module.build_registry(assistant_dir, topics)
+    for article in registry["articles"]:
+        _record_io("read", article["size"])
+    json_name, ndjson_name = DISPATCH_REGISTRY_FILES
+    write_output_text(assistant_dir / json_name, module.render_registry_json(registry))
+    write_output_text(assistant_dir / ndjson_name, module.render_registry_ndjson(registry))
+    if registry_only:
+        return output_path
+
+    # Dated from the articles, so the output is byte-stable between runs.
+    content = module.build_dispatch(assistant_dir, topics=topics,
+                                    last_reviewed="articles")
+    if strip:
+        content = strip_markdown_text(content)
+    else:
+        content = content.replace("\n", "\r\n")  # as write_dispatch() writes it
+    write_output_text(output_path, content)
+    return output_path
+
+
+def _agent_assistant_pages(documents):
+    """Return (texts, frontmatter) for the assistant pages in a documents index.
+
+    Both are keyed by assistant-relative path, with each text passed through
+    strip_markdown_text() so it matches the page's agent-layer copy.
+    """
+    texts, frontmatter = {}, {}
+    if documents is not None:
+        prefix = ASSISTANT_SUBDIR + "/"
+        for rel, doc in documents.items():
+            if rel.startswith(prefix):
+                texts[rel[len(prefix):]] = strip_markdown_text(doc["text"])
+                frontmatter[rel[len(prefix):]] = doc["frontmatter"]
+    return texts, frontmatter
+
+
+def _record_unindexed_reads(agent_dir, paths, texts):
+    """Count the pages among paths (site-relative) that had to be read from agent_dir."""
+    for path in paths:
+        if path[len(ASSISTANT_SUBDIR) + 1:] not in texts:
+            _record_io("read", (agent_dir / path).stat().st_size)
+
+
+def generate_search_index(agent_dir=AGENT_DOCS_DIR, documents=None, pages=None):
+    """Write assistant/search-index.json (see akb-build-search-index.py) inside agent_dir.
+
+    Like the dispatch registries, it indexes the agent-layer version of each
+    article: pages in documents (an optional documents index) are taken from
+    it and passed through strip_markdown_text(), and any other page is read
+    from agent_dir, which must already be stripped. pages is an
+    _agent_assistant_pages() result to use instead of documents.
+    """
+    module = _import_search_indexer()
+    texts, frontmatter = pages or _agent_assistant_pages(documents)
+    assistant_dir = agent_dir / ASSISTANT_SUBDIR
+    index = module.build_index(assistant_dir, texts, frontmatter)
+    _record_unindexed_reads(agent_dir, [doc["path"] for doc in index["docs"]], texts)
+    output_path = assistant_dir / SEARCH_INDEX_FILE
+    write_output_text(output_path, module.render_index(index))
+    return output_path
+
+
+def generate_section_chunks(agent_dir=AGENT_DOCS_DIR, documents=None, pages=None):
+    """Write assistant/chunks.ndjson (see akb-export-chunks.py) inside agent_dir.
+
+    Takes its pages like generate_search_index(), so the chunk text and
+    hashes are those of the agent-layer copies.
+    """
+    module = _import_chunk_exporter()
+    texts, frontmatter = pages or _agent_assistant_pages(documents)
+    assistant_dir = agent_dir / ASSISTANT_SUBDIR
+    chunks = module.build_chunks(assistant_dir, texts, frontmatter, heading_slug)
+    _record_unindexed_reads(agent_dir, list(dict.fromkeys(c["path"] for c in chunks)), texts)
+    output_path = assistant_dir / SECTION_CHUNKS_FILE
+    write_output_text(output_path, module.render_chunks(chunks))
+    return output_path
 
 
 # =============================================================================
@@ -255,22 +919,114 @@ def generate_dispatch(agent_dir=AGENT_DOCS_DIR):
 # =============================================================================
 
 def strip_markdown_text(text):
-    """Return text with images, the @format pragma, and slider blocks removed."""
-    text = _SLIDER_BLOCK_RE.sub("", text)
-    text = _IMAGE_LINE_RE.sub("", text)
-    text = _IMAGE_INLINE_RE.sub("", text)
-    text = _FORMAT_PRAGMA_RE.sub("", text)
-    text = _EXCESS_BLANK_LINES_RE.sub("\n\n", text)
+    """Return text with images, the @format pragma, and slider blocks removed.
+
+    Image-only lines and the pragma line are dropped whole, inline images
+    are cut out of their line, and runs of three or more newlines become a
+    single blank line (see _STRIP_SUBSTITUTIONS). Fenced code blocks are
+    copied through untouched; the text between them gets exactly the
+    substitutions it always has, in the same order.
+
+    Every other segment starts at the newline after a closing fence (or at
+    the start of the text), so the line-anchored substitutions and the
+    blank-line runs see the same lines as they would in the whole text.
+    """
+    if "```" not in text and "~~~" not in text:
+        return _strip_markdown_segment(text)
+    out = []
+    cursor = 0
+    for match in _FENCED_BLOCK_RE.finditer(text):
+        out.append(_strip_markdown_segment(text[cursor:match.start()]))
+        out.append(match.group())
+        cursor = match.end()
+    out.append(_strip_markdown_segment(text[cursor:]))
+    return "".join(out)
+
+
+def _strip_markdown_segment(text):
+    for literal, pattern, replacement in _STRIP_SUBSTITUTIONS:
+        first = text.find(literal)
+        if first != -1:
+            line_start = text.rfind("\n", 0, first) + 1
+            text = text[:line_start] + pattern.sub(replacement, text[line_start:])
     return text
 
 
-def strip_agent_docs(agent_dir=AGENT_DOCS_DIR):
-    """Apply strip_markdown_text() to every Markdown file under agent_dir, in place."""
-    for md_file in agent_dir.rglob("*.md"):
+def strip_agent_file(md_file, original=None):
+    """Apply strip_markdown_text() to a single Markdown file, in place.
+
+    original is the file's current text, if the caller already has it.
+    Returns True if the file was rewritten.
+    """
+    if original is None:
         original = md_file.read_text(encoding="utf-8")
-        stripped = strip_markdown_text(original)
-        if stripped != original:
-            md_file.write_text(stripped, encoding="utf-8", newline="\n")
+        _record_io("read", md_file.stat().st_size)
+    stripped = strip_markdown_text(original)
+    if stripped == original:
+        return False
+    write_output_text(md_file, stripped)
+    return True
+
+
+def _strip_agent_job(job):
+    """Process-pool entry point: job is an (md_file, original_or_None) pair.
+
+    Returns (rewritten, io) where io is the IO_STATS delta of the job, which
+    a worker process cannot add to the parent's totals itself.
+    """
+    md_file, original = job
+    before = IO_STATS.copy()
+    rewritten = strip_agent_file(md_file, original)
+    return rewritten, IO_STATS - before
+
+
+def _pool_context():
+    """Return a multiprocessing context whose workers can import this module.
+
+    fork (POSIX) inherits the already-loaded module; spawn re-imports it by
+    name, which only works when it is running as a script (it is normally
+    loaded from its hyphenated filename). Returns None when neither applies.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    if __name__ == "__main__":
+        return multiprocessing.get_context("spawn")
+    return None
+
+
+def strip_agent_docs(agent_dir=AGENT_DOCS_DIR, documents=None, jobs=None):
+    """Apply strip_markdown_text() to every Markdown file under agent_dir, in place.
+
+    With a (complete) documents index, pages are taken from the index rather
+    than walked and re-read; any agent-only file not in the index, such as a
+    regenerated dispatch.md, must then be stripped separately.
+
+    jobs is the number of worker processes (default: CPU count). Trees
+    smaller than PARALLEL_STRIP_MIN_FILES, or jobs=1, are stripped serially.
+    Each file's output depends only on its own input, so the result is the
+    same either way. Returns the sorted agent_dir-relative paths rewritten.
+    """
+    if documents is None:
+        work = [(md_file, None) for md_file in sorted(agent_dir.rglob("*.md"))]
+    else:
+        work = [(agent_dir / rel, doc["text"])
+                for rel, doc in sorted(documents.items())]
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    context = _pool_context()
+    if jobs > 1 and len(work) >= PARALLEL_STRIP_MIN_FILES and context is not None:
+        chunksize = max(1, len(work) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+            results = list(pool.map(_strip_agent_job, work, chunksize=chunksize))
+        for _rewritten, io in results:
+            IO_STATS.update(io)
+    else:
+        results = [_strip_agent_job(job) for job in work]
+
+    return [md_file.relative_to(agent_dir).as_posix()
+            for (md_file, _original), (rewritten, _io) in zip(work, results)
+            if rewritten]
 
 
 # =============================================================================
@@ -282,9 +1038,12 @@ def write_build_config(source_config=SOURCE_CONFIG_PATH,
                        docs_dir_name="human-docs"):
     """Write build_config as a copy of source_config with docs_dir overridden."""
     text = source_config.read_text(encoding="utf-8")
+    _record_io("read", source_config.stat().st_size)
     doc = tomlkit.parse(text)
     doc["project"]["docs_dir"] = docs_dir_name
-    build_config.write_text(tomlkit.dumps(doc), encoding="utf-8", newline="\n")
+    data = tomlkit.dumps(doc).encode("utf-8")
+    build_config.write_bytes(data)
+    _record_io("written", len(data))
     return build_config
 
 
@@ -292,24 +1051,175 @@ def write_build_config(source_config=SOURCE_CONFIG_PATH,
 # Step 6: build + overlay
 # =============================================================================
 
-def overlay_agent_layer(agent_dir=AGENT_DOCS_DIR, site_dir=SITE_DIR):
-    """Copy every agent_dir/**/*.md onto site_dir/** at the same relative path."""
-    copied = []
-    for md_file in agent_dir.rglob("*.md"):
-        rel = md_file.relative_to(agent_dir)
-        dest = site_dir / rel
+def _same_content(src, dest):
+    """Return True if dest exists with exactly src's bytes (sizes checked first)."""
+    try:
+        dest_size = dest.stat().st_size
+    except FileNotFoundError:
+        return False
+    if dest_size != src.stat().st_size:
+        return False
+    src_bytes, dest_bytes = src.read_bytes(), dest.read_bytes()
+    _record_io("read", len(src_bytes) + len(dest_bytes))
+    return src_bytes == dest_bytes
+
+
+def overlay_agent_layer(agent_dir=AGENT_DOCS_DIR, site_dir=SITE_DIR, pages=None):
+    """Sync every agent_dir/**/*.md (and ASSISTANT_DATA_FILES) onto site_dir/**.
+
+    A page is only written when site_dir's copy is missing or differs (size,
+    then content), so an unchanged page keeps its mtime for rsync-style
+    deploys of a site/ that was not rebuilt from scratch. Any other *.md
+    under site_dir is an overlay whose source has gone, and is deleted.
+
+    pages optionally lists the agent-layer pages (relative POSIX paths, e.g.
+    prepare()'s summary["pages"]) so agent_dir need not be walked.
+
+    Returns a dict of sorted rel paths: "written", "unchanged" and "removed".
+    """
+    if pages is None:
+        pages = [md_file.relative_to(agent_dir).as_posix()
+                 for md_file in agent_dir.rglob("*.md")]
+        pages += [f"{ASSISTANT_SUBDIR}/{name}" for name in ASSISTANT_DATA_FILES
+                  if (agent_dir / ASSISTANT_SUBDIR / name).is_file()]
+    written = []
+    unchanged = []
+    for rel in pages:
+        src, dest = agent_dir / rel, site_dir / rel
+        if _same_content(src, dest):
+            unchanged.append(rel)
+            continue
         dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(md_file, dest)
-        copied.append(rel.as_posix())
-    return sorted(copied)
+        shutil.copy2(src, dest)
+        size = dest.stat().st_size
+        _record_io("read", size)
+        _record_io("written", size)
+        written.append(rel)
 
+    overlaid = set(pages)
+    removed = []
+    for md_file in sorted(site_dir.rglob("*.md")):
+        rel = md_file.relative_to(site_dir).as_posix()
+        if rel not in overlaid and _remove_output(md_file, site_dir):
+            removed.append(rel)
+    return {"written": sorted(written), "unchanged": sorted(unchanged),
+            "removed": sorted(removed)}
 
-def run_zensical_build(build_config=BUILD_CONFIG_PATH):
-    subprocess.run(
-        [sys.executable, "-m", "zensical", "build",
-         "-f", str(build_config), "-c"],
-        cwd=REPO_ROOT, check=True,
-    )
+
+def _gzip_bytes(data):
+    # mtime=0 keeps the output identical for identical input.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli_bytes(data):
+    return brotli.compress(data, quality=11)
+
+
+SIDECAR_COMPRESSORS = {".gz": _gzip_bytes, ".br": _brotli_bytes}
+
+
+def sidecar_suffixes():
+    """Return the sidecar suffixes compress_site_files() can write here."""
+    return (".gz", ".br") if brotli is not None else (".gz",)
+
+
+def _compress_job(job):
+    """Bring one file's sidecars up to date; run on a worker thread.
+
+    A sidecar is current when its mtime equals the source file's (it is set
+    so on writing). Returns (written, unchanged, removed, io): sidecar paths
+    by outcome, plus the (direction, nbytes) I/O events for the caller to
+    record, as IO_STATS is not updated from worker threads.
+    """
+    src, suffixes, min_size = job
+    written, unchanged, removed, io = [], [], [], []
+    stat = src.stat()
+    data = None
+    for suffix in suffixes:
+        sidecar = src.with_name(src.name + suffix)
+        if stat.st_size < min_size:
+            if sidecar.exists():
+                sidecar.unlink()
+                removed.append(sidecar)
+            continue
+        try:
+            if sidecar.stat().st_mtime_ns == stat.st_mtime_ns:
+                unchanged.append(sidecar)
+                continue
+        except FileNotFoundError:
+            pass
+        if data is None:
+            data = src.read_bytes()
+            io.append(("read", len(data)))
+        compressed = SIDECAR_COMPRESSORS[suffix](data)
+        # Replace rather than rewrite, so a server never sees a partial file.
+        partial = sidecar.with_name(sidecar.name + ".tmp")
+        partial.write_bytes(compressed)
+        os.utime(partial, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(partial, sidecar)
+        io.append(("written", len(compressed)))
+        written.append(sidecar)
+    return written, unchanged, removed, io
+
+
+def compress_site_files(site_dir=SITE_DIR, pages=None, suffixes=None,
+                        min_size=COMPRESS_MIN_BYTES, jobs=None):
+    """Write pre-compressed sidecars (page.md.gz, page.md.br) next to site files.
+
+    Covers the overlaid agent pages (pages, as for overlay_agent_layer();
+    default: every *.md under site_dir) plus COMPRESS_EXTRA_FILES, so a static
+    server can send pre-compressed bodies. suffixes defaults to
+    sidecar_suffixes(): .br is only written when the brotli module is
+    installed. Files smaller than min_size get no sidecar.
+
+    Only sources changed since their sidecar was written are recompressed,
+    on jobs worker threads (default: CPU count). Sidecars left over from
+    removed pages, files now below min_size, or a format no longer written
+    are deleted so they can never be served stale.
+
+    Returns a dict of sorted site_dir-relative sidecar paths: "written",
+    "unchanged" and "removed".
+    """
+    if pages is None:
+        pages = [md_file.relative_to(site_dir).as_posix()
+                 for md_file in site_dir.rglob("*.md")]
+    if suffixes is None:
+        suffixes = sidecar_suffixes()
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    sources = [site_dir / rel for rel in pages]
+    sources += [site_dir / rel for rel in COMPRESS_EXTRA_FILES
+                if (site_dir / rel).is_file()]
+
+    outcome = {"written": [], "unchanged": [], "removed": []}
+    work = [(src, suffixes, min_size) for src in sources]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for written, unchanged, removed, io in pool.map(_compress_job, work):
+            outcome["written"] += written
+            outcome["unchanged"] += unchanged
+            outcome["removed"] += removed
+            for direction, nbytes in io:
+                _record_io(direction, nbytes)
+
+    current = set(outcome["written"] + outcome["unchanged"])
+    candidates = [sidecar for suffix in SIDECAR_COMPRESSORS
+                  for sidecar in site_dir.rglob(f"*.md{suffix}")]
+    candidates += [site_dir / f"{rel}{suffix}" for rel in COMPRESS_EXTRA_FILES
+                   for suffix in SIDECAR_COMPRESSORS]
+    for sidecar in sorted(candidates):
+        if sidecar not in current and _remove_output(sidecar, site_dir):
+            outcome["removed"].append(sidecar)
+
+    return {key: sorted(path.relative_to(site_dir).as_posix() for path in paths)
+            for key, paths in outcome.items()}
+
+
+def run_zensical_build(build_config=BUILD_CONFIG_PATH, clean=True):
+    """Run `zensical build`; clean=True (-c) rebuilds site/ from scratch."""
+    command = [sys.executable, "-m", "zensical", "build", "-f", str(build_config)]
+    if clean:
+        command.append("-c")
+    subprocess.run(command, cwd=REPO_ROOT, check=True)
 
 
 def run_zensical_serve(build_config=BUILD_CONFIG_PATH):
@@ -319,23 +1229,527 @@ def run_zensical_serve(build_config=BUILD_CONFIG_PATH):
     )
 
 
+def start_zensical_serve(build_config=BUILD_CONFIG_PATH):
+    """Start `zensical serve` in the background and return its Popen handle."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "zensical", "serve", "-f", str(build_config)],
+        cwd=REPO_ROOT,
+    )
+
+
+# =============================================================================
+# Incremental prep
+# =============================================================================
+
+def default_manifest_path(agent_dir=AGENT_DOCS_DIR):
+    """Return the manifest path used for agent_dir's build (a sibling cache dir)."""
+    return agent_dir.parent / BUILD_CACHE_DIRNAME / MANIFEST_FILENAME
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    _record_io("read", size)
+    return digest.hexdigest()
+
+
+def _is_assistant_page(rel):
+    return rel.startswith(ASSISTANT_SUBDIR + "/") and rel.endswith(".md")
+
+
+def is_human_layer_file(rel, publication_status=None):
+    """Return True if docs-relative POSIX path rel survives the human-layer filter.
+
+    Mirrors delete_non_published_assistant_pages(): everything under
+    assistant/support/ is dropped, as is any other assistant/**/*.md whose
+    publication_status is not "published".
+    """
+    if rel.startswith(f"{ASSISTANT_SUBDIR}/{SUPPORT_SUBDIR}/"):
+        return False
+    if _is_assistant_page(rel):
+        return publication_status == "published"
+    return True
+
+
+# Manifest entry keys for the assistant-page frontmatter that dispatch.md
+# is rendered from, mapped to their frontmatter field names.
+_DISPATCH_FIELDS = {
+    "status": "publication_status",
+    "authority": "authority_level",
+    "title": "title",
+    "last_reviewed": "last_reviewed",
+}
+
+
+def scan_source_tree(docs_dir, previous=None, documents=None):
+    """Return {rel_path: entry} describing every file under docs_dir.
+
+    Each entry records ``size``, ``mtime_ns`` and ``sha256``; assistant pages
+    also record the frontmatter the dispatch registry is built from:
+    ``status`` (publication_status), ``authority`` (authority_level),
+    ``title`` and ``last_reviewed`` (dispatch.md is dated from the newest). Markdown entries record their outgoing ``links`` (see
+    link_graph()), persisting the site's link graph between runs, along with
+    their heading ``anchors`` and the internal links carrying a fragment
+    (``anchor_links``) that find_broken_links() checks them against. Files whose
+    size and mtime match their entry in previous are not re-read. Every
+    Markdown file that is read is also added to documents, if given (see
+    read_document()).
+    """
+    previous = previous or {}
+    entries = {}
+    for path in sorted(docs_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        rel = path.relative_to(docs_dir).as_posix()
+        stat = path.stat()
+        prev = previous.get(rel)
+        if (prev and prev["size"] == stat.st_size
+                and prev["mtime_ns"] == stat.st_mtime_ns):
+            entries[rel] = prev
+            continue
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if rel.endswith(".md"):
+            doc = read_document(path)
+            entry["sha256"] = doc["sha256"]
+            entry["links"] = link_graph({rel: doc})[rel]
+            entry["anchors"] = doc["anchors"]
+            entry["anchor_links"] = sorted(
+                {target for target in doc["links"] if "#" in target
+                 and not (target.startswith("//") or _URL_SCHEME_RE.match(target))})
+            if _is_assistant_page(rel):
+                for key, field in _DISPATCH_FIELDS.items():
+                    if doc["frontmatter"].get(field):
+                        entry[key] = doc["frontmatter"][field]
+            if documents is not None:
+                documents[rel] = doc
+        else:
+            entry["sha256"] = _file_sha256(path)
+        entries[rel] = entry
+    return entries
+
+
+def read_manifest(manifest_path):
+    """Return the parsed manifest at manifest_path, or None if absent/unusable."""
+    try:
+        data = manifest_path.read_bytes()
+        manifest = json.loads(data)
+    except (OSError, ValueError):
+        return None
+    _record_io("read", len(data))
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def write_manifest(manifest_path, manifest):
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    data = (json.dumps(manifest, indent=1, sort_keys=True) + "\n").encode("utf-8")
+    manifest_path.write_bytes(data)
+    _record_io("written", len(data))
+
+
+def _manifest_layout(docs_dir, human_dir, agent_dir, build_config):
+    return {
+        "docs_dir": str(docs_dir.resolve()),
+        "human_dir": str(human_dir.resolve()),
+        "agent_dir": str(agent_dir.resolve()),
+        "build_config": str(build_config.resolve()),
+    }
+
+
+def _remove_output(path, root):
+    """Delete path (if present) and any directories it leaves empty below root."""
+    if not path.exists():
+        return False
+    path.unlink()
+    parent = path.parent
+    while parent != root and not any(parent.iterdir()):
+        parent.rmdir()
+        parent = parent.parent
+    return True
+
+
+def apply_source_changes(docs_dir, human_dir, agent_dir, entries, changed, removed,
+                         link_mode="auto", documents=None, jobs=None):
+    """Bring human_dir and agent_dir up to date for the changed/removed rel paths.
+
+    entries is the current scan_source_tree() result; link_mode is as for
+    materialize_file(); documents is the documents index filled in by that
+    scan. The changed pages are stripped by strip_agent_docs() on jobs
+    workers. Returns a dict with keys:
+      - "human_removed": sorted rel paths that left human_dir (deleted at the
+        source, or filtered out after a publication_status change)
+      - "human_pages": changed Markdown paths now present in human_dir
+      - "non_published_index_topics": as for delete_non_published_assistant_pages()
+    """
+    human_removed = []
+    human_pages = []
+    non_published_index_topics = []
+    to_strip = {}
+
+    for rel in removed:
+        if _remove_output(human_dir / rel, human_dir):
+            human_removed.append(rel)
+        _remove_output(agent_dir / rel, agent_dir)
+
+    for rel in changed:
+        src = docs_dir / rel
+        materialize_file(src, agent_dir / rel, link_mode)
+        if rel.endswith(".md"):
+            to_strip[rel] = _get_document(documents, docs_dir, rel)
+
+        if is_human_layer_file(rel, entries[rel].get("status")):
+            materialize_file(src, human_dir / rel, link_mode)
+            if rel.endswith(".md"):
+                human_pages.append(rel)
+            continue
+        if _remove_output(human_dir / rel, human_dir):
+            human_removed.append(rel)
+        if (rel.endswith("/index.md")
+                and not rel.startswith(f"{ASSISTANT_SUBDIR}/{SUPPORT_SUBDIR}/")):
+            topic = rel[len(ASSISTANT_SUBDIR) + 1:-len("/index.md")]
+            if topic:
+                non_published_index_topics.append(topic)
+    strip_agent_docs(agent_dir, to_strip, jobs)
+
+    return {
+        "human_removed": sorted(human_removed),
+        "human_pages": human_pages,
+        "non_published_index_topics": sorted(non_published_index_topics),
+    }
+
+
+def human_layer_paths(entries):
+    """Return layer_paths() of the human layer described by a scan_source_tree() result."""
+    return layer_paths(rel for rel, entry in entries.items()
+                       if is_human_layer_file(rel, entry.get("status")))
+
+
+def pages_to_recheck(entries, info, surviving):
+    """Return the human-layer pages whose assistant links an incremental prep must re-check.
+
+    That is every changed page still in the human layer, plus (via the
+    reverse link graph) every surviving page linking to a path, or an
+    ancestor directory of a path, that just left the human layer.
+    info is the apply_source_changes() result and surviving the
+    human_layer_paths() of entries.
+    """
+    pages = set(info["human_pages"])
+    gone = layer_paths(rel for rel in info["human_removed"]
+                       if _is_assistant_page(rel)) - surviving
+    if gone:
+        graph = {rel: entry["links"] for rel, entry in entries.items()
+                 if "links" in entry}
+        referrers = reverse_link_graph(graph)
+        for target in gone:
+            pages.update(referrers.get(target, ()))
+    return sorted(rel for rel in pages
+                  if is_human_layer_file(rel, entries[rel].get("status")))
+
+
+def dispatch_inputs_changed(previous, entries, changed, removed):
+    """Return True if dispatch.md must be regenerated for these source changes.
+
+    The registry only depends on which assistant pages exist and on their
+    status, authority level, title and last_reviewed date (see
+    _DISPATCH_FIELDS), so body-only edits do not count.
+    """
+    for rel in changed + removed:
+        if not _is_assistant_page(rel):
+            continue
+        if rel == f"{ASSISTANT_SUBDIR}/dispatch.md":
+            return True  # the docs/ copy would replace the generated one
+        old, new = previous.get(rel), entries.get(rel)
+        if old is None or new is None:
+            return True
+        if any(old.get(key) != new.get(key) for key in _DISPATCH_FIELDS):
+            return True
+    return False
+
+
+def _agent_pages(entries):
+    """Return the sorted agent-layer pages for a scan_source_tree() result.
+
+    That is every Markdown path, plus the generated dispatch.md and
+    ASSISTANT_DATA_FILES when there is an assistant tree.
+    """
+    pages = {rel for rel in entries if rel.endswith(".md")}
+    if any(rel.startswith(ASSISTANT_SUBDIR + "/") for rel in entries):
+        pages.add(f"{ASSISTANT_SUBDIR}/dispatch.md")
+        pages.update(f"{ASSISTANT_SUBDIR}/{name}" for name in ASSISTANT_DATA_FILES)
+    return sorted(pages)
+
+
+def prepare_incremental(docs_dir=DOCS_DIR, human_dir=HUMAN_DOCS_DIR,
+                        agent_dir=AGENT_DOCS_DIR, source_config=SOURCE_CONFIG_PATH,
+                        build_config=BUILD_CONFIG_PATH, manifest_path=None,
+                        link_mode="auto", jobs=None, profile=None):
+    """Update the generated layers for only the files changed since the last prep.
+
+    Falls back to a full prepare() when the manifest is missing, was written
+    for different paths, or the generated layers no longer exist. The
+    manifest is removed before any output is touched and only rewritten once
+    prep succeeds, so an interrupted or failed run forces a full prep next
+    time.
+
+    link_mode, jobs and profile are as for prepare().
+
+    Returns the same summary dict as prepare(), and raises the same
+    validation errors. Every page's links are re-validated each run, from
+    the link targets and anchors recorded in the manifest.
+    """
+    if manifest_path is None:
+        manifest_path = default_manifest_path(agent_dir)
+    layout = _manifest_layout(docs_dir, human_dir, agent_dir, build_config)
+    manifest = read_manifest(manifest_path)
+    if (manifest is None or manifest.get("layout") != layout
+            or not human_dir.is_dir() or not agent_dir.is_dir()):
+        return prepare(docs_dir, human_dir, agent_dir, source_config,
+                       build_config, manifest_path=manifest_path,
+                       link_mode=link_mode, jobs=jobs, profile=profile)
+
+    previous = manifest["files"]
+    documents = {}
+    with profile_stage(profile, "scan_source_tree"):
+        entries = scan_source_tree(docs_dir, previous, documents)
+        changed = sorted(rel for rel, entry in entries.items()
+                         if previous.get(rel, {}).get("sha256") != entry["sha256"])
+        removed = sorted(set(previous) - set(entries))
+        config_sha256 = _file_sha256(source_config)
+
+    manifest_path.unlink()
+    with profile_stage(profile, "apply_source_changes"):
+        info = apply_source_changes(docs_dir, human_dir, agent_dir, entries,
+                                    changed, removed, link_mode, documents, jobs)
+    _warn_non_published_index_topics(info["non_published_index_topics"])
+
+    with profile_stage(profile, "validate_links"):
+        surviving = human_layer_paths(entries)
+        errors = find_broken_assistant_links(
+            human_dir, pages_to_recheck(entries, info, surviving), documents,
+            surviving)
+        if errors:
+            raise HumanDocsValidationError(errors)
+        validate_links(entries)
+
+    dispatch_regenerated = dispatch_inputs_changed(
+        previous, entries, changed, removed)
+    assistant_changed = any(_is_assistant_page(rel) for rel in changed + removed)
+    if dispatch_regenerated:
+        with profile_stage(profile, "generate_dispatch"):
+            generate_dispatch(agent_dir, documents, strip=True)
+    elif assistant_changed:
+        # Body edits still change the article hashes in the JSON registries.
+        with profile_stage(profile, "generate_dispatch"):
+            generate_dispatch(agent_dir, documents, strip=True, registry_only=True)
+    if dispatch_regenerated or assistant_changed:
+        pages = _agent_assistant_pages(documents)
+        with profile_stage(profile, "build_search_index"):
+            generate_search_index(agent_dir, pages=pages)
+        with profile_stage(profile, "export_section_chunks"):
+            generate_section_chunks(agent_dir, pages=pages)
+
+    if config_sha256 != manifest.get("config_sha256") or not build_config.exists():
+        with profile_stage(profile, "write_build_config"):
+            write_build_config(source_config, build_config)
+
+    with profile_stage(profile, "write_manifest"):
+        write_manifest(manifest_path, {
+            "version": MANIFEST_VERSION,
+            "layout": layout,
+            "config_sha256": config_sha256,
+            "files": entries,
+        })
+    return {"mode": "incremental", "changed": changed, "removed": removed,
+            "pages": _agent_pages(entries),
+            "dispatch_regenerated": dispatch_regenerated}
+
+
+# =============================================================================
+# Watch mode
+# =============================================================================
+
+def _watch_snapshot(paths):
+    """Return {path: (size, mtime_ns)} for every file under (or at) paths."""
+    snapshot = {}
+    for root in paths:
+        candidates = root.rglob("*") if root.is_dir() else [root]
+        for path in candidates:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # vanished mid-walk, or never existed
+            if not path.is_dir():
+                snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def watch_sources(docs_dir=DOCS_DIR, human_dir=HUMAN_DOCS_DIR, agent_dir=AGENT_DOCS_DIR,
+                  source_config=SOURCE_CONFIG_PATH, build_config=BUILD_CONFIG_PATH,
+                  includes_dir=INCLUDES_DIR, manifest_path=None, link_mode="auto",
+                  jobs=None, interval=WATCH_INTERVAL, stop=None):
+    """Keep the generated layers in sync with docs/, includes/ and the config.
+
+    Polls the sources every interval seconds and runs prepare_incremental()
+    after each change, so a live-reloading server watching human-docs/ picks
+    the update up immediately. includes/ is not copied into either layer,
+    but it is appended to every page at render time, so a change there
+    rewrites zensical.build.toml to make the server rebuild everything.
+
+    A validation error is reported and watching continues (the next change
+    triggers a full prep, see prepare_incremental()), as does any OSError or
+    ValueError, such as a file deleted mid-scan or a half-saved page that is
+    not yet valid UTF-8: that pass is retried after the next change. Runs
+    until stop() returns True, or forever if stop is None.
+    """
+    watched = (docs_dir, includes_dir, source_config)
+    # Sync once after the first snapshot, so edits made before watching
+    # started are not missed (a no-op when the layers are already current).
+    snapshot = _watch_snapshot(watched)
+    touched = set()
+    while True:
+        try:
+            summary = prepare_incremental(
+                docs_dir, human_dir, agent_dir, source_config, build_config,
+                manifest_path=manifest_path, link_mode=link_mode, jobs=jobs)
+        except (HumanDocsValidationError, LinkValidationError) as exc:
+            _print_validation_errors(exc)
+        except (OSError, ValueError) as exc:
+            print(f"error: prep failed ({exc}); retrying after the next change",
+                  file=sys.stderr, flush=True)
+        else:
+            if includes_dir.is_dir() and any(
+                    path.is_relative_to(includes_dir) for path in touched):
+                write_build_config(source_config, build_config)
+            print(
+                f"Updated ({summary['mode']}): {len(summary['changed'])} changed, "
+                f"{len(summary['removed'])} removed"
+                + (", dispatch regenerated" if summary["dispatch_regenerated"] else ""),
+                flush=True,
+            )
+
+        change = _wait_for_change(watched, snapshot, interval, stop)
+        if change is None:
+            return
+        touched, snapshot = change
+
+
+def _wait_for_change(watched, snapshot, interval, stop):
+    """Poll until watched differs from snapshot; return (touched_paths, new_snapshot).
+
+    Returns None once stop() returns True.
+    """
+    while stop is None or not stop():
+        time.sleep(interval)
+        current = _watch_snapshot(watched)
+        if current != snapshot:
+            touched = {path for path in current.keys() | snapshot.keys()
+                       if current.get(path) != snapshot.get(path)}
+            return touched, current
+    return None
+
+
 # =============================================================================
 # Orchestration
 # =============================================================================
 
 def prepare(docs_dir=DOCS_DIR, human_dir=HUMAN_DOCS_DIR, agent_dir=AGENT_DOCS_DIR,
-            source_config=SOURCE_CONFIG_PATH, build_config=BUILD_CONFIG_PATH):
-    """Run the full prep pipeline: clean, copy, filter, dispatch, strip, config.
+            source_config=SOURCE_CONFIG_PATH, build_config=BUILD_CONFIG_PATH,
+            manifest_path=None, link_mode="auto", jobs=None, profile=None):
+    """Run the full prep pipeline: scan, clean, copy, filter, strip, dispatch, config.
+
+    docs_dir is scanned once up front into a documents index (see
+    read_document()) shared by every later stage. link_mode controls how
+    docs/ files are placed into both layers (see materialize_file()); files
+    the pipeline rewrites are always replaced rather than modified in place,
+    so docs_dir is never touched. jobs is passed to strip_agent_docs().
+    Each stage is timed into profile, if given (see profile_stage()).
+
+    Records a manifest of docs_dir (see prepare_incremental()) on success and
+    returns a summary dict with keys "mode" ("full"), "changed", "removed",
+    "pages" (agent-layer pages, for overlay_agent_layer()) and
+    "dispatch_regenerated".
 
     Raises HumanDocsValidationError if a published human page links to an
-    unbuilt assistant page.
+    unbuilt assistant page, and LinkValidationError if any other internal
+    link or anchor in either layer is broken (see find_broken_links()).
     """
-    clean_generated(human_dir, agent_dir, build_config)
-    copy_layers(docs_dir, human_dir, agent_dir)
-    filter_human_docs(human_dir)
-    generate_dispatch(agent_dir)
-    strip_agent_docs(agent_dir)
-    write_build_config(source_config, build_config)
+    if manifest_path is None:
+        manifest_path = default_manifest_path(agent_dir)
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    documents = {}
+    with profile_stage(profile, "scan_source_tree"):
+        entries = scan_source_tree(docs_dir, documents=documents)
+
+    with profile_stage(profile, "clean_generated"):
+        clean_generated(human_dir, agent_dir, build_config)
+    with profile_stage(profile, "copy_layers"):
+        copy_layers(docs_dir, human_dir, agent_dir, link_mode)
+    with profile_stage(profile, "filter_human_docs"):
+        filter_human_docs(human_dir, documents)
+    with profile_stage(profile, "validate_links"):
+        validate_links(entries)
+    # Strip before regenerating dispatch.md: stripping from the index would
+    # otherwise overwrite the generated file with the docs/ copy.
+    with profile_stage(profile, "strip_agent_docs"):
+        strip_agent_docs(agent_dir, documents, jobs)
+    with profile_stage(profile, "generate_dispatch"):
+        generate_dispatch(agent_dir, documents, strip=True)
+    pages = _agent_assistant_pages(documents)
+    with profile_stage(profile, "build_search_index"):
+        generate_search_index(agent_dir, pages=pages)
+    with profile_stage(profile, "export_section_chunks"):
+        generate_section_chunks(agent_dir, pages=pages)
+    with profile_stage(profile, "write_build_config"):
+        write_build_config(source_config, build_config)
+
+    with profile_stage(profile, "write_manifest"):
+        write_manifest(manifest_path, {
+            "version": MANIFEST_VERSION,
+            "layout": _manifest_layout(docs_dir, human_dir, agent_dir, build_config),
+            "config_sha256": _file_sha256(source_config),
+            "files": entries,
+        })
+    return {"mode": "full", "changed": sorted(entries), "removed": [],
+            "pages": _agent_pages(entries), "dispatch_regenerated": True}
+
+
+def _print_validation_errors(exc):
+    if isinstance(exc, LinkValidationError):
+        print(
+            "error: broken internal link(s). Fix the source link, or the "
+            "heading it points at:",
+            file=sys.stderr,
+        )
+        for layer, page, target, problem in exc.errors:
+            print(f"  {layer}: {page} -> {target} ({problem})", file=sys.stderr)
+        return
+    print(
+        "error: published human-docs page(s) link to an unbuilt assistant "
+        "page (stub, draft, or support/). Fix the source link or change "
+        "the target page's publication_status:",
+        file=sys.stderr,
+    )
+    for offending_page, link_target in exc.errors:
+        print(f"  {offending_page} -> {link_target}", file=sys.stderr)
+
+
+def _serve_and_watch(link_mode="auto", jobs=None):
+    """Run `zensical serve` in the background while watch_sources() keeps prep current."""
+    server = start_zensical_serve()
+    try:
+        watch_sources(link_mode=link_mode, jobs=jobs,
+                      stop=lambda: server.poll() is not None)
+    finally:
+        if server.poll() is None:
+            server.terminate()
+            server.wait()
 
 
 def main(argv=None):
@@ -344,23 +1758,102 @@ def main(argv=None):
         "--build", action="store_true",
         help="After prep, run `zensical build -c` and overlay agent-docs onto site/.",
     )
+    parser.add_argument(
+        "--no-clean", action="store_true",
+        help="With --build, run `zensical build` without -c, keeping site/ so "
+        "unchanged files (including overlaid Markdown) keep their mtimes.",
+    )
+    parser.add_argument(
+        "--compress", action="store_true",
+        help="With --build, write pre-compressed .gz (and .br, if the brotli "
+        "module is installed) sidecars for the overlaid Markdown and llms.txt.",
+    )
     parser.add_argument(
         "--serve", action="store_true",
-        help="After prep, run `zensical serve` (blocking; re-run this script to refresh).",
+        help="After prep, run `zensical serve` (blocking; re-run this script, "
+        "or use --watch, to refresh).",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Like --serve, but keep human-docs/ and agent-docs/ updated "
+        "incrementally as docs/, includes/, or zensical.toml change.",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Reuse the previous prep output, updating only files changed since "
+        "(falls back to a full prep when no manifest exists).",
+    )
+    parser.add_argument(
+        "--link-mode", choices=LINK_MODES, default="auto",
+        help="How to place docs/ files into human-docs/ and agent-docs/: "
+        "copy-on-write reflink, hardlink, or plain copy (default: auto, "
+        "the first of those the filesystem supports).",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=None, metavar="N",
+        help="Worker processes for agent-docs stripping, and threads for "
+        "--compress (default: CPU count; 1 disables parallelism).",
+    )
+    parser.add_argument(
+        "--profile", type=Path, nargs="?", const=PROFILE_REPORT_PATH,
+        default=None, metavar="PATH",
+        help="Record wall time and files/bytes read and written per stage, "
+        "print a summary table, and write a JSON report to PATH (default: "
+        ".build-cache/profile.json).",
     )
     args = parser.parse_args(argv)
 
-    if args.build and args.serve:
-        print("error: --build and --serve are mutually exclusive", file=sys.stderr)
+    if args.build and (args.serve or args.watch):
+        print("error: --build and --serve/--watch are mutually exclusive",
+              file=sys.stderr)
+        return 1
+    if args.compress and not args.build:
+        print("error: --compress requires --build", file=sys.stderr)
+        return 1
+    if args.jobs is not None and args.jobs < 1:
+        print("error: --jobs must be at least 1", file=sys.stderr)
         return 1
 
+    profile = new_profile() if args.profile else None
     try:
-        prepare()
+        if args.incremental or args.watch:
+            summary = prepare_incremental(link_mode=args.link_mode,
+                                          jobs=args.jobs, profile=profile)
+            if summary["mode"] == "incremental":
+                print(f"Incremental prep: {len(summary['changed'])} changed, "
+                      f"{len(summary['removed'])} removed")
+        else:
+            summary = prepare(link_mode=args.link_mode, jobs=args.jobs,
+                              profile=profile)
+
+        if args.build:
+            with profile_stage(profile, "zensical_build"):
+                run_zensical_build(clean=not args.no_clean)
+                if profile is not None:
+                    # zensical writes site/ from a subprocess; count its output.
+                    _record_tree_written(SITE_DIR)
+            with profile_stage(profile, "overlay_agent_layer"):
+                overlay = overlay_agent_layer(pages=summary["pages"])
+            print(f"Overlay: {len(overlay['written'])} written, "
+                  f"{len(overlay['unchanged'])} unchanged, "
+                  f"{len(overlay['removed'])} removed")
+            if args.compress:
+                with profile_stage(profile, "compress_site_files"):
+                    sidecars = compress_site_files(pages=summary["pages"],
+                                                   jobs=args.jobs)
+                print(f"Sidecars ({', '.join(sidecar_suffixes())}): "
+                      f"{len(sidecars['written'])} written, "
+                      f"{len(sidecars['unchanged'])} unchanged, "
+                      f"{len(sidecars['removed'])} removed")
+        if profile is not None:
+            report = profile_report(profile, summary["mode"])
+            print(format_profile_table(report))
+            print(f"Profile written: {write_profile_report(report, args.profile)}")
 
         if args.build:
-            run_zensical_build()
-            overlay_agent_layer()
             print(f"Build complete: {SITE_DIR}")
+        elif args.watch:
+            _serve_and_watch(link_mode=args.link_mode, jobs=args.jobs)
         elif args.serve:
             run_zensical_serve()
         else:
@@ -369,15 +1862,8 @@ def main(argv=None):
     except KeyboardInterrupt:
         print("\nOperation canceled.", file=sys.stderr)
         return 130
-    except HumanDocsValidationError as exc:
-        print(
-            "error: published human-docs page(s) link to an unbuilt assistant "
-            "page (stub, draft, or support/). Fix the source link or change "
-            "the target page's publication_status:",
-            file=sys.stderr,
-        )
-        for offending_page, link_target in exc.errors:
-            print(f"  {offending_page} -> {link_target}", file=sys.stderr)
+    except (HumanDocsValidationError, LinkValidationError) as exc:
+        _print_validation_errors(exc)
         return 1
 
     return 0
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""check-external-links.py - Check the wiki's external (http/https) links.
+
+Collects every external link target in docs/ (using build-site.py's link
+extraction, so frontmatter, comments and code are skipped), deduplicates
+them (ignoring any #fragment, which is never sent to the server), and checks
+each unique URL once: a HEAD request first, falling back
+to GET for servers that reject or mishandle HEAD. Any 2xx/3xx final
+response counts as valid.
+
+Checks run concurrently on an asyncio event loop, with a global limit on
+in-flight requests and a smaller per-host limit so no single server is
+hammered. Each request is a blocking urllib call run on a worker thread,
+so no third-party HTTP client is needed.
+
+Results are cached in .build-cache/external-links.json and reused for
+--ttl-hours (default 12, as in utilities/check-links.ps1). Timeouts are
+never served from the cache; they are always rechecked. --no-cache ignores
+the cache for this run, but still records fresh results.
+
+Exits non-zero, listing each broken URL and the pages linking to it, if any
+link fails.
+
+CLI usage (run from any working directory):
+
+    python utilities/check-external-links.py
+    python utilities/check-external-links.py --no-cache --concurrency 32
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import importlib.util
+import json
+import socket
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urldefrag, urlsplit
+
+SCRIPT_DIR = Path(__file__).parent
+REPO_ROOT = SCRIPT_DIR.parent.resolve()
+
+DOCS_DIR = REPO_ROOT / "docs"
+CACHE_PATH = REPO_ROOT / ".build-cache" / "external-links.json"
+CACHE_VERSION = 1
+CACHE_TTL_HOURS = 12
+
+# Defaults for check_urls(): total in-flight requests, in-flight requests per
+# host, and the per-request timeout in seconds.
+MAX_CONCURRENCY = 16
+PER_HOST_CONCURRENCY = 2
+REQUEST_TIMEOUT = 5
+
+USER_AGENT = "TCAT-Wiki-LinkChecker/5.1.0 (+https://github.com/TaskarCenterAtUW/tcat-wiki)"
+
+# URLs matching these patterns are reported valid without a request: they
+# block automated clients or always fail. Kept in sync with check-links.ps1.
+SKIP_PATTERNS = (
+    "*visualstudio.com*",
+    "*docs.google.com*",
+    "*maps.app.goo.gl*",
+    "*firebase*",
+    "*osm.workspaces-stage.sidewalks.washington.edu/api*",
+    "*join.slack.com*",
+    "*accessmap.app*",
+)
+
+SKIPPED_STATUS = "Skipped URL listed in SKIP_PATTERNS."
+
+
+def _import_build_site():
+    """Import utilities/build-site.py despite its hyphenated filename."""
+    module_path = SCRIPT_DIR / "build-site.py"
+    spec = importlib.util.spec_from_file_location("build_site", module_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"could not load module spec from {module_path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# =============================================================================
+# URL collection
+# =============================================================================
+
+def is_external_url(target):
+    return target.startswith(("http://", "https://"))
+
+
+def collect_external_urls(docs_dir=DOCS_DIR):
+    """Return {url: sorted docs-relative pages linking to it} for every external link.
+
+    URLs are keyed without their #fragment, so links to different anchors
+    of one page are checked once, and a failure lists every linking page.
+    """
+    build_site = _import_build_site()
+    pages_by_url = {}
+    for md_file in sorted(docs_dir.rglob("*.md")):
+        rel = md_file.relative_to(docs_dir).as_posix()
+        text = md_file.read_text(encoding="utf-8")
+        for target in build_site._iter_markdown_link_targets(text):
+            if is_external_url(target):
+                pages_by_url.setdefault(urldefrag(target).url, set()).add(rel)
+    return {url: sorted(pages) for url, pages in sorted(pages_by_url.items())}
+
+
+def url_host(url):
+    """Return the lowercased host of url, or "unknown" if it has none."""
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        host = None
+    return host or "unknown"
+
+
+def is_skipped(url):
+    return any(fnmatch.fnmatchcase(url, pattern) for pattern in SKIP_PATTERNS)
+
+
+# =============================================================================
+# Checking
+# =============================================================================
+
+def _is_timeout(exc):
+    if isinstance(exc, urllib.error.URLError):
+        exc = exc.reason
+    return isinstance(exc, (socket.timeout, TimeoutError))
+
+
+def _request(url, method, timeout):
+    request = urllib.request.Request(
+        url, method=method, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status
+
+
+def check_url(url, timeout=REQUEST_TIMEOUT):
+    """Check one URL (blocking); return a result dict.
+
+    Keys: "valid" (bool), "status" (HTTP status code, or an error message)
+    and "timeout" (True if the request timed out). HEAD is tried first;
+    any HEAD failure is retried as a GET.
+    """
+    if is_skipped(url):
+        return {"valid": True, "status": SKIPPED_STATUS, "timeout": False}
+    try:
+        try:
+            status = _request(url, "HEAD", timeout)
+        except (urllib.error.URLError, OSError, ValueError):
+            status = _request(url, "GET", timeout)
+    except urllib.error.HTTPError as exc:
+        return {"valid": False, "status": f"HTTP {exc.code}: {exc.reason}",
+                "timeout": False}
+    except (urllib.error.URLError, OSError, ValueError) as exc:
+        reason = exc.reason if isinstance(exc, urllib.error.URLError) else exc
+        return {"valid": False, "status": str(reason) or type(reason).__name__,
+                "timeout": _is_timeout(exc)}
+    return {"valid": status < 400, "status": status, "timeout": False}
+
+
+async def check_urls(urls, max_concurrency=MAX_CONCURRENCY,
+                     per_host=PER_HOST_CONCURRENCY, timeout=REQUEST_TIMEOUT,
+                     checker=check_url):
+    """Check urls concurrently; return {url: result} (see check_url()).
+
+    Each URL is fetched without its #fragment, so urls differing only in
+    their fragment are checked once and share a result. At most
+    max_concurrency requests are in flight at once, and at most per_host of
+    them to any single host. checker(url, timeout) performs one
+    blocking check and runs on a worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    overall = asyncio.Semaphore(max_concurrency)
+    host_limits = {}
+
+    async def check(url):
+        host_limit = host_limits.setdefault(url_host(url), asyncio.Semaphore(per_host))
+        async with host_limit, overall:
+            return url, await loop.run_in_executor(pool, checker, url, timeout)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        unique = dict.fromkeys(urldefrag(url).url for url in urls)
+        checked = dict(await asyncio.gather(*(check(url) for url in unique)))
+    return {url: checked[urldefrag(url).url] for url in urls}
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+def load_cache(cache_path=CACHE_PATH):
+    """Return the cached {url: result} mapping, or {} if absent/unusable.
+
+    Each result also records the "checked_at" epoch time it was fetched at.
+    """
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("urls", {})
+
+
+def save_cache(cache, cache_path=CACHE_PATH):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"version": CACHE_VERSION, "urls": cache}, indent=1, sort_keys=True)
+        + "\n", encoding="utf-8", newline="\n")
+
+
+def is_fresh(entry, ttl_hours=CACHE_TTL_HOURS, now=None):
+    """Return True if a cached result may be reused (younger than the TTL, not a timeout)."""
+    if now is None:
+        now = time.time()
+    return (not entry.get("timeout")
+            and now - entry.get("checked_at", 0) < ttl_hours * 3600)
+
+
+def check_with_cache(urls, cache, ttl_hours=CACHE_TTL_HOURS, use_cache=True, **kwargs):
+    """Check urls, reusing fresh entries in cache and updating it with new results.
+
+    Returns (results, cache_hits): results maps every url to its result
+    dict; cache_hits is the number served from cache. The cache is keyed by
+    URL without its #fragment, as check_urls() fetches it. kwargs are passed
+    to check_urls().
+    """
+    now = time.time()
+    results = {}
+    to_check = []
+    for url in urls:
+        entry = cache.get(urldefrag(url).url)
+        if use_cache and entry is not None and is_fresh(entry, ttl_hours, now):
+            results[url] = entry
+        else:
+            to_check.append(url)
+    cache_hits = len(results)
+
+    if to_check:
+        fresh = asyncio.run(check_urls(to_check, **kwargs))
+        checked_at = time.time()
+        for url, result in fresh.items():
+            cache[urldefrag(url).url] = results[url] = {**result, "checked_at": checked_at}
+    return results, cache_hits
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--docs-dir", type=Path, default=DOCS_DIR,
+        help="Markdown tree to scan (default: docs/ relative to the repo root).",
+    )
+    parser.add_argument(
+        "--cache", type=Path, default=CACHE_PATH,
+        help="Result cache file (default: .build-cache/external-links.json).",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Recheck every URL, ignoring cached results.",
+    )
+    parser.add_argument(
+        "--ttl-hours", type=float, default=CACHE_TTL_HOURS,
+        help=f"Reuse cached results younger than this (default: {CACHE_TTL_HOURS}).",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=MAX_CONCURRENCY,
+        help=f"Maximum requests in flight (default: {MAX_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--per-host", type=int, default=PER_HOST_CONCURRENCY,
+        help=f"Maximum requests in flight to one host (default: {PER_HOST_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=REQUEST_TIMEOUT,
+        help=f"Per-request timeout in seconds (default: {REQUEST_TIMEOUT}).",
+    )
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1 or args.per_host < 1:
+        print("error: --concurrency and --per-host must be at least 1", file=sys.stderr)
+        return 1
+    if not args.docs_dir.is_dir():
+        print(f"error: docs directory not found: {args.docs_dir}", file=sys.stderr)
+        return 1
+
+    pages_by_url = collect_external_urls(args.docs_dir)
+    print(f"Checking {len(pages_by_url)} unique external URLs...")
+
+    cache = load_cache(args.cache)
+    results, cache_hits = check_with_cache(
+        pages_by_url, cache, ttl_hours=args.ttl_hours, use_cache=not args.no_cache,
+        max_concurrency=args.concurrency, per_host=args.per_host,
+        timeout=args.timeout)
+    save_cache(cache, args.cache)
+    if cache_hits:
+        print(f"  Used {cache_hits} cached results (valid within {args.ttl_hours:g}h TTL)")
+
+    broken = {url: result for url, result in results.items() if not result["valid"]}
+    if not broken:
+        print("All external links OK.")
+        return 0
+
+    print(f"error: {len(broken)} broken external link(s):", file=sys.stderr)
+    for url, result in broken.items():
+        print(f"  {url} ({result['status']})", file=sys.stderr)
+        for page in pages_by_url[url]:
+            print(f"    linked from {page}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,20 +5,45 @@ and section generators:
 
   - Path helpers (repo root, event directories)
   - Frontmatter parsing and validation
-  - HTTP / JSON fetching
-  - Haversine distance and way-length computation
+  - HTTP / JSON fetching, and streaming a large JSON array item by item
+  - A pooled keep-alive HTTP client and a concurrent, retrying JSON fetcher
+  - Racing one request across interchangeable mirrors (``race_requests()``)
+  - An on-disk HTTP response cache for the public APIs (see ``configure_cache()``)
+  - Haversine distance and way-length computation (batched with NumPy
+    when it is installed)
   - Template placeholder filling and cleanup
 """
 
+import codecs
+import contextlib
+import functools
+import gzip
+import hashlib
+import http.client
 import json
 import math
 import os
+import random
 import re
+import socket
 import ssl
 import sys
+import tempfile
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # optional: way_lengths_m() then measures way by way
+    np = None
+
+# The frontmatter parser is shared with the other utilities/ scripts.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from frontmatter import load as load_frontmatter, parse as parse_frontmatter  # noqa: E402
 
 
 # =============================================================================
@@ -54,58 +79,18 @@ def utilities_dir():
 # Frontmatter parsing
 # =============================================================================
 
-def parse_frontmatter(text):
-    """Parse YAML frontmatter from a Markdown file into a flat dict.
-
-    Handles simple ``key: value`` pairs and quoted strings.
-    Skips blank lines, comments (``#``), and list items (``- value``).
-    """
-    match = re.match(r"^---\s*\n(.*?)\n---", text, re.DOTALL)
-    if not match:
-        return {}
-    props = {}
-    for line in match.group(1).split("\n"):
-        line = line.strip()
-        if not line or line.startswith("#") or line.startswith("-"):
-            continue
-        if ":" not in line:
-            continue
-        key, _, value = line.partition(":")
-        key = key.strip()
-        value = value.strip()
-        # Strip inline comments while respecting quoted strings
-        if "#" in value:
-            q = value[0] if value and value[0] in ('"', "'") else None
-            if q:
-                # Find closing quote, then strip any trailing comment
-                close = value.find(q, 1)
-                if close != -1:
-                    value = value[:close + 1] + value[close + 1:].split("#")[0]
-                    value = value.strip()
-            else:
-                value = value[:value.index("#")].strip()
-        # Strip surrounding quotes
-        if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
-            value = value[1:-1]
-        props[key] = value
-    return props
-
-
 def read_event_frontmatter(event_slug):
     """Read frontmatter from ``docs/events/<slug>/index.md``.
 
-    Returns the frontmatter dict.  Exits with an error if the file
-    does not exist.
+    Returns the flat frontmatter dict (see ``frontmatter.parse()``).  Exits
+    with an error if the file does not exist.
     """
     index_path = os.path.join(event_dir(event_slug), "index.md")
     if not os.path.isfile(index_path):
         print(f"✗ Event index not found: {index_path}", file=sys.stderr)
         sys.exit(1)
 
-    with open(index_path, encoding="utf-8") as f:
-        text = f.read()
-
-    return parse_frontmatter(text)
+    return load_frontmatter(index_path)
 
 
 def validate_required_fields(fm, required, context=""):
@@ -131,6 +116,7 @@ _USER_AGENT = (
     "TCAT-Wiki-EventReport/2.0 "
     "(https://github.com/TaskarCenterAtUW/tcat-wiki)"
 )
+_ACCEPT = "application/json, application/geo+json, */*"
 _TIMEOUT = 360  # seconds
 
 
@@ -138,44 +124,724 @@ def make_request(url, data=None, headers=None):
     """Build a ``urllib.request.Request`` with a proper User-Agent."""
     req = urllib.request.Request(url, data=data)
     req.add_header("User-Agent", _USER_AGENT)
-    req.add_header("Accept", "application/json, application/geo+json, */*")
+    req.add_header("Accept", _ACCEPT)
     if headers:
         for key, value in headers.items():
             req.add_header(key, value)
     return req
 
 
-def fetch_json(url, data=None, headers=None):
-    """Fetch JSON from *url*, optionally POSTing *data* (bytes)."""
+@functools.lru_cache(maxsize=None)
+def ssl_context():
+    """Return the SSL context shared by every request (built once)."""
+    return ssl.create_default_context()
+
+
+def _urlopen(url, data=None, headers=None):
     req = make_request(url, data=data, headers=headers)
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, timeout=_TIMEOUT, context=ctx) as resp:
+    return urllib.request.urlopen(req, timeout=_TIMEOUT, context=ssl_context())
+
+
+def open_url(url, data=None, headers=None):
+    """Open *url* (POSTing *data*, if given) and return the response.
+
+    The response is a file-like object to read the body from, e.g. with
+    ``iter_json_array()``; use it as a context manager to close it.  For a
+    cacheable URL (see ``cache_endpoint()``) it may be a cached body
+    instead, and a live response is written to the cache as it is read.
+    """
+    cached = open_cached(url, data)
+    if cached is not None:
+        return cached
+    resp = _urlopen(url, data=data, headers=headers)
+    if _storing(url, stream=True):
+        return _CachingResponse(resp, url, data)
+    return resp
+
+
+def fetch_json(url, data=None, headers=None):
+    """Fetch JSON from *url*, optionally POSTing *data* (bytes).
+
+    Served from, and stored in, the response cache when *url* is cacheable.
+    """
+    cached = cache_lookup(url, data)
+    if cached is not None:
+        return json.loads(cached[0].decode("utf-8"))
+    with _urlopen(url, data=data, headers=headers) as resp:
         body = resp.read()
-        if not body:
-            raise RuntimeError(
-                f"Empty response from {url} "
-                f"(status {resp.status}, "
-                f"content-type: {resp.headers.get('Content-Type')})"
-            )
-        try:
-            return json.loads(body.decode("utf-8"))
-        except json.JSONDecodeError:
-            preview = body[:500].decode("utf-8", errors="replace")
-            raise RuntimeError(
-                f"Non-JSON response from {url} "
-                f"(status {resp.status}, "
-                f"content-type: {resp.headers.get('Content-Type')})\n"
-                f"Body preview: {preview}"
-            )
+        content_type = resp.headers.get("Content-Type", "")
+        result = _decode_json_body(url, resp.status, content_type, body)
+    if overpass_error(result) is None:
+        cache_store(url, data, body, content_type)
+    return result
+
+
+def _decode_json_body(url, status, content_type, body):
+    if not body:
+        raise RuntimeError(
+            f"Empty response from {url} "
+            f"(status {status}, "
+            f"content-type: {content_type})"
+        )
+    try:
+        return json.loads(body.decode("utf-8"))
+    except json.JSONDecodeError:
+        preview = body[:500].decode("utf-8", errors="replace")
+        raise RuntimeError(
+            f"Non-JSON response from {url} "
+            f"(status {status}, "
+            f"content-type: {content_type})\n"
+            f"Body preview: {preview}"
+        )
 
 
 def fetch_bytes(url, headers=None):
     """Fetch raw bytes from *url*.  Returns ``(body_bytes, content_type)``."""
-    req = make_request(url, headers=headers)
-    ctx = ssl.create_default_context()
-    with urllib.request.urlopen(req, timeout=_TIMEOUT, context=ctx) as resp:
+    cached = cache_lookup(url)
+    if cached is not None:
+        return cached
+    with _urlopen(url, headers=headers) as resp:
         body = resp.read()
-        return body, resp.headers.get("Content-Type", "")
+        content_type = resp.headers.get("Content-Type", "")
+    cache_store(url, None, body, content_type)
+    return body, content_type
+
+
+# =============================================================================
+# Pooled HTTP client
+# =============================================================================
+
+POOL_MAX_IDLE = 8  # idle keep-alive connections kept per host
+
+# Responses worth retrying (rate limiting and transient server errors), how
+# many attempts a request gets, and the backoff between them: RETRY_BACKOFF
+# seconds, doubled per attempt (with jitter), capped at RETRY_MAX_DELAY.
+# A Retry-After header (in seconds) is honored instead when present.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_ATTEMPTS = 5
+RETRY_BACKOFF = 1.0
+RETRY_MAX_DELAY = 60.0
+
+_pool = {}  # (scheme, host[:port]) -> idle connections
+_pool_lock = threading.Lock()
+
+
+def _get_connection(scheme, netloc):
+    """Return ``(connection, reused)``: an idle pooled one, or a new one."""
+    with _pool_lock:
+        idle = _pool.get((scheme, netloc))
+        if idle:
+            return idle.pop(), True
+    if scheme == "https":
+        conn = http.client.HTTPSConnection(netloc, timeout=_TIMEOUT,
+                                           context=ssl_context())
+    else:
+        conn = http.client.HTTPConnection(netloc, timeout=_TIMEOUT)
+    return conn, False
+
+
+def _release_connection(scheme, netloc, conn):
+    with _pool_lock:
+        idle = _pool.setdefault((scheme, netloc), [])
+        if len(idle) < POOL_MAX_IDLE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def close_connections():
+    """Close every idle pooled connection."""
+    with _pool_lock:
+        conns = [conn for idle in _pool.values() for conn in idle]
+        _pool.clear()
+    for conn in conns:
+        conn.close()
+
+
+def http_request(url, data=None, headers=None):
+    """Make one request over a pooled keep-alive connection.
+
+    POSTs *data* if given, otherwise GETs.  Returns ``(status, headers,
+    body_bytes)`` for any status; only network errors raise.  Connections
+    (and the SSL context) are reused across calls and threads, so repeated
+    requests to one host skip the TCP and TLS handshakes.  A request that
+    fails on a reused connection (one the server has since closed) is
+    retried once on a new one.
+    """
+    parts = urllib.parse.urlsplit(url)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    req_headers = {"User-Agent": _USER_AGENT, "Accept": _ACCEPT}
+    if data is not None:
+        req_headers["Content-Type"] = "application/x-www-form-urlencoded"
+    req_headers.update(headers or {})
+    method = "GET" if data is None else "POST"
+
+    while True:
+        conn, reused = _get_connection(parts.scheme, parts.netloc)
+        try:
+            conn.request(method, path, body=data, headers=req_headers)
+            resp = conn.getresponse()
+            body = resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if reused:
+                continue
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            _release_connection(parts.scheme, parts.netloc, conn)
+        return resp.status, resp.headers, body
+
+
+def _retry_delay(attempt, retry_after=None):
+    """Seconds to wait before retry number *attempt* (0-based)."""
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # an HTTP-date; fall back to backoff
+    delay = min(RETRY_MAX_DELAY, RETRY_BACKOFF * 2 ** attempt)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def fetch_json_retrying(url, headers=None, attempts=RETRY_ATTEMPTS):
+    """GET JSON from *url* over the pooled client, retrying transient failures.
+
+    Network errors and ``RETRY_STATUSES`` responses are retried up to
+    *attempts* times in all, with exponential backoff (or the server's
+    Retry-After).  Uses the response cache like ``fetch_json()``.  Raises
+    ``RuntimeError`` once attempts run out or on any other non-200 status.
+    """
+    cached = cache_lookup(url)
+    if cached is not None:
+        return json.loads(cached[0].decode("utf-8"))
+    for attempt in range(attempts):
+        last = attempt == attempts - 1
+        try:
+            status, resp_headers, body = http_request(url, headers=headers)
+        except (http.client.HTTPException, OSError) as exc:
+            if last:
+                raise RuntimeError(f"Request to {url} failed: {exc}") from exc
+            time.sleep(_retry_delay(attempt))
+            continue
+        if status in RETRY_STATUSES and not last:
+            time.sleep(_retry_delay(attempt, resp_headers.get("Retry-After")))
+            continue
+        content_type = resp_headers.get("Content-Type", "")
+        if status != 200:
+            raise RuntimeError(
+                f"HTTP {status} from {url} (content-type: {content_type})")
+        result = _decode_json_body(url, status, content_type, body)
+        cache_store(url, None, body, content_type)
+        return result
+
+
+def fetch_json_many(urls, max_workers=4, headers=None):
+    """GET JSON from every URL in *urls*; return the results in the same order.
+
+    At most *max_workers* requests are in flight at once, each through
+    ``fetch_json_retrying()`` over the pooled client.  The first failure is
+    raised once the requests already in flight have finished.
+    """
+    urls = list(urls)
+    if max_workers <= 1 or len(urls) <= 1:
+        return [fetch_json_retrying(url, headers) for url in urls]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda url: fetch_json_retrying(url, headers), urls))
+
+
+# =============================================================================
+# Mirror racing
+# =============================================================================
+
+_RACE_JOIN_TIMEOUT = 2.0  # seconds to let cancelled attempts report back
+
+
+def _new_connection(url):
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme == "https":
+        conn = http.client.HTTPSConnection(parts.netloc, timeout=_TIMEOUT,
+                                           context=ssl_context())
+    else:
+        conn = http.client.HTTPConnection(parts.netloc, timeout=_TIMEOUT)
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    return conn, path
+
+
+def _abort_connection(conn):
+    """Close *conn* from another thread, interrupting a blocked send or read."""
+    sock = conn.sock
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    conn.close()
+
+
+def race_requests(urls, data=None, headers=None, max_parallel=None, stagger=0.0,
+                  stream=False, on_outcome=None):
+    """Send one request to interchangeable servers at once; return the first good answer.
+
+    Attempts start in *urls* order, at most *max_parallel* (default: all)
+    in flight, each *stagger* seconds after the previous one, or at once
+    whenever nothing else is in flight (e.g. every earlier attempt failed).
+    The first 200 response whose body is valid JSON (with *stream*, just
+    the first 200 response) wins, and every other attempt still running is
+    cancelled by closing its socket.  An attempt still connecting cannot be
+    interrupted, but it checks for cancellation once connected and gives up
+    without sending its request.
+
+    Returns ``(url, result)``: the parsed JSON or, with *stream*, the
+    winner's open response (see ``open_url()``).  Cacheable responses are
+    served from and stored in the cache, keyed by the first URL; a cache
+    hit returns ``(None, result)``.  Raises ``RuntimeError`` listing each
+    URL's error if every attempt fails.
+
+    *on_outcome*, if given, is called as ``on_outcome(url, outcome,
+    seconds)`` for every attempt started: outcome is "ok" (including a
+    finished runner-up), "error" or "cancelled".  It is called from the
+    attempt's thread, and cancelled attempts that have not finished within
+    ``_RACE_JOIN_TIMEOUT`` of the race ending (e.g. still connecting) report
+    after this function has returned.
+    """
+    urls = list(urls)
+    if stream:
+        cached = open_cached(urls[0], data)
+    else:
+        cached = cache_lookup(urls[0], data)
+        cached = None if cached is None else json.loads(cached[0].decode("utf-8"))
+    if cached is not None:
+        return None, cached
+
+    max_parallel = max_parallel or len(urls)
+    method = "GET" if data is None else "POST"
+    req_headers = {"User-Agent": _USER_AGENT, "Accept": _ACCEPT}
+    if data is not None:
+        req_headers["Content-Type"] = "application/x-www-form-urlencoded"
+    req_headers.update(headers or {})
+    cond = threading.Condition()
+    race = {"winner": None, "active": 0, "conns": {}, "aborted": set(), "errors": {}}
+
+    def attempt(url):
+        start = time.monotonic()
+        conn, path = _new_connection(url)
+        with cond:
+            if race["winner"] is not None:
+                race["active"] -= 1
+                cond.notify_all()
+                return
+            race["conns"][url] = conn
+        outcome, result = "error", None
+        try:
+            # Connect first, so a cancellation can close a live socket, and
+            # do not send the request once the race is over.
+            conn.connect()
+            with cond:
+                if race["winner"] is not None:
+                    race["aborted"].add(url)
+                if url in race["aborted"]:
+                    raise RuntimeError("cancelled before sending")
+            conn.request(method, path, body=data, headers=req_headers)
+            resp = conn.getresponse()
+            content_type = resp.headers.get("Content-Type", "")
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status}")
+            if stream:
+                result = resp
+            else:
+                body = resp.read()
+                result = (_decode_json_body(url, resp.status, content_type, body),
+                          body, content_type)
+            outcome = "ok"
+        except Exception as exc:
+            with cond:
+                if url in race["aborted"]:
+                    outcome = "cancelled"
+                race["errors"][url] = exc
+        with cond:
+            race["active"] -= 1
+            won = outcome == "ok" and race["winner"] is None
+            if won:
+                race["winner"] = (url, result)
+            cond.notify_all()
+        if not won:
+            conn.close()
+        if on_outcome is not None:
+            on_outcome(url, outcome, time.monotonic() - start)
+
+    threads = []
+    next_index, last_start = 0, 0.0
+    with cond:
+        while race["winner"] is None and (next_index < len(urls) or race["active"]):
+            now = time.monotonic()
+            can_start = next_index < len(urls) and race["active"] < max_parallel
+            if can_start and (not race["active"] or now - last_start >= stagger):
+                race["active"] += 1
+                threads.append(threading.Thread(target=attempt, args=(urls[next_index],),
+                                                daemon=True))
+                threads[-1].start()
+                next_index, last_start = next_index + 1, now
+                continue
+            cond.wait(last_start + stagger - now if can_start else None)
+        winner = race["winner"]
+        losers = {url: conn for url, conn in race["conns"].items()
+                  if winner is None or url != winner[0]}
+        race["aborted"].update(losers)
+    for conn in losers.values():
+        _abort_connection(conn)
+    deadline = time.monotonic() + _RACE_JOIN_TIMEOUT
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    if winner is None:
+        details = "; ".join(f"{url}: {exc}" for url, exc in race["errors"].items())
+        raise RuntimeError(f"All {len(urls)} servers failed: {details}")
+    url, result = winner
+    if stream:
+        if _storing(url, stream=True):
+            return url, _CachingResponse(result, urls[0], data)
+        return url, result
+    parsed, body, content_type = result
+    if overpass_error(parsed) is None:
+        cache_store(urls[0], data, body, content_type)
+    return url, parsed
+
+
+# =============================================================================
+# HTTP response cache
+# =============================================================================
+
+# Responses from these public endpoints are cached, each for its own TTL in
+# seconds; any other URL (e.g. the authenticated Workspaces API) never is.
+# Overpass results for a past window only change as features are re-edited,
+# closed changesets are immutable, and the task grid changes during an event.
+# The Overpass TTL assumes the query window has ended: callers querying a
+# window that is still open wrap the query in cache_read_only().  Overpass
+# results whose remark reports a runtime error (see overpass_error()) are
+# partial and never cached.  A changeset batch only gets the changeset TTL
+# if every changeset in it is closed; one holding an open changeset, whose
+# tags and comment can still change, is kept for OPEN_CHANGESETS_TTL.
+CACHE_ENDPOINTS = (
+    ("overpass", re.compile(r"/api/interpreter/?$"), 24 * 3600),
+    ("osm_changesets",
+     re.compile(r"^https://api\.openstreetmap\.org/api/0\.6/changesets"), 30 * 86400),
+    ("tm_aoi", re.compile(r"/api/v2/projects/\d+/queries/aoi/"), 7 * 86400),
+    ("tm_tasks", re.compile(r"/api/v2/projects/\d+/tasks/"), 3600),
+)
+OPEN_CHANGESETS_TTL = 15 * 60
+
+# Endpoint classes whose servers are interchangeable mirrors: their
+# responses are keyed by request body alone, so any mirror's answer serves.
+_MIRRORED_ENDPOINTS = {"overpass"}
+
+_cache = {
+    "dir": os.path.join(repo_root(), ".build-cache", "event-reports-http"),
+    "enabled": True,
+    "offline": False,
+    "store": True,  # False inside cache_read_only()
+}
+
+# An Overpass "remark" reporting that the query was cut short, e.g.
+# "runtime error: Query timed out in \"query\" at line 3 after 301 seconds."
+_OVERPASS_ERROR_REMARK_RE = re.compile(r"\berror\b", re.IGNORECASE)
+
+
+class CacheMissError(RuntimeError):
+    """Raised in offline mode when a response is not in the cache."""
+
+
+def configure_cache(cache_dir=None, enabled=True, offline=False):
+    """Set where responses are cached and whether the network may be used.
+
+    *enabled* false bypasses the cache entirely (nothing is read or
+    stored).  *offline* serves every request from the cache, however old,
+    and raises ``CacheMissError`` for anything not in it.
+    """
+    if cache_dir:
+        _cache["dir"] = os.path.abspath(cache_dir)
+    _cache["enabled"] = enabled
+    _cache["offline"] = offline
+
+
+@contextlib.contextmanager
+def cache_read_only():
+    """Serve cached responses inside the block, but store no new ones.
+
+    For answers that are still changing, such as an Overpass query over a
+    window that has not ended yet.
+    """
+    previous = _cache["store"]
+    _cache["store"] = False
+    try:
+        yield
+    finally:
+        _cache["store"] = previous
+
+
+def overpass_error(result):
+    """Return the runtime error an Overpass result's remark reports, or ``None``.
+
+    Overpass answers a query that hit its time or memory limit with a 200
+    and whatever elements it had gathered, plus a remark saying so.
+    *result* is the parsed result, or the header dict ``iter_json_array()``
+    filled.  Anything other than a dict has no remark.
+    """
+    remark = result.get("remark") if isinstance(result, dict) else None
+    if isinstance(remark, str) and _OVERPASS_ERROR_REMARK_RE.search(remark):
+        return remark
+    return None
+
+
+def add_cache_arguments(ap):
+    """Add the ``--cache-dir``, ``--no-cache`` and ``--offline`` flags to *ap*."""
+    ap.add_argument("--cache-dir",
+                    help="HTTP response cache directory "
+                         "(default: .build-cache/event-reports-http/)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Neither read nor write the HTTP response cache")
+    ap.add_argument("--offline", action="store_true",
+                    help="Only use cached HTTP responses; never hit the network")
+
+
+def configure_cache_from_args(ap, args):
+    """Apply the flags ``add_cache_arguments()`` added to *ap*."""
+    if args.no_cache and args.offline:
+        ap.error("--no-cache and --offline cannot be combined")
+    configure_cache(args.cache_dir, enabled=not args.no_cache, offline=args.offline)
+
+
+def _storing(url, stream=False):
+    """Return whether a response from *url* is to be cached.
+
+    Streams from endpoints whose TTL depends on the body (see
+    ``_BODY_TTLS``) are not: their entry header is written first.
+    """
+    endpoint = cache_endpoint(url)
+    return (_cache["enabled"] and _cache["store"] and endpoint is not None
+            and not (stream and endpoint[0] in _BODY_TTLS))
+
+
+def _changesets_ttl(body, ttl):
+    """Return *ttl* if every changeset in an OSM changesets body is closed.
+
+    Otherwise (or if the body is not a changesets list) the batch is still
+    changing, and ``OPEN_CHANGESETS_TTL`` is returned.
+    """
+    try:
+        changesets = json.loads(body.decode("utf-8"))["changesets"]
+        closed = all(changeset["open"] is False for changeset in changesets)
+    except (ValueError, KeyError, TypeError):
+        closed = False
+    return ttl if closed else min(ttl, OPEN_CHANGESETS_TTL)
+
+
+# Endpoint classes whose TTL depends on the response, mapped to a function
+# of (body bytes, endpoint TTL) returning the TTL to store it with.
+_BODY_TTLS = {"osm_changesets": _changesets_ttl}
+
+
+def cache_endpoint(url):
+    """Return ``(endpoint class, TTL seconds)`` for a cacheable *url*, else ``None``."""
+    for name, pattern, ttl in CACHE_ENDPOINTS:
+        if pattern.search(url.split("?", 1)[0]):
+            return name, ttl
+    return None
+
+
+def cache_key(url, data=None):
+    """Return the cache key (a SHA-256 hex digest) for a request.
+
+    It covers the endpoint class, the URL (except for mirrored endpoints)
+    and the request body.
+    """
+    endpoint = cache_endpoint(url)
+    name = endpoint[0] if endpoint else ""
+    h = hashlib.sha256()
+    h.update(name.encode("utf-8") + b"\n")
+    h.update((name if name in _MIRRORED_ENDPOINTS else url).encode("utf-8") + b"\n")
+    h.update(data or b"")
+    return h.hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(_cache["dir"], key[:2], key + ".gz")
+
+
+def _open_entry(url, data):
+    """Open the usable cache entry for a request, positioned at its body.
+
+    Returns ``(gzip file, metadata)`` or ``None``.  Raises
+    ``CacheMissError`` in offline mode instead of returning ``None``.
+    """
+    if not _cache["enabled"]:
+        return None
+    endpoint = cache_endpoint(url)
+    path = _cache_path(cache_key(url, data))
+    f = None
+    if endpoint is not None:
+        try:
+            f = gzip.open(path, "rb")
+            meta = json.loads(f.readline())
+        except (OSError, ValueError, EOFError):
+            if f is not None:
+                f.close()
+            f = None
+    if f is not None and (_cache["offline"] or time.time() - meta["stored"]
+                          < min(meta.get("ttl", endpoint[1]), endpoint[1])):
+        return f, meta
+    if f is not None:
+        f.close()
+    if _cache["offline"]:
+        raise CacheMissError(f"Offline, and no cached response for {url}")
+    return None
+
+
+def cache_lookup(url, data=None):
+    """Return ``(body_bytes, content_type)`` from the cache, or ``None``.
+
+    ``None`` means the caller should fetch (and then ``cache_store()``):
+    the cache is disabled, *url* is not cacheable, or there is no entry
+    younger than its endpoint's TTL.  Offline, raises ``CacheMissError``.
+    """
+    entry = _open_entry(url, data)
+    if entry is None:
+        return None
+    f, meta = entry
+    with f:
+        try:
+            return f.read(), meta.get("content_type", "")
+        except (OSError, EOFError):
+            if _cache["offline"]:
+                raise CacheMissError(f"Corrupt cached response for {url}")
+            return None
+
+
+def is_cached(url, data=None):
+    """Return whether ``cache_lookup()`` would serve a request, without reading it.
+
+    Offline, raises ``CacheMissError`` rather than returning ``False``.
+    """
+    entry = _open_entry(url, data)
+    if entry is None:
+        return False
+    entry[0].close()
+    return True
+
+
+def open_cached(url, data=None):
+    """Return a readable stream of the cached body for a request, or ``None``.
+
+    Like ``cache_lookup()``, but the body is decompressed as it is read.
+    """
+    entry = _open_entry(url, data)
+    return entry[0] if entry is not None else None
+
+
+def _entry_header(url, content_type, ttl=None):
+    meta = {"url": url, "content_type": content_type, "stored": time.time()}
+    if ttl is not None:
+        meta["ttl"] = ttl  # shorter than the endpoint's; see _BODY_TTLS
+    return json.dumps(meta).encode("utf-8") + b"\n"
+
+
+def _new_entry_file():
+    os.makedirs(_cache["dir"], exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=_cache["dir"])
+    return os.fdopen(fd, "wb"), tmp_path
+
+
+def _commit_entry(tmp_path, url, data):
+    path = _cache_path(cache_key(url, data))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+
+
+def cache_store(url, data, body, content_type=""):
+    """Store a response body in the cache if *url* is cacheable.
+
+    Entries are gzip-compressed and replaced atomically.  Nothing is
+    stored inside ``cache_read_only()``.
+    """
+    if not _storing(url):
+        return
+    name, endpoint_ttl = cache_endpoint(url)
+    ttl = None
+    if name in _BODY_TTLS:
+        ttl = _BODY_TTLS[name](body, endpoint_ttl)
+        if ttl == endpoint_ttl:
+            ttl = None
+    raw, tmp_path = _new_entry_file()
+    try:
+        with raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            f.write(_entry_header(url, content_type, ttl))
+            f.write(body)
+        _commit_entry(tmp_path, url, data)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class _CachingResponse:
+    """A live response that writes its body to the cache as it is read.
+
+    The entry is only committed if the body was read to the end before the
+    response is closed, so an interrupted or abandoned stream is not cached;
+    ``discard()`` keeps out a body found to be unusable once read.
+    """
+
+    def __init__(self, resp, url, data):
+        self._resp = resp
+        self._url, self._data = url, data
+        self._raw, self._tmp_path = _new_entry_file()
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        self._gzip.write(_entry_header(url, resp.headers.get("Content-Type", "")))
+        self._complete = self._discarded = False
+
+    def read(self, size=-1):
+        chunk = self._resp.read(size)
+        if chunk:
+            self._gzip.write(chunk)
+        if (not chunk or size is None or size < 0) and not self._discarded:
+            self._complete = True
+        return chunk
+
+    def discard(self):
+        """Do not cache this response, however much of it is read."""
+        self._complete = False
+        self._discarded = True
+
+    def close(self):
+        if self._raw.closed:
+            return
+        self._resp.close()
+        self._gzip.close()
+        self._raw.close()
+        if self._complete:
+            _commit_entry(self._tmp_path, self._url, self._data)
+        else:
+            os.remove(self._tmp_path)
+
+    def __getattr__(self, name):
+        return getattr(self._resp, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def discard_cached_response(resp):
+    """Keep a response from ``open_url()`` (or ``race_requests()``) out of the cache.
+
+    For a streamed body found unusable once read, such as an Overpass
+    result with an ``overpass_error()``; a no-op for any other stream.
+    """
+    if isinstance(resp, _CachingResponse):
+        resp.discard()
 
 
 # =============================================================================
@@ -183,11 +849,12 @@ def fetch_bytes(url, headers=None):
 # =============================================================================
 
 METERS_PER_MILE = 1_609.344
+EARTH_RADIUS_M = 6_371_000  # Earth mean radius
 
 
 def haversine(lat1, lon1, lat2, lon2):
     """Great-circle distance in **meters** between two points."""
-    R = 6_371_000  # Earth mean radius (m)
+    R = EARTH_RADIUS_M
     p1, p2 = math.radians(lat1), math.radians(lat2)
     dp = math.radians(lat2 - lat1)
     dl = math.radians(lon2 - lon1)
@@ -203,18 +870,69 @@ def way_length_m(coords):
       - Overpass JSON geometry: ``[{"lat": ..., "lon": ...}, ...]``
       - Simple tuples: ``[(lat, lon), ...]``
     """
+    if coords and isinstance(coords[0], dict):
+        coords = [(point["lat"], point["lon"]) for point in coords]
     total = 0.0
-    for i in range(len(coords) - 1):
-        if isinstance(coords[i], dict):
-            lat1, lon1 = coords[i]["lat"], coords[i]["lon"]
-            lat2, lon2 = coords[i + 1]["lat"], coords[i + 1]["lon"]
-        else:
-            lat1, lon1 = coords[i]
-            lat2, lon2 = coords[i + 1]
+    for (lat1, lon1), (lat2, lon2) in zip(coords, coords[1:]):
         total += haversine(lat1, lon1, lat2, lon2)
     return total
 
 
+def flatten_ways(geometries):
+    """Pack many ways' coordinates into flat arrays for ``way_lengths_m()``.
+
+    *geometries* is a list of coordinate lists, each in either form
+    ``way_length_m()`` accepts.  Returns ``(lats, lons, offsets)``: way *i*'s
+    points are ``lats[offsets[i]:offsets[i + 1]]`` (and likewise *lons*), so
+    *offsets* has one more entry than there are ways.
+    """
+    lats, lons, offsets = [], [], [0]
+    for coords in geometries:
+        if coords and isinstance(coords[0], dict):
+            lats.extend([point["lat"] for point in coords])
+            lons.extend([point["lon"] for point in coords])
+        else:
+            lats.extend([point[0] for point in coords])
+            lons.extend([point[1] for point in coords])
+        offsets.append(len(lats))
+    return lats, lons, offsets
+
+
+def way_lengths_m(lats, lons, offsets):
+    """Length in meters of every way in a ``flatten_ways()`` result, as a list.
+
+    With NumPy installed, every segment of every way is measured in one
+    vectorized haversine pass and summed per way; otherwise each way goes
+    through the scalar ``haversine()``.  Both agree to floating-point
+    tolerance.  A way with fewer than two points has length 0.
+    """
+    if np is None:
+        return [
+            way_length_m(list(zip(lats[start:end], lons[start:end])))
+            for start, end in zip(offsets, offsets[1:])
+        ]
+    if len(lats) < 2:
+        return [0.0] * (len(offsets) - 1)
+
+    # Differences are taken in degrees, then converted, as haversine() does.
+    lat = np.asarray(lats, dtype=np.float64)
+    lon = np.asarray(lons, dtype=np.float64)
+    cos_lat = np.cos(np.radians(lat))
+    a = (np.sin(np.radians(np.diff(lat)) / 2) ** 2
+         + cos_lat[:-1] * cos_lat[1:] * np.sin(np.radians(np.diff(lon)) / 2) ** 2)
+    segments = EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    # Segment k joins points k and k + 1; it belongs to the way that owns
+    # point k, unless point k is that way's last point (a way boundary).
+    bounds = np.asarray(offsets, dtype=np.int64)
+    owner = np.repeat(np.arange(len(bounds) - 1), np.diff(bounds))[:-1]
+    inside = np.ones(len(segments), dtype=bool)
+    last_points = bounds[1:-1] - 1
+    inside[last_points[(last_points >= 0) & (last_points < len(segments))]] = False
+    return np.bincount(owner[inside], weights=segments[inside],
+                       minlength=len(bounds) - 1).tolist()
+
+
 # =============================================================================
 # Template helpers
 # =============================================================================
@@ -290,6 +1008,113 @@ def read_json(path):
         return json.load(f)
 
 
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_DELIMITERS = _JSON_WHITESPACE + ",:]}"
+STREAM_CHUNK_SIZE = 1 << 16  # bytes read from the stream at a time
+
+
+def iter_json_array(stream, key, header=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield the items of a JSON object's top-level *key* array, one at a time.
+
+    *stream* is a binary (UTF-8) or text file-like object, such as an
+    ``open_url()`` response or a file opened with ``open(path, "rb")``,
+    holding one JSON object, e.g. an Overpass result and its ``elements``.
+    It is read *chunk_size* at a time, so memory use is bounded by the
+    largest single item rather than the whole document.  The object's other
+    members are stored in *header* (if given) as they are read; members
+    after the array, such as Overpass's ``remark``, are only there once
+    the items are exhausted.
+
+    Once the object closes, the stream is read to its end, so that a
+    response being cached as it is read (see ``open_url()``) is complete.
+
+    Raises ``ValueError`` (a ``json.JSONDecodeError`` for bad JSON) if the
+    stream does not hold exactly one JSON object.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    state = {"buf": "", "pos": 0, "eof": False}
+
+    def fill():
+        if state["eof"]:
+            return False
+        chunk = stream.read(chunk_size)
+        state["eof"] = not chunk
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk, final=not chunk)
+        state["buf"] = state["buf"][state["pos"]:] + chunk
+        state["pos"] = 0
+        return True
+
+    def peek():
+        while True:
+            buf, pos = state["buf"], state["pos"]
+            while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+                pos += 1
+            state["pos"] = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ""
+
+    def expect(chars):
+        char = peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Expected one of {chars!r}", state["buf"], state["pos"])
+        state["pos"] += 1
+        return char
+
+    def value():
+        # A complete value is always followed by whitespace or a delimiter;
+        # anything else (e.g. a number cut short by a chunk boundary) is
+        # retried with more input, unless the stream has ended.
+        while True:
+            peek()
+            buf = state["buf"]
+            try:
+                obj, end = _JSON_DECODER.raw_decode(buf, state["pos"])
+                if state["eof"] or (end < len(buf) and buf[end] in _JSON_DELIMITERS):
+                    state["pos"] = end
+                    return obj
+            except json.JSONDecodeError:
+                if state["eof"]:
+                    raise
+            fill()
+
+    def finish():
+        # Read past the closing "}" to the end of the stream.
+        if peek():
+            raise json.JSONDecodeError("Extra data", state["buf"], state["pos"])
+
+    expect("{")
+    if peek() == "}":
+        state["pos"] += 1
+        finish()
+        return
+    while True:
+        name = value()
+        if not isinstance(name, str):
+            raise json.JSONDecodeError("Expected a member name", state["buf"], state["pos"])
+        expect(":")
+        if name == key:
+            expect("[")
+            if peek() == "]":
+                state["pos"] += 1
+            else:
+                while True:
+                    yield value()
+                    if expect(",]") == "]":
+                        break
+        else:
+            member = value()
+            if header is not None:
+                header[name] = member
+        if expect(",}") == "}":
+            finish()
+            return
+
+
 # =============================================================================
 # Printing helpers
 # =============================================================================
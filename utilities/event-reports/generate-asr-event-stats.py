@@ -30,11 +30,12 @@ from common import (
     event_dir,
     fetch_bytes,
     fetch_json,
+    flatten_ways,
     haversine,
     print_separator,
     read_event_frontmatter,
     validate_required_fields,
-    way_length_m,
+    way_lengths_m,
     write_json,
 )
 
@@ -227,6 +228,10 @@ def compute_stats(elements):
     total_ways = 0
     total_nodes = 0
 
+    # Every way's length in one batch, consumed in element order below.
+    way_lengths = iter(way_lengths_m(*flatten_ways(
+        [el.get("geometry") or [] for el in elements if el["type"] == "way"])))
+
     for el in elements:
         cs = el.get("changeset")
         if cs is not None:
@@ -239,8 +244,7 @@ def compute_stats(elements):
 
         if el["type"] == "way":
             total_ways += 1
-            geom = el.get("geometry", [])
-            length = way_length_m(geom) if geom else 0.0
+            length = next(way_lengths)
             highway = tags.get("highway", "")
             footway_tag = tags.get("footway", "")
 
@@ -11,13 +11,36 @@ Usage:
     python generate-tm-event-stats.py --event mny26
     python generate-tm-event-stats.py --event mny26 --skip-overpass
     python generate-tm-event-stats.py --event mny26 --bbox 47.17,-122.56,47.32,-122.35
+    python generate-tm-event-stats.py --event mny26 --stream
+    python generate-tm-event-stats.py --event mny26 --stream --overpass-file overpass.json
+    python generate-tm-event-stats.py --event mny26 --race 2
+
+--stream reads the Overpass response (or --overpass-file) element by element
+and tallies stats per changeset as it goes, so memory stays bounded by the
+number of changesets rather than the size of the response; see
+compute_stats_streaming().
+
+Responses from Overpass, the Tasking Manager and the OSM changeset API are
+cached on disk (see ``common.configure_cache()``), so a re-run only refetches
+what has expired; --no-cache bypasses the cache and --offline uses nothing
+else.  An Overpass result is not cached while the query window is still
+open, nor when Overpass reports a runtime error (a partial result).
+
+Overpass mirrors are tried in order of their recorded health (latency and
+success rate, kept in ``.build-cache/overpass-mirrors.json``).  --race N
+queries N mirrors at once instead of one after another, each --race-stagger
+seconds after the previous one, takes the first valid answer and cancels the
+rest; see race_overpass().
 """
 
 import argparse
+import contextlib
 import datetime
 import json
 import os
 import sys
+import threading
+import time
 import urllib.error
 import urllib.parse
 
@@ -26,14 +49,28 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from common import (
     METERS_PER_MILE,
+    CacheMissError,
+    add_cache_arguments,
+    cache_read_only,
+    configure_cache_from_args,
+    discard_cached_response,
     event_dir,
     fetch_json,
+    fetch_json_many,
+    flatten_ways,
     haversine,
+    is_cached,
+    iter_json_array,
+    open_url,
+    overpass_error,
     print_separator,
     prompt_for_file,
+    race_requests,
     read_event_frontmatter,
+    read_json,
+    repo_root,
     validate_required_fields,
-    way_length_m,
+    way_lengths_m,
     write_json,
 )
 
@@ -54,6 +91,19 @@ OVERPASS_URLS = [
 
 _STATS_FILE = "tasking-manager-event-stats.json"
 
+# Per-mirror Overpass outcomes, used to try the healthiest mirrors first.
+MIRROR_HEALTH_FILE = os.path.join(repo_root(), ".build-cache", "overpass-mirrors.json")
+_HEALTH_LATENCY_WEIGHT = 0.3  # weight of the newest latency in the moving average
+_HEALTH_DEFAULT_LATENCY = 60.0  # seconds assumed for a mirror with no successes yet
+
+# race_overpass(): seconds between starting one mirror and the next, so a
+# fast first mirror answers before the public mirrors are all loaded.
+RACE_STAGGER = 5.0
+
+# compute_stats_streaming(): ways buffered (with their geometry) before their
+# lengths are computed in one way_lengths_m() batch.
+STREAM_BATCH_WAYS = 10_000
+
 
 # =============================================================================
 # Tasking Manager helpers
@@ -144,28 +194,217 @@ def fetch_task_stats(project_id):
 # Overpass API
 # =============================================================================
 
-def query_overpass(ql, urls=None):
-    """POST an Overpass QL query, trying each URL until one works."""
-    urls = list(urls or OVERPASS_URLS)
+def load_mirror_health(path=MIRROR_HEALTH_FILE):
+    """Return the recorded per-mirror health, ``{url: entry}`` (empty if none)."""
+    try:
+        health = read_json(path)
+    except (OSError, ValueError):
+        return {}
+    return health if isinstance(health, dict) else {}
+
+
+def save_mirror_health(health, path=MIRROR_HEALTH_FILE):
+    """Write *health* to *path*; failing to save it is not an error."""
+    try:
+        write_json(path, health)
+    except OSError as exc:
+        print(f"  ⚠ Could not save Overpass mirror health: {exc}")
+
+
+def record_mirror_outcome(health, url, outcome, seconds):
+    """Count one attempt's *outcome* ("ok", "error" or "cancelled") for *url*.
+
+    Successful attempts also update the mirror's moving-average latency.
+    """
+    entry = health.setdefault(url, {"ok": 0, "error": 0, "cancelled": 0})
+    entry[outcome] = entry.get(outcome, 0) + 1
+    if outcome == "ok":
+        previous = entry.get("latency_s")
+        entry["latency_s"] = round(seconds if previous is None else
+                                   previous + _HEALTH_LATENCY_WEIGHT * (seconds - previous), 3)
+    entry["last_outcome"] = outcome
+    entry["last_used"] = datetime.datetime.now(datetime.timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ")
+
+
+def mirror_score(entry):
+    """Expected seconds to get an answer from a mirror (lower is better).
+
+    The average latency divided by the success rate, smoothed so that one
+    failure does not bury a mirror and an unknown mirror scores as an
+    average one.  Cancelled attempts say nothing about the mirror.
+    """
+    entry = entry or {}
+    ok, errors = entry.get("ok", 0), entry.get("error", 0)
+    success_rate = (ok + 1) / (ok + errors + 2)
+    return entry.get("latency_s", _HEALTH_DEFAULT_LATENCY) / success_rate
+
+
+def order_mirrors(urls, health):
+    """Return *urls* healthiest first; ties keep their configured order."""
+    return sorted(urls, key=lambda url: mirror_score(health.get(url)))
+
+
+def _mirror_recorder(health, health_file):
+    """Return (record, save) functions for *health*, safe to call from any thread.
+
+    save() writes a copy taken under the same lock as record(), so attempts
+    still finishing in the background cannot change the dict mid-write.
+    Neither does anything without a *health_file*.
+    """
+    lock = threading.Lock()
+
+    def record(url, outcome, seconds):
+        if health_file:
+            with lock:
+                record_mirror_outcome(health, url, outcome, seconds)
+
+    def save():
+        if health_file:
+            with lock:
+                snapshot = {url: dict(entry) for url, entry in health.items()}
+            save_mirror_health(snapshot, health_file)
+    return record, save
+
+
+def _host(url):
+    return url.split("//", 1)[-1].split("/")[0]
+
+
+def _error_label(exc):
+    if isinstance(exc, urllib.error.HTTPError):
+        return f"HTTP {exc.code}"
+    return type(exc).__name__
+
+
+def _mirror_list(urls, health_file):
+    """Return (urls, health, health_file) for a query.
+
+    Without *urls*, the built-in mirrors healthiest first; given *urls*
+    (e.g. a pinned --overpass-url) are used as they are, and their health
+    is not tracked.
+    """
+    if urls:
+        return list(urls), {}, None
+    health = load_mirror_health(health_file) if health_file else {}
+    return order_mirrors(OVERPASS_URLS, health), health, health_file
+
+
+def _cached_overpass(urls, body, fetch):
+    """Return (True, cached result) if the query's answer is cached, else (False, None).
+
+    Serving a cached answer says nothing about any mirror, so callers check
+    this before trying (and timing) them.  Offline, a miss returns
+    (True, None).
+    """
+    try:
+        if not is_cached(urls[0], body):
+            return False, None
+    except CacheMissError:
+        print("  Not cached (offline)")
+        return True, None
+    print("  Using the cached result")
+    return True, fetch(urls[0], data=body)
+
+
+def query_overpass(ql, urls=None, fetch=fetch_json, health_file=MIRROR_HEALTH_FILE):
+    """POST an Overpass QL query, trying each URL until one works.
+
+    Returns ``fetch(url, data=...)`` for the first URL that answers:
+    the parsed result with the default ``fetch_json``, or, with
+    ``fetch=open_url``, the open response to stream it from.  A cached
+    answer is returned without trying any URL.
+
+    Without *urls*, the built-in ``OVERPASS_URLS`` are tried healthiest
+    first, and every attempt is recorded in *health_file* (``None``
+    disables both).
+    """
+    urls, health, health_file = _mirror_list(urls, health_file)
     body = urllib.parse.urlencode({"data": ql}).encode("utf-8")
+    cached, result = _cached_overpass(urls, body, fetch)
+    if cached:
+        return result
+    record, save = _mirror_recorder(health, health_file)
     last_err = None
 
     for i, url in enumerate(urls, 1):
-        label = f"[{i}/{len(urls)}] {url.split('//', 1)[-1].split('/')[0]}"
-        print(f"  Trying {label} …", end=" ", flush=True)
+        print(f"  Trying [{i}/{len(urls)}] {_host(url)} …", end=" ", flush=True)
+        start = time.monotonic()
         try:
-            result = fetch_json(url, data=body)
-            print("OK")
-            return result
+            result = fetch(url, data=body)
+        except CacheMissError:
+            # Overpass responses are cached regardless of mirror.
+            print("not cached (offline)")
+            return None
         except Exception as exc:
-            short = type(exc).__name__
-            if isinstance(exc, urllib.error.HTTPError):
-                short = f"HTTP {exc.code}"
-            print(f"failed ({short})")
+            print(f"failed ({_error_label(exc)})")
+            record(url, "error", time.monotonic() - start)
             last_err = exc
+        else:
+            print("OK")
+            record(url, "ok", time.monotonic() - start)
+            save()
+            return result
+
+    save()
+    return _prompt_overpass_url(body, fetch, len(urls), last_err)
+
+
+def race_overpass(ql, urls=None, racers=2, stagger=RACE_STAGGER, stream=False,
+                  health_file=MIRROR_HEALTH_FILE):
+    """POST an Overpass QL query to several mirrors at once; keep the first answer.
+
+    Unlike query_overpass(), a hung mirror does not hold up the others for
+    the whole request timeout: up to *racers* mirrors run at a time, each
+    started *stagger* seconds after the previous one (or at once when the
+    others have all failed), and the first valid JSON answer cancels the
+    rest.  With *stream* the first 200 response wins and is returned open,
+    as from ``open_url()``.
+
+    Without *urls*, the built-in mirrors are raced healthiest first, and
+    every attempt's latency and outcome are recorded in *health_file*
+    (``None`` disables both).  The file is saved when the race ends, so a
+    cancelled attempt that only reports later (see ``race_requests()``) is
+    not saved; cancellations do not count towards a mirror's score anyway.
+    """
+    urls, health, health_file = _mirror_list(urls, health_file)
+    body = urllib.parse.urlencode({"data": ql}).encode("utf-8")
+    fetch = open_url if stream else fetch_json
+    cached, result = _cached_overpass(urls, body, fetch)
+    if cached:
+        return result
+    record, save = _mirror_recorder(health, health_file)
+
+    def report(url, outcome, seconds):
+        record(url, outcome, seconds)
+        detail = {"ok": "answered", "error": "failed",
+                  "cancelled": "cancelled"}[outcome]
+        print(f"    {_host(url)} {detail} after {seconds:.1f}s", flush=True)
+
+    racers = min(racers, len(urls))
+    print(f"  Racing {racers} of {len(urls)} Overpass servers "
+          f"({stagger:g}s stagger) …", flush=True)
+    last_err = None
+    try:
+        url, result = race_requests(urls, data=body, max_parallel=racers,
+                                    stagger=stagger, stream=stream, on_outcome=report)
+    except CacheMissError:
+        print("  not cached (offline)")
+        return None
+    except RuntimeError as exc:
+        last_err = exc
+    else:
+        print(f"  OK ({_host(url) if url else 'cached'})")
+        return result
+    finally:
+        save()
 
-    # All built-in URLs failed — interactive fallback
-    print(f"\n  ⚠ All {len(urls)} Overpass servers failed.")
+    return _prompt_overpass_url(body, fetch, len(urls), last_err)
+
+
+def _prompt_overpass_url(body, fetch, count, last_err):
+    """Ask for an alternate Overpass URL once every built-in server failed."""
+    print(f"\n  ⚠ All {count} Overpass servers failed.")
     print(f"    Last error: {last_err}")
     print("  Enter an alternate Overpass API URL, or press Enter to skip.")
     try:
@@ -177,7 +416,7 @@ def query_overpass(ql, urls=None):
         return None
     print(f"  Trying {response} …", end=" ", flush=True)
     try:
-        result = fetch_json(response, data=body)
+        result = fetch(response, data=body)
         print("OK")
         return result
     except Exception as exc:
@@ -211,20 +450,27 @@ def build_stats_query(bbox, t_start, t_end):
 _OSM_API_BASE = "https://api.openstreetmap.org/api/0.6"
 _HASHTAG = "#OpenSidewalks"
 
+# The OSM API accepts up to 100 changeset IDs per request.  Batches are
+# fetched this many at a time: few enough to stay a light, polite client of
+# the shared API (which answers 429 when rate limiting; those are retried).
+_CHANGESET_BATCH = 100
+_OSM_API_CONCURRENCY = 2
+
 
 def _fetch_changesets(cs_ids):
     """Fetch changeset metadata for a list of changeset IDs.
 
-    Returns a list of changeset dicts from the OSM API.
-    The OSM API accepts up to ~100 IDs per request.
+    Returns a list of changeset dicts from the OSM API, in batch order.
+    Batches go through ``fetch_json_many()``: pooled keep-alive
+    connections, at most ``_OSM_API_CONCURRENCY`` in flight, with retries.
     """
-    all_changesets = []
-    batch_size = 100
-    for i in range(0, len(cs_ids), batch_size):
-        batch = cs_ids[i:i + batch_size]
+    urls = []
+    for i in range(0, len(cs_ids), _CHANGESET_BATCH):
+        batch = cs_ids[i:i + _CHANGESET_BATCH]
         ids_param = ",".join(str(c) for c in batch)
-        url = f"{_OSM_API_BASE}/changesets.json?changesets={ids_param}"
-        data = fetch_json(url)
+        urls.append(f"{_OSM_API_BASE}/changesets.json?changesets={ids_param}")
+    all_changesets = []
+    for data in fetch_json_many(urls, max_workers=_OSM_API_CONCURRENCY):
         all_changesets.extend(data.get("changesets", []))
     return all_changesets
 
@@ -272,25 +518,92 @@ def filter_by_hashtag(overpass_result, hashtag=_HASHTAG):
 # Stats computation
 # =============================================================================
 
+# Per way category: its (count, length) stats keys.
+_WAY_STATS_KEYS = {
+    "footway": ("footway_way_count", "footway_length_m"),
+    "crossing": ("crossing_way_count", "crossing_way_length_m"),
+    "sidewalk": ("sidewalk_way_count", "sidewalk_way_length_m"),
+    "steps": ("steps_count", "steps_length_m"),
+}
+
+
+def new_tally():
+    """Return zeroed element counts and way lengths for ``tally_element()``."""
+    tally = {"total_elements": 0, "total_ways": 0, "total_nodes": 0}
+    for count_key, length_key in _WAY_STATS_KEYS.values():
+        tally[count_key] = 0
+        tally[length_key] = 0.0
+    tally["crossing_node_count"] = 0
+    tally["curb_node_count"] = 0
+    return tally
+
+
+def tally_element(tally, el, length=0.0):
+    """Add one Overpass element (a way *length* meters long) to *tally*."""
+    tally["total_elements"] += 1
+    tags = el.get("tags", {})
+
+    if el["type"] == "way":
+        tally["total_ways"] += 1
+        highway = tags.get("highway", "")
+        footway_tag = tags.get("footway", "")
+
+        if highway == "steps":
+            category = "steps"
+        elif footway_tag in ("crossing", "sidewalk"):
+            category = footway_tag
+        else:
+            category = "footway"
+        count_key, length_key = _WAY_STATS_KEYS[category]
+        tally[count_key] += 1
+        tally[length_key] += length
+
+    elif el["type"] == "node":
+        tally["total_nodes"] += 1
+        if tags.get("highway") == "crossing":
+            tally["crossing_node_count"] += 1
+        if tags.get("barrier") == "kerb":
+            tally["curb_node_count"] += 1
+
+
+def stats_from_tally(tally, changesets, users):
+    """Build the stats dict from a tally and the changeset IDs and users seen."""
+    all_footway_length_m = sum(
+        tally[length_key] for _count_key, length_key in _WAY_STATS_KEYS.values())
+
+    return {
+        "total_elements": tally["total_elements"],
+        "total_ways": tally["total_ways"],
+        "total_nodes": tally["total_nodes"],
+        "changeset_count": len(changesets),
+        "mapper_count": len(users),
+        "footway_way_count": tally["footway_way_count"],
+        "footway_length_m": round(tally["footway_length_m"], 1),
+        "crossing_way_count": tally["crossing_way_count"],
+        "crossing_way_length_m": round(tally["crossing_way_length_m"], 1),
+        "sidewalk_way_count": tally["sidewalk_way_count"],
+        "sidewalk_way_length_m": round(tally["sidewalk_way_length_m"], 1),
+        "steps_count": tally["steps_count"],
+        "steps_length_m": round(tally["steps_length_m"], 1),
+        "all_footway_length_m": round(all_footway_length_m, 1),
+        "all_footway_miles": round(all_footway_length_m / METERS_PER_MILE, 1),
+        "crossing_node_count": tally["crossing_node_count"],
+        "curb_node_count": tally["curb_node_count"],
+        "changesets": sorted(changesets),
+    }
+
+
 def compute_stats(overpass_result):
     """Derive all stats from the raw Overpass JSON."""
     elements = overpass_result.get("elements", [])
 
     changesets = set()
     users = set()
+    tally = new_tally()
 
-    footway_length_m = 0.0
-    crossing_way_length_m = 0.0
-    sidewalk_way_length_m = 0.0
-    steps_length_m = 0.0
-    footway_way_count = 0
-    crossing_way_count = 0
-    sidewalk_way_count = 0
-    steps_count = 0
-    crossing_node_count = 0
-    curb_node_count = 0
-    total_ways = 0
-    total_nodes = 0
+    # Every way's length in one batch, consumed in element order below.
+    way_lengths = iter(way_lengths_m(*flatten_ways(
+        [el.get("geometry") or [] for el in elements if el["type"] == "way"])))
 
     for el in elements:
         cs = el.get("changeset")
@@ -299,61 +612,73 @@ def compute_stats(overpass_result):
         user = el.get("user")
         if user:
             users.add(user)
+        length = next(way_lengths) if el["type"] == "way" else 0.0
+        tally_element(tally, el, length)
+
+    return stats_from_tally(tally, changesets, users)
+
+
+def tally_by_changeset(elements, batch_ways=STREAM_BATCH_WAYS):
+    """Tally an iterable of Overpass elements per changeset, in one pass.
+
+    Returns ``{changeset_id: {"tally": ..., "users": set()}}`` (elements
+    without a changeset under ``None``).  Only *batch_ways* ways at a time
+    are held, until their lengths are computed, so *elements* can be a
+    stream such as ``iter_json_array()``.
+    """
+    groups = {}
+    pending = []
 
-        tags = el.get("tags", {})
+    def flush():
+        lengths = way_lengths_m(*flatten_ways(
+            [el.get("geometry") or [] for el in pending]))
+        for el, length in zip(pending, lengths):
+            tally_element(groups[el.get("changeset")]["tally"], el, length)
+        pending.clear()
 
+    for el in elements:
+        group = groups.get(el.get("changeset"))
+        if group is None:
+            group = groups[el.get("changeset")] = {"tally": new_tally(), "users": set()}
+        user = el.get("user")
+        if user:
+            group["users"].add(user)
         if el["type"] == "way":
-            total_ways += 1
-            geom = el.get("geometry", [])
-            length = way_length_m(geom) if geom else 0.0
-            highway = tags.get("highway", "")
-            footway_tag = tags.get("footway", "")
-
-            if highway == "steps":
-                steps_count += 1
-                steps_length_m += length
-            elif footway_tag == "crossing":
-                crossing_way_count += 1
-                crossing_way_length_m += length
-            elif footway_tag == "sidewalk":
-                sidewalk_way_count += 1
-                sidewalk_way_length_m += length
-            else:
-                footway_way_count += 1
-                footway_length_m += length
-
-        elif el["type"] == "node":
-            total_nodes += 1
-            if tags.get("highway") == "crossing":
-                crossing_node_count += 1
-            if tags.get("barrier") == "kerb":
-                curb_node_count += 1
-
-    all_footway_length_m = (
-        footway_length_m + crossing_way_length_m
-        + sidewalk_way_length_m + steps_length_m
-    )
+            pending.append(el)
+            if len(pending) >= batch_ways:
+                flush()
+        else:
+            tally_element(group["tally"], el)
+    flush()
+    return groups
 
-    return {
-        "total_elements": len(elements),
-        "total_ways": total_ways,
-        "total_nodes": total_nodes,
-        "changeset_count": len(changesets),
-        "mapper_count": len(users),
-        "footway_way_count": footway_way_count,
-        "footway_length_m": round(footway_length_m, 1),
-        "crossing_way_count": crossing_way_count,
-        "crossing_way_length_m": round(crossing_way_length_m, 1),
-        "sidewalk_way_count": sidewalk_way_count,
-        "sidewalk_way_length_m": round(sidewalk_way_length_m, 1),
-        "steps_count": steps_count,
-        "steps_length_m": round(steps_length_m, 1),
-        "all_footway_length_m": round(all_footway_length_m, 1),
-        "all_footway_miles": round(all_footway_length_m / METERS_PER_MILE, 1),
-        "crossing_node_count": crossing_node_count,
-        "curb_node_count": curb_node_count,
-        "changesets": sorted(changesets),
-    }
+
+def compute_stats_streaming(elements, hashtag=_HASHTAG, batch_ways=STREAM_BATCH_WAYS):
+    """Stats for the elements from changesets mentioning *hashtag*, in one pass.
+
+    Equivalent to ``compute_stats(filter_by_hashtag(result, hashtag))``
+    (way lengths may differ in the last floating-point digits, as they are
+    summed per changeset), but *elements* is only iterated once and never
+    held in memory; see ``tally_by_changeset()``.
+    """
+    groups = tally_by_changeset(elements, batch_ways)
+    cs_ids = {cs for cs in groups if cs}
+    print(f"  Checking {len(cs_ids)} changesets for '{hashtag}' …")
+    matched_cs = _changesets_with_hashtag(cs_ids, hashtag) & cs_ids
+    print(f"  {len(matched_cs)}/{len(cs_ids)} changesets matched")
+
+    tally = new_tally()
+    users = set()
+    for cs in sorted(matched_cs):
+        for key, value in groups[cs]["tally"].items():
+            tally[key] += value
+        users |= groups[cs]["users"]
+    dropped = sum(group["tally"]["total_elements"] for group in groups.values()) - (
+        tally["total_elements"])
+    if dropped:
+        print(
+            f"  Filtered out {dropped} elements from non-matching changesets")
+    return stats_from_tally(tally, matched_cs, users)
 
 
 # =============================================================================
@@ -487,12 +812,27 @@ def main():
                     help="Skip Overpass query (TM stats only)")
     ap.add_argument("--overpass-url",
                     help="Use only this Overpass API URL")
+    ap.add_argument("--overpass-file",
+                    help="Read a saved Overpass JSON result instead of "
+                         "querying Overpass")
+    ap.add_argument("--stream", action="store_true",
+                    help="Stream the Overpass result element by element "
+                         "(bounded memory for large event windows)")
+    ap.add_argument("--race", type=int, default=0, metavar="N",
+                    help="Query N Overpass servers at once and keep the "
+                         "first answer (default: one at a time)")
+    ap.add_argument("--race-stagger", type=float, default=RACE_STAGGER,
+                    metavar="SECONDS",
+                    help="Seconds between starting raced servers "
+                         f"(default: {RACE_STAGGER:g})")
     ap.add_argument("--pad-before", type=float, default=24,
                     help="Hours before event start (default: 24)")
     ap.add_argument("--pad-after", type=float, default=24,
                     help="Hours after event end (default: 24)")
+    add_cache_arguments(ap)
 
     args = ap.parse_args()
+    configure_cache_from_args(ap, args)
     event_slug = args.event
 
     # ── Read frontmatter ─────────────────────────────────────────────────
@@ -512,8 +852,8 @@ def main():
     dt_end = datetime.datetime.fromisoformat(t_end.replace("Z", "+00:00"))
     q_start = (dt_start - datetime.timedelta(hours=args.pad_before)).strftime(
         "%Y-%m-%dT%H:%M:%SZ")
-    q_end = (dt_end + datetime.timedelta(hours=args.pad_after)).strftime(
-        "%Y-%m-%dT%H:%M:%SZ")
+    dt_q_end = dt_end + datetime.timedelta(hours=args.pad_after)
+    q_end = dt_q_end.strftime("%Y-%m-%dT%H:%M:%SZ")
 
     print(f"=== TM Event Statistics — Project #{project_id} ===")
     print(f"Event window : {t_start}  →  {t_end}")
@@ -576,11 +916,45 @@ def main():
     # ── 3. Overpass query ────────────────────────────────────────────────
     osm_stats = None
     if not args.skip_overpass:
-        print("\nQuerying Overpass API (this may take a minute) …")
-        ql = build_stats_query(bbox, q_start, q_end)
-        overpass_urls = [args.overpass_url] if args.overpass_url else None
-        result = query_overpass(ql, urls=overpass_urls)
-        if result is not None:
+        if args.overpass_file:
+            print(f"\nLoading Overpass result from {args.overpass_file} …")
+            if args.stream:
+                result = open(args.overpass_file, "rb")
+            else:
+                result = read_json(args.overpass_file)
+        else:
+            print("\nQuerying Overpass API (this may take a minute) …")
+            ql = build_stats_query(bbox, q_start, q_end)
+            overpass_urls = [args.overpass_url] if args.overpass_url else None
+            window_open = (dt_q_end.replace(tzinfo=dt_q_end.tzinfo or datetime.timezone.utc)
+                           > datetime.datetime.now(datetime.timezone.utc))
+            if window_open:
+                print("  Query window has not ended yet; the result will not be cached.")
+            with cache_read_only() if window_open else contextlib.nullcontext():
+                if args.race > 1 and not args.overpass_url:
+                    result = race_overpass(ql, racers=args.race,
+                                           stagger=args.race_stagger, stream=args.stream)
+                else:
+                    result = query_overpass(ql, urls=overpass_urls,
+                                            fetch=open_url if args.stream else fetch_json)
+        if result is not None and args.stream:
+            header = {}
+            try:
+                with result:
+                    osm_stats = compute_stats_streaming(
+                        iter_json_array(result, "elements", header))
+                    if overpass_error(header):
+                        discard_cached_response(result)
+            except ValueError as exc:
+                print(f"  ✗ Could not parse the Overpass result: {exc}")
+                print("  Skipping Overpass statistics.")
+            else:
+                if header.get("remark"):
+                    print(f"  ⚠ Overpass remark: {header['remark']}")
+                print_stats(osm_stats, task_stats)
+        elif result is not None:
+            if result.get("remark"):
+                print(f"  ⚠ Overpass remark: {result['remark']}")
             result = filter_by_hashtag(result)
             osm_stats = compute_stats(result)
             print_stats(osm_stats, task_stats)
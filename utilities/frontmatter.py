@@ -0,0 +1,407 @@
+"""frontmatter.py - Shared YAML frontmatter reader for the utilities scripts.
+
+One implementation of the Markdown frontmatter parsing used by build-site.py,
+the akb-*.py scripts, the event-reports scripts and the docs tests. It covers
+the YAML subset our pages are authored in, without PyYAML:
+
+  - parse(text): a flat dict of the top-level scalar keys, as strings.
+    Nested maps and lists are skipped, as are keys with an empty value.
+    This is what most callers need (title, slug, publication_status, ...).
+  - parse(text, nested=True): the full block: nested maps, block lists
+    (``products``, ``topics``, ``related_pages``), inline ``[a, b]`` lists
+    and typed scalars (null, bool, int and float, resolved as PyYAML's
+    safe_load does). Dates and timestamps stay ISO strings rather than
+    becoming date objects. Raises FrontmatterError on malformed structure,
+    such as a stray indented line, where PyYAML would also fail.
+  - parse_lenient(text, path): the nested parse, or for a malformed block
+    the flat parse, with a warning naming path on stderr, so one bad page
+    does not fail a whole build.
+  - as_list(value): a nested value (a list, a scalar or None) as a list of
+    strings, for fields such as ``topics`` that may be either.
+  - read_header(path): reads only as far as the closing ``---`` line rather
+    than the whole file; the result parses exactly like the full text.
+  - load(path, nested=False): read_header() plus parse(), memoized by
+    (path, mtime, size), so repeated lookups of an unchanged page cost one
+    stat(). The returned dicts are shared between callers; do not modify them.
+
+In both modes, quoted values are unquoted (with YAML's escapes) and inline
+``# comments`` are dropped, as in YAML: a ``#`` starts a comment only at the
+start of a value or after whitespace, outside quotes.
+
+Import it after putting utilities/ on sys.path (scripts in utilities/ get
+that for free):
+
+    import frontmatter
+    fm = frontmatter.load(path)
+"""
+
+import os
+import re
+import sys
+import threading
+
+FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---[ \t\r]*(?:\n|\Z)", re.DOTALL)
+_HEADER_RE = re.compile(rb"^---\s*\n(.*?)\n---[ \t\r]*\n", re.DOTALL)
+_HEADER_AT_EOF_RE = re.compile(rb"^---\s*\n(.*?)\n---[ \t\r]*\Z", re.DOTALL)
+
+# read_header() reads files in chunks of this many bytes, so a typical
+# page's frontmatter arrives in a single read.
+READ_SIZE = 4096
+
+_COMMENT_RE = re.compile(r"(?:^|[ \t])#")
+_TRAILING_COMMENT_RE = re.compile(r"[ \t]+#")
+_ESCAPE_RE = re.compile(r"\\(x[0-9A-Fa-f]{2}|u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)")
+_ESCAPES = {
+    "0": "\0", "a": "\a", "b": "\b", "t": "\t", "\t": "\t", "n": "\n",
+    "v": "\v", "f": "\f", "r": "\r", "e": "\x1b", " ": " ", '"': '"',
+    "/": "/", "\\": "\\", "N": "\x85", "_": "\xa0", "L": "\u2028", "P": "\u2029",
+}
+
+# Plain scalars PyYAML's safe_load resolves to something other than a string.
+_NULLS = {"", "~", "null", "Null", "NULL"}
+_BOOLS = {
+    **dict.fromkeys(("yes", "Yes", "YES", "true", "True", "TRUE", "on", "On", "ON"), True),
+    **dict.fromkeys(("no", "No", "NO", "false", "False", "FALSE", "off", "Off", "OFF"), False),
+}
+_INT_RE = re.compile(r"[-+]?(?:0|[1-9][0-9_]*)\Z")
+_BASE_INT_RE = re.compile(r"([-+]?)0(b[01_]+|x[0-9a-fA-F_]+|[0-7_]+)\Z")
+_FLOAT_RE = re.compile(r"(?:[-+]?[0-9][0-9_]*\.[0-9_]*|\.[0-9][0-9_]*)(?:[eE][-+][0-9]+)?\Z")
+_SPECIAL_FLOATS = {
+    **dict.fromkeys((".inf", ".Inf", ".INF", "+.inf", "+.Inf", "+.INF"), float("inf")),
+    **dict.fromkeys(("-.inf", "-.Inf", "-.INF"), float("-inf")),
+    **dict.fromkeys((".nan", ".NaN", ".NAN"), float("nan")),
+}
+
+
+class FrontmatterError(ValueError):
+    """Raised by parse(text, nested=True) for frontmatter it cannot read."""
+
+
+# =============================================================================
+# Scalars
+# =============================================================================
+
+def _quoted_end(value):
+    """Return the index just past the quoted scalar value starts with, or -1."""
+    quote = value[0]
+    i = 1
+    while True:
+        i = value.find(quote, i)
+        if i == -1:
+            return -1
+        if quote == '"':
+            backslashes = len(value[:i]) - len(value[:i].rstrip("\\"))
+            if backslashes % 2:
+                i += 1
+                continue
+        elif value.startswith("''", i):
+            i += 2
+            continue
+        return i + 1
+
+
+def _strip_comment(value):
+    """Return value (already stripped) minus any inline comment."""
+    if value[:1] in ("'", '"'):
+        end = _quoted_end(value)
+        if end != -1:
+            rest = value[end:]
+            if not rest.strip(" \t") or _TRAILING_COMMENT_RE.match(rest):
+                return value[:end]
+            return value
+    match = _COMMENT_RE.search(value)
+    return value[:match.start()].rstrip() if match else value
+
+
+def _unquote(value):
+    """Return value with its surrounding quotes removed and escapes decoded.
+
+    Values that are not one complete quoted scalar are returned unchanged.
+    """
+    if len(value) < 2 or value[0] not in ("'", '"') or _quoted_end(value) != len(value):
+        return value
+    if value[0] == "'":
+        return value[1:-1].replace("''", "'")
+
+    def decode(match):
+        escape = match.group(1)
+        if len(escape) > 1:
+            return chr(int(escape[1:], 16))
+        return _ESCAPES.get(escape, match.group())
+
+    return _ESCAPE_RE.sub(decode, value[1:-1])
+
+
+def _split_flow(inner):
+    """Split the inside of a flow collection at its top-level commas."""
+    items, start, i = [], 0, 0
+    while i < len(inner):
+        char = inner[i]
+        if char in ("'", '"') and not inner[start:i].strip():
+            end = _quoted_end(inner[i:])
+            if end == -1:
+                raise FrontmatterError(f"unterminated quoted value in {inner!r}")
+            i += end
+            continue
+        if char in "[]{}":
+            raise FrontmatterError(f"nested flow collections are not supported: {inner!r}")
+        if char == ",":
+            items.append(inner[start:i].strip())
+            start = i + 1
+        i += 1
+    items.append(inner[start:].strip())
+    if items[-1] == "":
+        items.pop()
+    return items
+
+
+def _scalar(value):
+    """Resolve one value (comment already stripped) to a Python object."""
+    if value[:1] in ("'", '"'):
+        if _quoted_end(value) != len(value):
+            raise FrontmatterError(f"malformed quoted value {value!r}")
+        return _unquote(value)
+    if value[:1] == "[":
+        if not value.endswith("]"):
+            raise FrontmatterError(f"unterminated inline list {value!r}")
+        return [_scalar(item) for item in _split_flow(value[1:-1])]
+    if value[:1] == "{":
+        if not value.endswith("}"):
+            raise FrontmatterError(f"unterminated inline map {value!r}")
+        mapping = {}
+        for item in _split_flow(value[1:-1]):
+            key, sep, item_value = item.partition(":")
+            mapping[_unquote(key.strip())] = _scalar(item_value.strip()) if sep else None
+        return mapping
+    if value in _NULLS:
+        return None
+    if value in _BOOLS:
+        return _BOOLS[value]
+    if _INT_RE.match(value):
+        return int(value.replace("_", ""))
+    match = _BASE_INT_RE.match(value)
+    if match:
+        digits = match.group(2).replace("_", "")
+        base = {"b": 2, "x": 16}.get(digits[0], 8)
+        number = int(digits[1:] if base != 8 else digits, base)
+        return -number if match.group(1) == "-" else number
+    if value in _SPECIAL_FLOATS:
+        return _SPECIAL_FLOATS[value]
+    if _FLOAT_RE.match(value):
+        return float(value.replace("_", ""))
+    return value
+
+
+# =============================================================================
+# Parsing
+# =============================================================================
+
+def _split_key(content):
+    """Split a ``key: value`` line into (key, value), or return None.
+
+    The separator is the first colon followed by whitespace or the end of
+    the line, as in YAML, so ``street:name=*`` is not a key.
+    """
+    if content[:1] in ("'", '"'):
+        end = _quoted_end(content)
+        if end == -1 or not content.startswith(":", end):
+            return None
+        key, rest = _unquote(content[:end]), content[end + 1:]
+    else:
+        index = content.find(":")
+        while index != -1 and index + 1 < len(content) and content[index + 1] not in " \t":
+            index = content.find(":", index + 1)
+        if index == -1:
+            return None
+        key, rest = content[:index].strip(), content[index + 1:]
+    if rest and rest[0] not in " \t":
+        return None
+    return key, _strip_comment(rest.strip())
+
+
+def _parse_flat(block):
+    props = {}
+    for line in block.split("\n"):
+        if not line or line[0] in " \t#-":
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        value = _unquote(_strip_comment(value.strip()))
+        if value:
+            props[key.strip()] = value
+    return props
+
+
+def _is_item(content):
+    return content == "-" or content.startswith(("- ", "-\t"))
+
+
+def _parse_node(lines, i, indent):
+    """Parse the block collection whose lines start at lines[i], at indent.
+
+    lines holds (line number, indent, content) for every non-blank,
+    non-comment line. Returns (value, index of the first line after it).
+    """
+    if _is_item(lines[i][2]):
+        return _parse_sequence(lines, i, indent)
+    return _parse_mapping(lines, i, indent)
+
+
+def _nested_value(lines, i, indent, parent_is_key):
+    """Parse the collection (if any) that belongs to the empty value ending at lines[i - 1]."""
+    if i < len(lines):
+        next_indent, content = lines[i][1], lines[i][2]
+        if next_indent > indent or (parent_is_key and next_indent == indent
+                                    and _is_item(content)):
+            return _parse_node(lines, i, next_indent)
+    return None, i
+
+
+def _parse_sequence(lines, i, indent):
+    items = []
+    while i < len(lines) and lines[i][1] == indent and _is_item(lines[i][2]):
+        number, _, content = lines[i]
+        text = content[1:].lstrip(" \t")
+        if not text:
+            value, i = _nested_value(lines, i + 1, indent, parent_is_key=False)
+        elif not text.startswith(("'", '"', "[", "{")) and _split_key(text) is not None:
+            # "- key: value" starts a map nested inside the item; re-read the
+            # rest of the item line as that map's first line.
+            item_indent = indent + len(content) - len(text)
+            lines[i] = (number, item_indent, text)
+            value, i = _parse_mapping(lines, i, item_indent)
+        else:
+            value = _scalar(_strip_comment(text))
+            i += 1
+        items.append(value)
+    if i < len(lines) and lines[i][1] > indent:
+        raise FrontmatterError(f"line {lines[i][0]}: unexpected indentation")
+    return items, i
+
+
+def _parse_mapping(lines, i, indent):
+    mapping = {}
+    while i < len(lines) and lines[i][1] == indent:
+        number, _, content = lines[i]
+        if _is_item(content):
+            raise FrontmatterError(f"line {number}: list item where a key was expected")
+        split = _split_key(content)
+        if split is None:
+            raise FrontmatterError(f"line {number}: expected 'key: value', got {content!r}")
+        key, value = split
+        if value:
+            mapping[key] = _scalar(value)
+            i += 1
+            if i < len(lines) and lines[i][1] > indent:
+                raise FrontmatterError(f"line {lines[i][0]}: unexpected indentation")
+        else:
+            mapping[key], i = _nested_value(lines, i + 1, indent, parent_is_key=True)
+    if i < len(lines) and lines[i][1] > indent:
+        raise FrontmatterError(f"line {lines[i][0]}: unexpected indentation")
+    return mapping, i
+
+
+def _parse_nested(block):
+    lines = []
+    for number, line in enumerate(block.split("\n"), start=2):
+        content = line.strip(" \t\r")
+        if not content or content.startswith("#"):
+            continue
+        if "\t" in line[:len(line) - len(line.lstrip(" \t"))]:
+            raise FrontmatterError(f"line {number}: tabs are not allowed in indentation")
+        lines.append((number, len(line) - len(line.lstrip(" ")), content))
+    if not lines:
+        return {}
+    mapping, i = _parse_mapping(lines, 0, lines[0][1])
+    if i < len(lines):
+        raise FrontmatterError(f"line {lines[i][0]}: unexpected dedent")
+    return mapping
+
+
+def parse(text, nested=False):
+    """Parse the frontmatter at the start of text (a whole page or read_header()).
+
+    Returns {} if text has no frontmatter. See the module docstring for the
+    flat (default) and nested modes.
+    """
+    match = FRONTMATTER_RE.match(text)
+    if not match:
+        return {}
+    if nested:
+        return _parse_nested(match.group(1))
+    return _parse_flat(match.group(1))
+
+
+def parse_lenient(text, path):
+    """Return parse(text, nested=True), or parse(text) if the block is malformed.
+
+    The FrontmatterError is reported on stderr as a warning naming path;
+    the page then has no nested fields (topics, products, ...).
+    """
+    try:
+        return parse(text, nested=True)
+    except FrontmatterError as exc:
+        print(f"warning: {path}: malformed frontmatter ({exc}); "
+              "using its top-level fields only", file=sys.stderr)
+        return parse(text)
+
+
+def as_list(value):
+    """Return a nested frontmatter value as a list of strings.
+
+    None gives [], a list its non-null items, and any other value [value].
+    """
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value if item is not None]
+    return [str(value)]
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+def read_header(path, chunk_size=READ_SIZE):
+    """Return the frontmatter block at the start of path ("" if there is none).
+
+    Reads only as far as the closing ``---`` line rather than the whole file.
+    The result parses exactly like the full text would with parse().
+    """
+    data = b""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            data += chunk
+            if not data.startswith(b"---"[:len(data)]):
+                return ""
+            match = (_HEADER_RE if chunk else _HEADER_AT_EOF_RE).match(data)
+            if match:
+                return match.group().decode("utf-8")
+            if not chunk:
+                return ""
+
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def load(path, nested=False):
+    """Return parse(read_header(path), nested), memoized by (path, mtime, size)."""
+    key = (os.fspath(path), nested)
+    stat = os.stat(key[0])
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _memo.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    result = parse(read_header(key[0]), nested)
+    with _memo_lock:
+        _memo[key] = (version, result)
+    return result
+
+
+def cache_clear():
+    """Forget every load() result."""
+    with _memo_lock:
+        _memo.clear()
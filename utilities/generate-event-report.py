@@ -382,6 +382,19 @@ def main():
     ap.add_argument("--overpass-url", help="Pin a specific Overpass server")
     ap.add_argument("--skip-overpass", action="store_true",
                     help="Skip Overpass query (TM task stats only)")
+    ap.add_argument("--overpass-file",
+                    help="Saved Overpass JSON result to use (TM)")
+    ap.add_argument("--stream", action="store_true",
+                    help="Stream the Overpass result (TM, bounded memory)")
+    ap.add_argument("--race", type=int, metavar="N",
+                    help="Query N Overpass servers at once (TM)")
+    ap.add_argument("--race-stagger", type=float, metavar="SECONDS",
+                    help="Seconds between starting raced Overpass servers (TM)")
+    ap.add_argument("--cache-dir", help="HTTP response cache directory (TM)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Bypass the HTTP response cache (TM)")
+    ap.add_argument("--offline", action="store_true",
+                    help="Only use cached HTTP responses (TM)")
     ap.add_argument("--aoi-file", help="Local GeoJSON AOI file (TM)")
     ap.add_argument("--tasks-file", help="Local GeoJSON tasks file (TM)")
     ap.add_argument("--pad-before", type=float,
@@ -424,6 +437,20 @@ def main():
             extra.extend(["--overpass-url", args.overpass_url])
         if args.skip_overpass:
             extra.append("--skip-overpass")
+        if args.overpass_file:
+            extra.extend(["--overpass-file", args.overpass_file])
+        if args.stream:
+            extra.append("--stream")
+        if args.race is not None:
+            extra.extend(["--race", str(args.race)])
+        if args.race_stagger is not None:
+            extra.extend(["--race-stagger", str(args.race_stagger)])
+        if args.cache_dir:
+            extra.extend(["--cache-dir", args.cache_dir])
+        if args.no_cache:
+            extra.append("--no-cache")
+        if args.offline:
+            extra.append("--offline")
         if args.aoi_file:
             extra.extend(["--aoi-file", args.aoi_file])
         if args.tasks_file:
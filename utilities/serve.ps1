@@ -2,8 +2,8 @@
 # This script is designed to be run in a PowerShell environment.
 
 # Name: TCAT Wiki - Local Serve Wrapper
-# Version: 1.0.0
-# Date: 2026-07-06
+# Version: 1.1.0
+# Date: 2026-10-18
 # Author: Amy Bordenave, Taskar Center for Accessible Technology, University of Washington
 # License: CC-BY-ND 4.0 International
 
@@ -12,17 +12,18 @@
     Serves a local preview of the site that matches the deployed build exactly.
 
 .DESCRIPTION
-    Wraps utilities/build-site.py: runs the two-layer build prep (copy, filter,
-    dispatch generation, agent-doc stripping, and zensical.build.toml generation),
-    then runs `zensical serve -f zensical.build.toml`.
+    Wraps utilities/build-site.py --watch: runs the two-layer build prep (copy,
+    filter, dispatch generation, agent-doc stripping, and zensical.build.toml
+    generation), then runs `zensical serve -f zensical.build.toml`.
 
     Unlike running `zensical serve` directly against the committed zensical.toml
     (which reads docs_dir = docs and therefore shows every assistant stub/draft
     page), this wrapper serves the same human-docs/ layer that gets deployed.
 
-    Source edits are NOT live-reloaded across the human/agent split: editing a
-    file under docs/ will not update the running preview. Stop the server
-    (Ctrl+C) and re-run this script to refresh after making source edits.
+    Source edits are live-reloaded across the human/agent split: while the
+    server runs, docs/, includes/, and zensical.toml are watched, and each edit
+    incrementally updates human-docs/ and agent-docs/ (re-filtering pages whose
+    publication_status changed), which the server then reloads.
 
 .EXAMPLE
     .\utilities\serve.ps1
@@ -36,7 +37,7 @@
 $repoRoot = Split-Path -Parent $PSScriptRoot
 Push-Location $repoRoot
 try {
-    python utilities/build-site.py --serve
+    python utilities/build-site.py --watch
 } finally {
     Pop-Location
 }
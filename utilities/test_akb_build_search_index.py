@@ -0,0 +1,147 @@
+"""Pytest suite for utilities/akb-build-search-index.py.
+
+Uses a temp fixture tree (never the real docs/assistant/) to validate index
+building, BM25 ranking, filters and the CLI.
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).parent / "akb-build-search-index.py"
+spec = importlib.util.spec_from_file_location(
+    "akb_build_search_index", MODULE_PATH)
+if spec is None or spec.loader is None:
+    raise ImportError(f"could not load module spec from {MODULE_PATH}")
+absi = importlib.util.module_from_spec(spec)
+sys.modules["akb_build_search_index"] = absi
+spec.loader.exec_module(absi)
+
+
+def write_article(path: Path, title, status, questions=(), topics=(), body="TODO"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    question_lines = "".join(f"    - {q}\n" for q in questions)
+    topic_lines = "".join(f"    - {t}\n" for t in topics)
+    path.write_text(
+        f"---\ntitle: {title}\ndoc_type: {path.parent.name}\n"
+        f"questions:\n{question_lines}topics:\n{topic_lines}"
+        f"publication_status: {status}\n---\n\n# {title}\n\n## Short Answer\n\n{body}\n",
+        encoding="utf-8")
+
+
+@pytest.fixture
+def assistant_dir(tmp_path):
+    root = tmp_path / "assistant"
+    write_article(root / "alpha" / "concept" / "curb-ramps.md", "What is a curb ramp?",
+                  "published", questions=["Where are curb ramps mapped?"],
+                  topics=["alpha", "curbs"], body="A ramp cut into the curb.")
+    write_article(root / "alpha" / "concept" / "crossings.md", "What is a crossing?",
+                  "draft", topics=["alpha"],
+                  body="Crossings often end at a curb ramp. See [ramps](curb-ramps.md).")
+    write_article(root / "beta" / "workflow" / "upload.md", "How do I upload a dataset?",
+                  "stub", topics=["beta", "curbs"], body="<!-- curb -->Use the uploader.")
+    (root / "index.md").write_text("---\ntitle: AKB\n---\n\n# Curb curb curb\n",
+                                   encoding="utf-8")
+    return root
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    assert absi.tokenize("What is the is_sidepath:of:name=* Tag?") == [
+        "sidepath", "name", "tag"]
+
+
+def test_build_index_records_docs_postings_and_filters(assistant_dir):
+    index = absi.build_index(assistant_dir)
+
+    assert [doc["path"] for doc in index["docs"]] == [
+        "assistant/alpha/concept/crossings.md",
+        "assistant/alpha/concept/curb-ramps.md",
+        "assistant/beta/workflow/upload.md",
+    ]
+    assert index["docs"][1]["topics"] == ["alpha", "curbs"]
+    assert index["filters"]["topic"] == {"alpha": [0, 1], "beta": [2], "curbs": [1, 2]}
+    assert index["filters"]["status"] == {"draft": [0], "published": [1], "stub": [2]}
+    assert index["filters"]["doc_type"] == {"concept": [0, 1], "workflow": [2]}
+    # Link targets and comments are not indexed; link text is.
+    assert "md" not in index["postings"] and "ramps" in index["postings"]
+    assert index["postings"]["curb"][::2] == [0, 1]
+    assert absi.render_index(index) == absi.render_index(absi.build_index(assistant_dir))
+
+
+def test_search_ranks_title_and_question_matches_first(assistant_dir):
+    index = absi.build_index(assistant_dir)
+
+    results = absi.search(index, "curb ramp")
+
+    assert [r["path"] for r in results] == [
+        "assistant/alpha/concept/curb-ramps.md", "assistant/alpha/concept/crossings.md"]
+    assert results[0]["score"] > results[1]["score"] > 0
+    assert absi.search(index, "the of") == [] and absi.search(index, "zebra") == []
+
+
+def test_search_filters(assistant_dir):
+    index = absi.build_index(assistant_dir)
+
+    def paths(**filters):
+        return [r["path"] for r in absi.search(index, "curb", **filters)]
+
+    assert paths(status="draft") == ["assistant/alpha/concept/crossings.md"]
+    assert paths(topic="curbs") == ["assistant/alpha/concept/curb-ramps.md"]
+    assert paths(status=["draft", "stub"], doc_type="concept") == [
+        "assistant/alpha/concept/crossings.md"]
+    assert paths(topic="gamma") == []
+    with pytest.raises(ValueError):
+        absi.search(index, "curb", author="me")
+
+
+def test_search_uses_given_texts_instead_of_disk(assistant_dir):
+    rel = "beta/workflow/upload.md"
+    text = (assistant_dir / rel).read_text(encoding="utf-8") + "\nWombats.\n"
+
+    index = absi.build_index(assistant_dir, texts={rel: text})
+
+    assert [r["path"] for r in absi.search(index, "wombats")] == [f"assistant/{rel}"]
+
+
+def test_build_index_falls_back_on_malformed_nested_frontmatter(assistant_dir, capsys):
+    page = assistant_dir / "beta" / "workflow" / "upload.md"
+    page.write_text(page.read_text(encoding="utf-8").replace(
+        "topics:\n", "topics:\n  stray: indent\n    - bad\n"), encoding="utf-8")
+
+    index = absi.build_index(assistant_dir)
+
+    doc = index["docs"][2]
+    assert doc["path"] == "assistant/beta/workflow/upload.md" and doc["topics"] == ["beta"]
+    assert "warning: assistant/beta/workflow/upload.md: malformed frontmatter" in \
+        capsys.readouterr().err
+
+
+def test_load_index_rejects_other_versions(assistant_dir, tmp_path):
+    path = absi.write_index(absi.build_index(assistant_dir), tmp_path / "index.json")
+    assert absi.load_index(path)["version"] == absi.INDEX_VERSION
+
+    path.write_text(json.dumps({"version": 0}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        absi.load_index(path)
+
+
+def test_main_writes_and_queries_an_index(assistant_dir, tmp_path, capsys):
+    output = tmp_path / "search-index.json"
+    assert absi.main(["--assistant-dir", str(assistant_dir), "--output", str(output)]) == 0
+    assert "Indexed 3 articles" in capsys.readouterr().out
+
+    assert absi.main(["--index", str(output), "--query", "curb ramp",
+                      "--status", "published", "--json"]) == 0
+    results = json.loads(capsys.readouterr().out)
+    assert [r["path"] for r in results] == ["assistant/alpha/concept/curb-ramps.md"]
+
+    assert absi.main(["--assistant-dir", str(assistant_dir), "--query", "zebra"]) == 0
+    assert "No matches." in capsys.readouterr().out
+
+
+def test_main_requires_something_to_do():
+    with pytest.raises(SystemExit):
+        absi.main([])
@@ -12,7 +12,8 @@ from collections import defaultdict
 from pathlib import Path
 
 import pytest
-import yaml
+
+from frontmatter import FRONTMATTER_RE, load as load_frontmatter, parse as parse_frontmatter
 
 REPO_ROOT = Path(__file__).parent.parent
 ASSISTANT_DIR = REPO_ROOT / "docs" / "assistant"
@@ -47,71 +48,18 @@ VALID_RISK_LEVELS = {"low", "medium", "high"}
 VALID_AUTHORITY_LEVELS = {"provisional", "explanatory", "official"}
 VALID_RETRIEVAL_PRIORITIES = {"low", "medium", "high"}
 
-FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n", re.DOTALL)
 ROW_RE = re.compile(r"^\|\s*`([^`]+\.md)`\s*\|\s*(\S+)\s*\|")
 HEADING_RE = re.compile(r"^(#{2,4})\s+(.*)$")
 BASE_RE = re.compile(r"^Base:\s*`([^`]+)`")
 
 
-def parse_frontmatter(text):
-    """Parse simple top-level ``key: value`` YAML frontmatter into a dict.
-
-    Mirrors the parser in utilities/akb-generate-dispatch.py: only scalar
-    top-level keys are captured, not nested maps/lists.
-    """
-    match = FRONTMATTER_RE.match(text)
-    if not match:
-        return {}
-    props = {}
-    for line in match.group(1).split("\n"):
-        if not line or line[0] in " \t#-":
-            continue
-        if ":" not in line:
-            continue
-        key, _, value = line.partition(":")
-        key = key.strip()
-        value = value.strip()
-        if len(value) >= 2 and value[0] in "'\"" and value[-1] == value[0]:
-            value = value[1:-1]
-        if value:
-            props[key] = value
-    return props
-
-
-LIST_ITEM_RE = re.compile(r"^\s*-\s*(.+)$")
-
+def frontmatter_list(path, key):
+    """Return the ``key`` list from path's frontmatter ([] if missing or empty).
 
-def parse_frontmatter_list(text, key):
-    """Parse a top-level ``key:``-introduced YAML block list into a list of strings.
-
-    Only handles the simple block-list style used throughout docs/assistant/
-    (``key:`` on its own line, followed by indented ``- value`` lines), which
-    mirrors how ``products``/``topics`` are actually authored. An inline
-    ``key: []`` (empty list) or missing key both yield ``[]``.
+    Parsed with the shared utilities/frontmatter.py reader, so a list that is
+    not valid YAML (e.g. a stray indented line) fails loudly.
     """
-    match = FRONTMATTER_RE.match(text)
-    if not match:
-        return []
-    lines = match.group(1).split("\n")
-    items = []
-    in_list = False
-    for line in lines:
-        stripped = line.strip()
-        if not in_list:
-            if stripped == f"{key}:":
-                in_list = True
-            continue
-        if line and line[0] in " \t":
-            m = LIST_ITEM_RE.match(line)
-            if not m:
-                break
-            value = m.group(1).strip()
-            if len(value) >= 2 and value[0] in "'\"" and value[-1] == value[0]:
-                value = value[1:-1]
-            items.append(value)
-        else:
-            break
-    return items
+    return load_frontmatter(path, nested=True).get(key) or []
 
 
 CODE_TABLE_CELL_RE = re.compile(r"^\|\s*`([^`]+)`\s*\|", re.MULTILINE)
@@ -208,7 +156,7 @@ def test_no_stray_files_at_assistant_root():
 
 @pytest.mark.parametrize("topic,doc_type,path", ARTICLES, ids=ARTICLE_IDS)
 def test_slug_matches_filename_or_topic_index(topic, doc_type, path):
-    fm = parse_frontmatter(path.read_text(encoding="utf-8"))
+    fm = load_frontmatter(path)
     slug = fm.get("slug")
     if doc_type == "policy":
         expected = f"{topic}-index"
@@ -219,7 +167,7 @@ def test_slug_matches_filename_or_topic_index(topic, doc_type, path):
 
 @pytest.mark.parametrize("topic,doc_type,path", ARTICLES, ids=ARTICLE_IDS)
 def test_doc_type_matches_location(topic, doc_type, path):
-    fm = parse_frontmatter(path.read_text(encoding="utf-8"))
+    fm = load_frontmatter(path)
     assert fm.get("doc_type") == doc_type, (
         f"{rel(path)}: doc_type '{fm.get('doc_type')}' != expected '{doc_type}' "
         f"(based on its location on disk)"
@@ -242,7 +190,7 @@ def test_required_sections_present_and_ordered(topic, doc_type, path):
 
 @pytest.mark.parametrize("topic,doc_type,path", ARTICLES, ids=ARTICLE_IDS)
 def test_frontmatter_enum_values_valid(topic, doc_type, path):
-    fm = parse_frontmatter(path.read_text(encoding="utf-8"))
+    fm = load_frontmatter(path)
     assert fm.get("publication_status") in VALID_PUBLICATION_STATUSES, (
         f"{rel(path)}: invalid publication_status {fm.get('publication_status')!r}"
     )
@@ -259,7 +207,7 @@ def test_frontmatter_enum_values_valid(topic, doc_type, path):
 
 @pytest.mark.parametrize("topic,doc_type,path", ARTICLES, ids=ARTICLE_IDS)
 def test_title_is_present(topic, doc_type, path):
-    fm = parse_frontmatter(path.read_text(encoding="utf-8"))
+    fm = load_frontmatter(path)
     assert fm.get("title"), f"{rel(path)}: missing or empty title"
 
 
@@ -299,8 +247,7 @@ def schema_product_slugs():
 
 @pytest.mark.parametrize("topic,doc_type,path", ARTICLES, ids=ARTICLE_IDS)
 def test_products_match_schema_vocabulary(topic, doc_type, path, schema_products):
-    text = path.read_text(encoding="utf-8")
-    products = parse_frontmatter_list(text, "products")
+    products = frontmatter_list(path, "products")
     assert products, f"{rel(path)}: missing or empty products list"
     unknown = [p for p in products if p not in schema_products]
     assert not unknown, (
@@ -311,8 +258,7 @@ def test_products_match_schema_vocabulary(topic, doc_type, path, schema_products
 
 @pytest.mark.parametrize("topic,doc_type,path", ARTICLES, ids=ARTICLE_IDS)
 def test_topics_match_schema_vocabulary(topic, doc_type, path, schema_topics):
-    text = path.read_text(encoding="utf-8")
-    topics = parse_frontmatter_list(text, "topics")
+    topics = frontmatter_list(path, "topics")
     assert topics, f"{rel(path)}: missing or empty topics list"
     unknown = [t for t in topics if t not in schema_topics]
     assert not unknown, (
@@ -345,8 +291,7 @@ def test_first_product_matches_parent_topic_folder(topic, doc_type, path, schema
         f"{rel(path)}: topic folder '{topic}' has no matching Slug in "
         "docs/assistant/schema.md's Product tags table"
     )
-    text = path.read_text(encoding="utf-8")
-    products = parse_frontmatter_list(text, "products")
+    products = frontmatter_list(path, "products")
     assert products, f"{rel(path)}: missing or empty products list"
     assert products[0] == expected_product, (
         f"{rel(path)}: first products entry '{products[0]}' != expected "
@@ -370,8 +315,7 @@ def test_first_topic_matches_parent_topic_folder(topic, doc_type, path):
     also that product's slug. ``cross-platform`` and ``support`` are exempt
     (see EXEMPT_TOPIC_DIRS).
     """
-    text = path.read_text(encoding="utf-8")
-    topics = parse_frontmatter_list(text, "topics")
+    topics = frontmatter_list(path, "topics")
     assert topics, f"{rel(path)}: missing or empty topics list"
     assert topics[0] == topic, (
         f"{rel(path)}: first topics entry '{topics[0]}' != expected "
@@ -389,9 +333,8 @@ def test_all_products_have_matching_topic_slug(topic, doc_type, path, schema_pro
     list, so a page's full set of owning products is discoverable from
     `topics` alone.
     """
-    text = path.read_text(encoding="utf-8")
-    products = parse_frontmatter_list(text, "products")
-    topics = parse_frontmatter_list(text, "topics")
+    products = frontmatter_list(path, "products")
+    topics = frontmatter_list(path, "topics")
     assert products, f"{rel(path)}: missing or empty products list"
     assert topics, f"{rel(path)}: missing or empty topics list"
     missing = []
@@ -428,7 +371,7 @@ def test_slug_collisions_within_and_across_topics():
     for topic, doc_type, path in ARTICLES:
         if doc_type == "policy":
             continue
-        fm = parse_frontmatter(path.read_text(encoding="utf-8"))
+        fm = load_frontmatter(path)
         by_topic_type_slug[(topic, doc_type, fm.get("slug"))].append(path)
 
     same_topic_same_type = [
@@ -553,7 +496,7 @@ def test_dispatch_publication_status_matches_frontmatter(dispatch_rows):
         path_key = rel(path)
         if path_key not in row_status:
             continue  # already reported by test_dispatch_lists_every_topic_article_exactly_once
-        fm = parse_frontmatter(path.read_text(encoding="utf-8"))
+        fm = load_frontmatter(path)
         actual_status = fm.get("publication_status", "stub")
         if row_status[path_key] != actual_status:
             mismatches.append((path_key, row_status[path_key], actual_status))
@@ -0,0 +1,166 @@
+"""Pytest suite for utilities/akb-export-chunks.py.
+
+Uses a temp fixture tree (never the real docs/assistant/) to validate section
+splitting, chunk IDs and metadata, export diffs and the CLI.
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).parent / "akb-export-chunks.py"
+spec = importlib.util.spec_from_file_location("akb_export_chunks", MODULE_PATH)
+if spec is None or spec.loader is None:
+    raise ImportError(f"could not load module spec from {MODULE_PATH}")
+aec = importlib.util.module_from_spec(spec)
+sys.modules["akb_export_chunks"] = aec
+spec.loader.exec_module(aec)
+
+SECTIONS = ["Short Answer", "Significance", "Example"]
+
+
+def write_article(path: Path, title, status="draft", topics=(), bodies=None, lead=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    bodies = bodies or {}
+    topic_lines = "".join(f"    - {t}\n" for t in topics)
+    sections = "".join(f"## {name}\n\n{bodies.get(name, 'TODO')}\n\n" for name in SECTIONS)
+    path.write_text(
+        f"---\ntitle: {title}\ndoc_type: {path.parent.name}\ntopics:\n{topic_lines}"
+        f"products:\n    - AccessMap\npublication_status: {status}\n---\n\n"
+        f"<!-- @format -->\n\n# {title}\n\n{lead}{sections}",
+        encoding="utf-8")
+
+
+@pytest.fixture
+def assistant_dir(tmp_path):
+    root = tmp_path / "assistant"
+    write_article(root / "alpha" / "concept" / "curb-ramps.md", "What is a curb ramp?",
+                  "published", topics=["alpha", "curbs"],
+                  bodies={"Short Answer": "A ramp cut into the curb.",
+                          "Example": "See [crossings](crossings.md).\n\n### Detail\n\nMore."})
+    write_article(root / "alpha" / "workflow" / "map-a-ramp.md", "Map a curb ramp",
+                  topics=["alpha"], lead="Use the editor.\n\n",
+                  bodies={"Significance": "Ramps <!-- internal note -->matter."})
+    (root / "index.md").write_text("---\ntitle: AKB\n---\n\n# AKB\n\nNot an article.\n",
+                                   encoding="utf-8")
+    return root
+
+
+def test_split_sections_cuts_at_second_level_headings_outside_code():
+    text = ("---\ntitle: T\n---\n\n<!-- @format -->\n\n# Title\n\nLead.\n\n"
+            "## One\n\n```md\n## Not a heading\n```\n\n### Sub\n\nText.\n\n## Two\n")
+
+    assert aec.split_sections(text) == [
+        (1, "Title", "Lead."),
+        (2, "One", "```md\n## Not a heading\n```\n\n### Sub\n\nText."),
+        (2, "Two", ""),
+    ]
+
+
+def _slug(text):
+    return text.lower().replace(" ", "-")
+
+
+def test_section_anchors_number_repeats_like_toc():
+    text = "Lead.\n\n## Example\n\nA.\n\n## Example\n\nB.\n\n## Short Answer\n"
+
+    assert aec.section_anchors(text, _slug) == ["", "example", "example_1", "short-answer"]
+
+
+def test_section_anchors_count_headings_of_every_level():
+    text = ("# Title\n\n### Example\n\n## Example\n\n### Note\n\n    ## Note\n\n"
+            "```\n## Note\n```\n\n## Note\n\n## Custom {#my-id}\n\n## My Id\n")
+
+    assert [heading for _level, heading, _body in aec.split_sections(text)] == [
+        "Title", "Example", "Note", "Custom", "My Id"]
+    assert aec.section_anchors(text, _slug) == [
+        "title", "example_1", "note_2", "my-id", "my-id_1"]
+    build_site = aec._import_utility("build-site.py", "build_site")
+    assert set(aec.section_anchors(text, build_site.heading_slug)) <= set(
+        build_site.heading_anchors(text))
+
+
+def test_build_chunks_skips_placeholders_and_carries_metadata(assistant_dir):
+    chunks = aec.build_chunks(assistant_dir)
+
+    assert [chunk["id"] for chunk in chunks] == [
+        "assistant/alpha/concept/curb-ramps.md#short-answer",
+        "assistant/alpha/concept/curb-ramps.md#example",
+        "assistant/alpha/workflow/map-a-ramp.md#map-a-curb-ramp",
+        "assistant/alpha/workflow/map-a-ramp.md#significance",
+    ]
+    first = chunks[0]
+    assert first["section"] == "Short Answer" and first["level"] == 2
+    assert first["ordinal"] == 1 and first["status"] == "published"
+    assert first["topics"] == ["alpha", "curbs"] and first["products"] == ["AccessMap"]
+    assert first["tokens"] == aec.estimate_tokens("A ramp cut into the curb.") == 7
+    assert chunks[1]["text"].endswith("### Detail\n\nMore.")
+    assert chunks[2]["level"] == 1 and chunks[2]["text"] == "Use the editor."
+    assert chunks[3]["text"] == "Ramps matter."
+    assert aec.render_chunks(chunks) == aec.render_chunks(aec.build_chunks(assistant_dir))
+
+
+def test_build_chunks_uses_given_texts_instead_of_disk(assistant_dir):
+    rel = "alpha/concept/curb-ramps.md"
+    text = (assistant_dir / rel).read_text(encoding="utf-8").replace("curb.", "kerb.")
+
+    chunks = aec.build_chunks(assistant_dir, texts={rel: text})
+
+    assert chunks[0]["text"] == "A ramp cut into the kerb."
+
+
+def test_build_chunks_exports_pages_with_malformed_frontmatter(assistant_dir, capsys):
+    page = assistant_dir / "alpha" / "concept" / "curb-ramps.md"
+    page.write_text(page.read_text(encoding="utf-8").replace(
+        "products:\n", "products:\n  stray: indent\n    - bad\n"), encoding="utf-8")
+
+    chunks = aec.build_chunks(assistant_dir)
+
+    assert len(chunks) == 4 and chunks[0]["topics"] == chunks[0]["products"] == []
+    assert "warning: assistant/alpha/concept/curb-ramps.md: malformed frontmatter" in \
+        capsys.readouterr().err
+
+
+def test_diff_chunks_separates_text_and_metadata_changes(assistant_dir):
+    before = aec.build_chunks(assistant_dir)
+    write_article(assistant_dir / "alpha" / "concept" / "curb-ramps.md",
+                  "What is a curb ramp?", "archived", topics=["alpha", "curbs"],
+                  bodies={"Short Answer": "A ramp cut into the curb.",
+                          "Significance": "Ramps help.",
+                          "Example": "Changed."})
+    (assistant_dir / "alpha" / "workflow" / "map-a-ramp.md").unlink()
+
+    diff = aec.diff_chunks(before, aec.build_chunks(assistant_dir))
+
+    page = "assistant/alpha/concept/curb-ramps.md"
+    assert diff == {
+        "added": [f"{page}#significance"],
+        "changed": [f"{page}#example"],
+        "updated": [f"{page}#short-answer"],
+        "removed": ["assistant/alpha/workflow/map-a-ramp.md#map-a-curb-ramp",
+                    "assistant/alpha/workflow/map-a-ramp.md#significance"],
+        "unchanged": 0,
+    }
+
+
+def test_main_writes_and_compares_exports(assistant_dir, tmp_path, capsys):
+    first = tmp_path / "first.ndjson"
+    assert aec.main(["--assistant-dir", str(assistant_dir), "--output", str(first)]) == 0
+    assert "Exported 4 chunks from 2 articles" in capsys.readouterr().out
+    assert len(aec.load_chunks(first)) == 4
+
+    assert aec.main(["--assistant-dir", str(assistant_dir), "--previous", str(first),
+                     "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)["unchanged"] == 4
+
+    assert aec.main(["--assistant-dir", str(assistant_dir)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [c["id"] for c in aec.load_chunks(first)]
+
+
+def test_main_rejects_missing_assistant_dir(tmp_path, capsys):
+    assert aec.main(["--assistant-dir", str(tmp_path / "missing")]) == 1
+    assert "not found" in capsys.readouterr().err
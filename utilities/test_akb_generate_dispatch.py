@@ -4,7 +4,9 @@ Uses a temp fixture tree (never the real docs/assistant/) to validate the
 dispatch generator's structure, status reporting, and edge-case handling.
 """
 
+import hashlib
 import importlib.util
+import json
 import sys
 from pathlib import Path
 
@@ -174,3 +176,161 @@ def test_no_topics_produces_empty_registry(tmp_path):
     content = gad.build_dispatch(root, today="2026-07-06")
     registry = content.split("## Registry", 1)[1].strip()
     assert registry == ""
+
+
+def test_preparsed_frontmatter_is_used_instead_of_reading(assistant_dir):
+    frontmatter = {
+        "alpha/index.md": {"title": "Alpha From Index"},
+        "alpha/concept/why-alpha.md": {"publication_status": "draft"},
+    }
+    content = gad.build_dispatch(assistant_dir, today="2026-07-06",
+                                 frontmatter=frontmatter)
+    assert "## Alpha From Index" in content
+    assert "| `why-alpha.md` | draft |" in content
+    # Pages missing from the mapping are still read from disk.
+    assert "| `what-is-alpha.md` | published |" in content
+
+
+def test_registry_records_every_article(assistant_dir):
+    topics = gad.scan_topics(assistant_dir)
+    registry = gad.build_registry(assistant_dir, topics)
+
+    assert registry["version"] == gad.REGISTRY_VERSION
+    assert [a["path"] for a in registry["articles"]] == [
+        "assistant/alpha/concept/what-is-alpha.md",
+        "assistant/alpha/concept/why-alpha.md",
+        "assistant/beta/workflow/do-a-thing.md",
+    ]
+    article = registry["articles"][0]
+    data = (assistant_dir / "alpha" / "concept" / "what-is-alpha.md").read_bytes()
+    assert article == {
+        "path": "assistant/alpha/concept/what-is-alpha.md",
+        "topic": "alpha",
+        "title": "What is Alpha?",
+        "doc_type": "concept",
+        "status": "published",
+        "authority": "official",
+        "retrieval_priority": None,
+        "last_reviewed": None,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": len(data),
+    }
+
+
+def test_write_dispatch_writes_json_and_ndjson_registries(assistant_dir):
+    gad.write_dispatch(assistant_dir, today="2026-07-06", registry=True, ndjson=True)
+
+    registry = json.loads((assistant_dir / "dispatch.json").read_text(encoding="utf-8"))
+    lines = (assistant_dir / "dispatch.ndjson").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == registry["articles"]
+    assert {a["status"] for a in registry["articles"]} == {"published", "stub", "draft"}
+
+
+def test_write_dispatch_writes_no_registry_by_default(assistant_dir):
+    gad.write_dispatch(assistant_dir, today="2026-07-06")
+
+    assert not (assistant_dir / "dispatch.json").exists()
+
+
+def test_cache_only_reparses_changed_files(assistant_dir, tmp_path, monkeypatch):
+    cache_path = tmp_path / "cache.json"
+    parsed = []
+    original_parse = gad.parse_frontmatter
+
+    def counting_parse(text):
+        parsed.append(text)
+        return original_parse(text)
+
+    monkeypatch.setattr(gad, "parse_frontmatter", counting_parse)
+    cache = gad.load_cache(assistant_dir, cache_path)
+    first = gad.build_dispatch(assistant_dir, today="2026-07-06", cache=cache)
+    gad.save_cache(cache, assistant_dir, cache_path)
+    assert len(parsed) == 4  # alpha/index.md plus three articles
+
+    parsed.clear()
+    write_article(assistant_dir / "beta" / "workflow" / "do-a-thing.md",
+                  "Do A Thing", "published", "provisional", body="Longer body text.")
+    cache = gad.load_cache(assistant_dir, cache_path)
+    second = gad.build_dispatch(assistant_dir, today="2026-07-06", cache=cache)
+
+    assert len(parsed) == 1 and "title: Do A Thing" in parsed[0]
+    assert "| `do-a-thing.md` | draft |" in first
+    assert "| `do-a-thing.md` | published |" in second
+
+
+def test_cache_is_dropped_for_another_assistant_dir(assistant_dir, tmp_path):
+    cache_path = tmp_path / "cache.json"
+    cache = gad.load_cache(assistant_dir, cache_path)
+    gad.scan_topics(assistant_dir, cache=cache)
+    gad.save_cache(cache, assistant_dir, cache_path)
+
+    assert "alpha/concept/why-alpha.md" in gad.load_cache(assistant_dir, cache_path)
+    assert gad.load_cache(tmp_path, cache_path) == {}
+
+
+def test_registry_reuses_cached_hashes(assistant_dir, tmp_path):
+    cache = {}
+    topics = gad.scan_topics(assistant_dir, cache=cache)
+    registry = gad.build_registry(assistant_dir, topics, cache)
+
+    assert cache["alpha/concept/why-alpha.md"]["sha256"] == registry["articles"][1]["sha256"]
+    assert gad.build_registry(assistant_dir, topics, cache) == registry
+
+
+def test_check_reports_stale_dispatch_without_writing(assistant_dir, tmp_path, capsys):
+    cache_args = ["--assistant-dir", str(assistant_dir), "--cache", str(tmp_path / "c.json")]
+    assert gad.main(cache_args + ["--check"]) == 1  # no dispatch.md yet
+
+    gad.write_dispatch(assistant_dir, today="2020-01-01")
+    assert gad.main(cache_args + ["--check"]) == 0  # an old date alone is not stale
+
+    write_article(assistant_dir / "alpha" / "concept" / "new-page.md", "New", "stub")
+    before = (assistant_dir / "dispatch.md").read_bytes()
+    assert gad.main(cache_args + ["--check"]) == 1
+    assert (assistant_dir / "dispatch.md").read_bytes() == before
+    assert "is out of date" in capsys.readouterr().err
+    assert not (tmp_path / "c.json").exists()  # --check never writes the cache
+
+
+def test_last_reviewed_from_newest_article(assistant_dir):
+    for name, reviewed in [("what-is-alpha.md", "2026-05-01"), ("why-alpha.md", "2026-06-15")]:
+        page = assistant_dir / "alpha" / "concept" / name
+        page.write_text(page.read_text(encoding="utf-8").replace(
+            "---\n\n", f"last_reviewed: {reviewed}\n---\n\n", 1), encoding="utf-8")
+
+    content = gad.build_dispatch(assistant_dir, last_reviewed="articles")
+
+    assert "last_reviewed: 2026-06-15" in content
+
+
+def test_preserve_keeps_date_and_file_until_registry_changes(assistant_dir):
+    import os
+
+    output_path = gad.write_dispatch(assistant_dir, today="2020-01-01")
+    os.utime(output_path, ns=(1_000_000_000, 1_000_000_000))
+
+    gad.write_dispatch(assistant_dir, last_reviewed="preserve")
+    assert output_path.stat().st_mtime_ns == 1_000_000_000
+    assert "last_reviewed: 2020-01-01" in output_path.read_text(encoding="utf-8")
+
+    write_article(assistant_dir / "alpha" / "concept" / "new-page.md", "New", "stub")
+    gad.write_dispatch(assistant_dir, last_reviewed="preserve")
+    content = output_path.read_text(encoding="utf-8")
+    assert "last_reviewed: 2020-01-01" not in content
+    assert "`new-page.md`" in content
+
+
+def test_unknown_last_reviewed_source_is_rejected(assistant_dir):
+    with pytest.raises(ValueError):
+        gad.build_dispatch(assistant_dir, last_reviewed="yesterday")
+
+
+def test_scan_topics_parallel_matches_serial(assistant_dir):
+    for name in ("gamma", "delta", "epsilon"):
+        write_article(assistant_dir / name / "concept" / f"{name}.md", name, "draft")
+
+    parallel = gad.scan_topics(assistant_dir, jobs=4)
+
+    assert parallel == gad.scan_topics(assistant_dir, jobs=1)
+    assert [topic["name"] for topic in parallel] == [
+        "alpha", "beta", "delta", "epsilon", "gamma"]
@@ -0,0 +1,56 @@
+"""Pytest suite for utilities/bench-build-site.py.
+
+Only checks the harness itself on tiny trees; the benchmarks are run by hand
+or from CI, never as part of this suite.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).parent / "bench-build-site.py"
+spec = importlib.util.spec_from_file_location("bench_build_site", MODULE_PATH)
+bench = importlib.util.module_from_spec(spec)
+sys.modules["bench_build_site"] = bench
+spec.loader.exec_module(bench)
+
+
+def test_generate_tree_is_deterministic_and_passes_validation(tmp_path):
+    first, second = tmp_path / "a", tmp_path / "b"
+
+    pages = bench.generate_tree(first, 120, seed=3)
+    bench.generate_tree(second, 120, seed=3)
+
+    assert pages == len(list(first.rglob("*.md")))
+    assert sorted(p.relative_to(first) for p in first.rglob("*")) == sorted(
+        p.relative_to(second) for p in second.rglob("*"))
+    build_site = bench._import_build_site()
+    entries = build_site.scan_source_tree(first)
+    assert build_site.find_broken_links(entries) == []
+    assert any("publication_status: draft" in p.read_text(encoding="utf-8")
+               for p in (first / "assistant").rglob("article-*.md"))
+    assert any("<img-comparison-slider>" in p.read_text(encoding="utf-8")
+               for p in first.rglob("guide-*.md"))
+
+
+def test_benchmark_sizes_times_every_stage(tmp_path):
+    results = bench.benchmark_sizes([60], tmp_path, repeat=1, jobs=1)
+
+    stages = results["results"]["60"]
+    assert list(stages) == list(bench.BENCHMARKS)
+    assert all(timing["seconds"] > 0 for timing in stages.values())
+    assert "60  prepare" in bench.format_results(results)
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = {"results": {"1000": {"prepare": {"seconds": 1.0},
+                                     "strip_agent_docs": {"seconds": 1.0}}}}
+    results = {"results": {
+        "1000": {"prepare": {"seconds": 1.2}, "strip_agent_docs": {"seconds": 1.5},
+                 "overlay_agent_layer": {"seconds": 9.0}},
+        "5000": {"prepare": {"seconds": 9.0}},
+    }}
+
+    assert bench.compare(results, baseline, threshold=0.25) == [
+        {"size": "1000", "stage": "strip_agent_docs", "baseline": 1.0,
+         "current": 1.5, "ratio": 1.5}]
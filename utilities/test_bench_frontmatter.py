@@ -0,0 +1,32 @@
+"""Pytest suite for utilities/bench-frontmatter.py.
+
+Only checks the harness itself on a tiny tree; the benchmark is run by hand
+or from CI, never as part of this suite.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+MODULE_PATH = Path(__file__).parent / "bench-frontmatter.py"
+spec = importlib.util.spec_from_file_location("bench_frontmatter", MODULE_PATH)
+bench = importlib.util.module_from_spec(spec)
+sys.modules["bench_frontmatter"] = bench
+spec.loader.exec_module(bench)
+
+
+def test_benchmark_times_every_parser(tmp_path, capsys):
+    (tmp_path / "a.md").write_text("---\ntitle: A\ntopics:\n    - x\n---\n\n# A\n",
+                                   encoding="utf-8")
+    (tmp_path / "bad.md").write_text("---\ntitle: A\n  oops: 1\n---\n", encoding="utf-8")
+    (tmp_path / "none.md").write_text("# No frontmatter\n", encoding="utf-8")
+
+    headers = bench.collect_headers(tmp_path)
+    results = bench.run_benchmarks(headers, repeat=1)
+
+    assert [path.name for path, _ in headers] == (
+        ["a.md"] if bench.yaml is not None else ["a.md", "bad.md"])
+    assert {"flat", "nested", "load_cached"} <= set(results)
+    assert all(seconds > 0 for seconds in results.values())
+    assert bench.main(["--docs-dir", str(tmp_path), "--repeat", "1"]) in (0, 1)
+    assert "frontmatter blocks" in capsys.readouterr().out
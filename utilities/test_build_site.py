@@ -7,6 +7,10 @@ for unit tests).
 """
 
 import importlib.util
+import json
+import os
+import random
+import re
 import sys
 from pathlib import Path
 
@@ -36,6 +40,8 @@ def fixture_docs(tmp_path):
     # Non-assistant page, never touched by the filter.
     write_page(docs / "index.md",
                body="# Welcome\n\n![Logo](resources/logo.png)\n")
+    (docs / "resources").mkdir()
+    (docs / "resources" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n")
 
     # Assistant top-level peers.
     write_page(docs / "assistant" / "index.md",
@@ -159,6 +165,81 @@ def test_strip_removes_images_pragma_and_slider(tmp_path):
     assert "This should remain untouched." in stripped
 
 
+@pytest.mark.parametrize("text, expected", [
+    ("![a](b.png)\nText\n", "Text\n"),
+    ("Text\n  ![a](b.png)  \nMore\n", "Text\nMore\n"),
+    ("Text\n![a](b.png)", "Text\n"),
+    ("Inline ![a](b.png) image\n", "Inline  image\n"),
+    ("<!-- @format -->\n# Title\n", "# Title\n"),
+    ("Text <!-- @format -->\n", "Text <!-- @format -->\n"),
+    ("![a](b.png) <!-- @format -->\nText\n", "Text\n"),
+    ("A\n\n\n\nB\n", "A\n\nB\n"),
+    ("A\n\n![a](b.png)\n\nB\n", "A\n\nB\n"),
+    ("A\n\n<img-comparison-slider>\n<img src=\"a\">\n</img-comparison-slider>\n\nB\n",
+     "A\n\nB\n"),
+    ("![a](b)![c](d) text\n", " text\n"),
+    # Whitespace left behind a removed image or pragma is removed with the
+    # line, as the original substitutions did.
+    ("Text\n![a](b.png)\t \nMore\n", "Text\nMore\n"),
+    ("<!-- @format -->  \t\n# T\n", "# T\n"),
+    ("<!-- @format -->![a](b.png)\t", ""),
+    ("![a](b.png)<!-- @format -->\t\nText\n", "Text\n"),
+    ("x\n<!-- @format -->", "x\n"),
+    ("![a](b.png)\n<img-comparison-slider></img-comparison-slider>\n\n\n\nB\n",
+     "\n\nB\n"),
+    ("", ""),
+])
+def test_strip_markdown_text_cases(text, expected):
+    assert bs.strip_markdown_text(text) == expected
+
+
+def test_strip_markdown_text_keeps_fenced_code():
+    fenced = ("```markdown\n"
+              "<!-- @format -->\n"
+              "![a](b.png)\n\n\n\n"
+              "<img-comparison-slider></img-comparison-slider>\n"
+              "```\n")
+    text = "Intro ![a](b.png)\n\n" + fenced + "\n~~~\n![c](d)\n~~~\n![e](f)\nEnd\n"
+
+    assert bs.strip_markdown_text(text) == (
+        "Intro \n\n" + fenced + "\n~~~\n![c](d)\n~~~\nEnd\n")
+    # An unclosed fence runs to the end of the text.
+    assert bs.strip_markdown_text("```\n![a](b)\n") == "```\n![a](b)\n"
+
+
+def test_strip_markdown_text_inline_code_does_not_open_a_fence():
+    text = "```x``` text\n![a](b.png)\n````y```` more\n\n\n\nEnd ![c](d)\n"
+
+    assert bs.strip_markdown_text(text) == "```x``` text\n````y```` more\n\nEnd \n"
+    # Tilde fences may have backticks in their info string.
+    fenced = "~~~ `lang`\n![a](b.png)\n~~~\n"
+    assert bs.strip_markdown_text(fenced + "![c](d)\n") == fenced
+
+
+def test_strip_markdown_text_matches_regex_chain():
+    # The substitutions strip_markdown_text() replaced, applied in order.
+    chain = [
+        (re.compile(r"(?s)<img-comparison-slider[^>]*>.*?</img-comparison-slider>\n?"), ""),
+        (re.compile(r"(?m)^[ \t]*!\[[^\]]*\]\([^)]*\)[ \t]*\n?"), ""),
+        (re.compile(r"!\[[^\]]*\]\([^)]*\)"), ""),
+        (re.compile(r"(?m)^<!--\s*@format\s*-->[ \t]*\n?"), ""),
+        (re.compile(r"\n{3,}"), "\n\n"),
+    ]
+    pieces = ["Text", "x", " ", "  ", "\t", "\n", "\n\n\n", "![a](b.png)",
+              "  ![c](d)  \n", "<!-- @format -->\n", "<!-- @format -->",
+              "<!--", "-->", " @format ", "<!-- note -->", "!", "[x]", "[", "]",
+              "(", ")", "<img-comparison-slider>", "</img-comparison-slider>",
+              "<img-comparison-slider>\n<img src=\"a\">\n</img-comparison-slider>\n"]
+    rng = random.Random(11)
+    for _ in range(5000):
+        text = rng.choice(["", "\n"]).join(
+            rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        expected = text
+        for pattern, replacement in chain:
+            expected = pattern.sub(replacement, expected)
+        assert bs.strip_markdown_text(text) == expected, repr(text)
+
+
 def test_strip_agent_docs_applies_to_all_files(tmp_path, fixture_docs):
     agent_dir = tmp_path / "agent-docs"
     bs.copy_layers(fixture_docs, tmp_path / "human-docs", agent_dir)
@@ -198,7 +279,7 @@ def test_overlay_agent_layer_places_files_at_expected_paths(tmp_path, fixture_do
     write_page(agent_dir / "accessmap" / "index.md", body="# AccessMap\n")
     site_dir.mkdir()
 
-    copied = bs.overlay_agent_layer(agent_dir, site_dir)
+    copied = bs.overlay_agent_layer(agent_dir, site_dir)["written"]
 
     assert "assistant/support/index.md" in copied
     assert (site_dir / "assistant" / "support" / "index.md").exists()
@@ -209,6 +290,33 @@ def test_overlay_agent_layer_places_files_at_expected_paths(tmp_path, fixture_do
     assert (site_dir / "accessmap" / "index.md").exists()
 
 
+
+def test_overlay_agent_layer_skips_unchanged_and_removes_orphans(tmp_path, fixture_docs):
+    agent_dir = tmp_path / "agent-docs"
+    site_dir = tmp_path / "site"
+    bs.copy_layers(fixture_docs, tmp_path / "human-docs", agent_dir)
+    first = bs.overlay_agent_layer(agent_dir, site_dir)
+    kept = site_dir / "assistant" / "schema.md"
+    os.utime(kept, ns=(1_000_000_000, 1_000_000_000))
+    (site_dir / "index.html").write_text("<html></html>\n", encoding="utf-8")
+
+    # Same size, different content; and a page whose source disappeared.
+    index = agent_dir / "index.md"
+    index.write_text(index.read_text(encoding="utf-8").replace("W", "w"),
+                     encoding="utf-8")
+    (agent_dir / "assistant" / "support" / "index.md").unlink()
+    (agent_dir / "assistant" / "support").rmdir()
+    second = bs.overlay_agent_layer(agent_dir, site_dir)
+
+    assert second["written"] == ["index.md"]
+    assert second["removed"] == ["assistant/support/index.md"]
+    assert len(second["unchanged"]) == len(first["written"]) - 2
+    assert kept.stat().st_mtime_ns == 1_000_000_000
+    assert (site_dir / "index.md").read_bytes() == index.read_bytes()
+    assert not (site_dir / "assistant" / "support").exists()
+    assert (site_dir / "index.html").exists()
+
+
 def test_clean_generated_removes_existing_artifacts(tmp_path):
     human_dir = tmp_path / "human-docs"
     agent_dir = tmp_path / "agent-docs"
@@ -264,7 +372,7 @@ def test_prepare_raises_on_broken_link(tmp_path, fixture_docs):
 
 
 def test_main_handles_keyboard_interrupt_during_prepare(monkeypatch, capsys):
-    def interrupt():
+    def interrupt(**kwargs):
         raise KeyboardInterrupt
 
     monkeypatch.setattr(bs, "prepare", interrupt)
@@ -277,8 +385,666 @@ def test_main_handles_keyboard_interrupt_during_serve(monkeypatch, capsys):
     def interrupt():
         raise KeyboardInterrupt
 
-    monkeypatch.setattr(bs, "prepare", lambda: None)
+    monkeypatch.setattr(bs, "prepare", lambda **kwargs: None)
     monkeypatch.setattr(bs, "run_zensical_serve", interrupt)
 
     assert bs.main(["--serve"]) == 130
     assert capsys.readouterr().err == "\nOperation canceled.\n"
+
+
+def _prepare_args(tmp_path, docs):
+    source_config = tmp_path / "zensical.toml"
+    if not source_config.exists():
+        source_config.write_text(
+            '[project]\nsite_name = "Test Site"\n', encoding="utf-8")
+    return (docs, tmp_path / "human-docs", tmp_path / "agent-docs",
+            source_config, tmp_path / "zensical.build.toml")
+
+
+def test_prepare_records_manifest(tmp_path, fixture_docs):
+    bs.prepare(*_prepare_args(tmp_path, fixture_docs))
+
+    manifest = bs.read_manifest(tmp_path / ".build-cache" / "manifest.json")
+    entry = manifest["files"]["assistant/alpha/concept/stub-page.md"]
+    assert entry["status"] == "stub"
+    assert len(entry["sha256"]) == 64
+    assert "index.md" in manifest["files"]
+
+
+def test_prepare_incremental_without_manifest_runs_full_prep(tmp_path, fixture_docs):
+    summary = bs.prepare_incremental(*_prepare_args(tmp_path, fixture_docs))
+
+    assert summary["mode"] == "full"
+    assert (tmp_path / "agent-docs" / "assistant" / "dispatch.md").exists()
+    assert (tmp_path / ".build-cache" / "manifest.json").exists()
+
+
+def test_prepare_incremental_updates_only_changed_files(tmp_path, fixture_docs):
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+    human_dir, agent_dir = args[1], args[2]
+    untouched = agent_dir / "assistant" / "schema.md"
+    untouched_mtime = untouched.stat().st_mtime_ns
+
+    write_page(fixture_docs / "index.md",
+               body="# Welcome back\n\n![Logo](resources/logo.png)\n")
+    (fixture_docs / "assistant" / "alpha" / "concept" / "stub-page.md").unlink()
+
+    summary = bs.prepare_incremental(*args)
+
+    assert summary["mode"] == "incremental"
+    assert summary["changed"] == ["index.md"]
+    assert summary["removed"] == ["assistant/alpha/concept/stub-page.md"]
+    assert "Welcome back" in (human_dir / "index.md").read_text(encoding="utf-8")
+    agent_index = (agent_dir / "index.md").read_text(encoding="utf-8")
+    assert "Welcome back" in agent_index
+    assert "![Logo]" not in agent_index
+    assert not (agent_dir / "assistant" / "alpha" /
+                "concept" / "stub-page.md").exists()
+    dispatch = (agent_dir / "assistant" / "dispatch.md").read_text(encoding="utf-8")
+    assert "`stub-page.md`" not in dispatch
+    assert untouched.stat().st_mtime_ns == untouched_mtime
+
+
+def test_prepare_incremental_refilters_status_changes(tmp_path, fixture_docs):
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+    human_dir = args[1]
+    stub = fixture_docs / "assistant" / "alpha" / "concept" / "stub-page.md"
+
+    write_page(stub, publication_status="published")
+    bs.prepare_incremental(*args)
+    assert (human_dir / "assistant" / "alpha" / "concept" / "stub-page.md").exists()
+
+    write_page(stub, publication_status="draft")
+    bs.prepare_incremental(*args)
+    assert not (human_dir / "assistant" / "alpha" /
+                "concept" / "stub-page.md").exists()
+
+
+def test_prepare_incremental_detects_links_broken_by_unpublishing(tmp_path, fixture_docs):
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+    manifest_path = tmp_path / ".build-cache" / "manifest.json"
+
+    write_page(fixture_docs / "assistant" / "alpha" / "concept" / "published-page.md",
+               publication_status="draft")
+
+    with pytest.raises(bs.HumanDocsValidationError) as excinfo:
+        bs.prepare_incremental(*args)
+
+    assert excinfo.value.errors == [
+        ("assistant/alpha/index.md", "concept/published-page.md")]
+    # A failed run must not leave a manifest that would hide the error.
+    assert not manifest_path.exists()
+
+
+@pytest.mark.parametrize("link_mode", bs.LINK_MODES)
+def test_copy_layers_link_modes_never_write_through_to_source(tmp_path, fixture_docs, link_mode):
+    original = {p: p.read_bytes() for p in fixture_docs.rglob("*.md")}
+    agent_dir = tmp_path / "agent-docs"
+
+    bs.copy_layers(fixture_docs, tmp_path / "human-docs", agent_dir, link_mode)
+    bs.generate_dispatch(agent_dir)
+    bs.strip_agent_docs(agent_dir)
+
+    assert {p: p.read_bytes() for p in fixture_docs.rglob("*.md")} == original
+    assert "@format" not in (agent_dir / "assistant" /
+                             "index.md").read_text(encoding="utf-8")
+
+
+def test_materialize_file_hardlinks_and_replaces_existing(tmp_path):
+    src = tmp_path / "src.png"
+    src.write_bytes(b"png")
+    dest = tmp_path / "out" / "src.png"
+
+    assert bs.materialize_file(src, dest, "hardlink") == "hardlink"
+    assert dest.stat().st_ino == src.stat().st_ino
+    # Re-materializing over an existing hardlink to the same file must work.
+    assert bs.materialize_file(src, dest, "copy") == "copy"
+    assert dest.stat().st_ino != src.stat().st_ino
+    assert dest.read_bytes() == b"png"
+
+
+def test_write_output_text_breaks_hardlinks(tmp_path):
+    src = tmp_path / "page.md"
+    src.write_text("original\n", encoding="utf-8")
+    dest = tmp_path / "agent" / "page.md"
+    bs.materialize_file(src, dest, "hardlink")
+
+    bs.write_output_text(dest, "stripped\n")
+
+    assert src.read_text(encoding="utf-8") == "original\n"
+    assert dest.read_text(encoding="utf-8") == "stripped\n"
+
+
+def test_scan_documents_parses_frontmatter_and_links(fixture_docs):
+    documents = bs.scan_documents(fixture_docs)
+
+    alpha = documents["assistant/alpha/index.md"]
+    assert alpha["frontmatter"]["publication_status"] == "published"
+    assert alpha["links"] == ["concept/published-page.md"]
+    assert "assistant/support/index.md" in documents
+
+
+def test_prepare_reads_each_markdown_file_once(tmp_path, fixture_docs, monkeypatch):
+    reads = []
+    read_document = bs.read_document
+    original_read_text = Path.read_text
+
+    def counting_read_document(path):
+        reads.append(path)
+        return read_document(path)
+
+    def guarded_read_text(self, *args, **kwargs):
+        assert self.suffix != ".md", f"re-read outside the index: {self}"
+        return original_read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(bs, "read_document", counting_read_document)
+    monkeypatch.setattr(Path, "read_text", guarded_read_text)
+
+    summary = bs.prepare(*_prepare_args(tmp_path, fixture_docs))
+
+    assert sorted(reads) == sorted(fixture_docs.rglob("*.md"))
+    assert "assistant/dispatch.md" in summary["pages"]
+
+
+def test_prepare_matches_unindexed_stages(tmp_path, fixture_docs):
+    (tmp_path / "indexed").mkdir()
+    args = _prepare_args(tmp_path / "indexed", fixture_docs)
+    bs.prepare(*args)
+
+    human_dir = tmp_path / "plain" / "human-docs"
+    agent_dir = tmp_path / "plain" / "agent-docs"
+    bs.copy_layers(fixture_docs, human_dir, agent_dir, "copy")
+    bs.filter_human_docs(human_dir)
+    bs.generate_dispatch(agent_dir)
+    bs.strip_agent_docs(agent_dir)
+    bs.generate_search_index(agent_dir)
+    bs.generate_section_chunks(agent_dir)
+
+    def snapshot(root):
+        return {p.relative_to(root).as_posix(): p.read_bytes()
+                for p in root.rglob("*") if p.is_file()}
+
+    assert snapshot(args[1]) == snapshot(human_dir)
+    assert snapshot(args[2]) == snapshot(agent_dir)
+
+
+def test_strip_agent_docs_parallel_matches_serial(tmp_path, fixture_docs, monkeypatch):
+    documents = bs.scan_documents(fixture_docs)
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    bs.copy_layers(fixture_docs, tmp_path / "h1", serial_dir, "copy")
+    bs.copy_layers(fixture_docs, tmp_path / "h2", parallel_dir, "copy")
+    monkeypatch.setattr(bs, "PARALLEL_STRIP_MIN_FILES", 1)
+
+    serial = bs.strip_agent_docs(serial_dir, documents, jobs=1)
+    parallel = bs.strip_agent_docs(parallel_dir, documents, jobs=2)
+
+    assert serial == parallel == ["assistant/index.md", "index.md"]
+    for rel in documents:
+        assert (serial_dir / rel).read_bytes() == (parallel_dir / rel).read_bytes()
+
+
+def test_main_rejects_non_positive_jobs(capsys):
+    assert bs.main(["--jobs", "0"]) == 1
+    assert "--jobs must be at least 1" in capsys.readouterr().err
+
+
+def test_prepare_incremental_regenerates_dispatch_only_for_registry_changes(tmp_path, fixture_docs):
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+    page = fixture_docs / "assistant" / "alpha" / "concept" / "published-page.md"
+
+    write_page(page, publication_status="published", body="# Title\n\nNew body.\n")
+    assert bs.prepare_incremental(*args)["dispatch_regenerated"] is False
+
+    write_page(page, publication_status="draft", body="# Title\n\nNew body.\n")
+    (fixture_docs / "assistant" / "alpha" / "index.md").write_text(
+        "---\ntitle: Alpha\npublication_status: published\n---\n\n# Alpha\n",
+        encoding="utf-8")
+    assert bs.prepare_incremental(*args)["dispatch_regenerated"] is True
+    dispatch = (args[2] / "assistant" / "dispatch.md").read_text(encoding="utf-8")
+    assert "| `published-page.md` | draft |" in dispatch
+
+
+def test_prepare_incremental_redates_dispatch_like_a_full_prep(tmp_path, fixture_docs):
+    args = _prepare_args(tmp_path, fixture_docs)
+    page = fixture_docs / "assistant" / "alpha" / "concept" / "published-page.md"
+    text = page.read_text(encoding="utf-8")
+    page.write_text(text.replace("---\n", "---\nlast_reviewed: 2026-01-01\n", 1),
+                    encoding="utf-8")
+    bs.prepare(*args)
+    dispatch = args[2] / "assistant" / "dispatch.md"
+    assert "last_reviewed: 2026-01-01" in dispatch.read_text(encoding="utf-8")
+
+    page.write_text(page.read_text(encoding="utf-8").replace(
+        "last_reviewed: 2026-01-01", "last_reviewed: 2026-09-09"), encoding="utf-8")
+    assert bs.prepare_incremental(*args)["dispatch_regenerated"] is True
+    incremental = dispatch.read_text(encoding="utf-8")
+    assert "last_reviewed: 2026-09-09" in incremental
+
+    bs.prepare(*args)
+    assert dispatch.read_text(encoding="utf-8") == incremental
+
+
+def test_prepare_incremental_refreshes_registry_hashes_for_body_edits(tmp_path, fixture_docs):
+    args = _prepare_args(tmp_path, fixture_docs)
+    summary = bs.prepare(*args)
+    registry_path = args[2] / "assistant" / "dispatch.json"
+    assert "assistant/dispatch.json" in summary["pages"]
+    page = fixture_docs / "assistant" / "alpha" / "concept" / "published-page.md"
+
+    (fixture_docs / "resources" / "d.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    write_page(page, publication_status="published",
+               body="# Title\n\n![Diagram](../../../resources/d.png)\n\nNew body.\n")
+    assert bs.prepare_incremental(*args)["dispatch_regenerated"] is False
+
+    registry = json.loads(registry_path.read_text(encoding="utf-8"))
+    article = next(a for a in registry["articles"]
+                   if a["path"] == "assistant/alpha/concept/published-page.md")
+    served = args[2] / "assistant" / "alpha" / "concept" / "published-page.md"
+    assert article["size"] == served.stat().st_size
+    assert "![Diagram]" not in served.read_text(encoding="utf-8")
+    assert (args[2] / "assistant" / "dispatch.ndjson").exists()
+
+
+def test_prepare_writes_search_index_and_refreshes_it_incrementally(tmp_path, fixture_docs):
+    args = _prepare_args(tmp_path, fixture_docs)
+    summary = bs.prepare(*args)
+    index_path = args[2] / "assistant" / "search-index.json"
+    assert "assistant/search-index.json" in summary["pages"]
+    indexer = bs._import_search_indexer()
+    assert indexer.search(indexer.load_index(index_path), "wombats") == []
+
+    write_page(fixture_docs / "assistant" / "alpha" / "concept" / "published-page.md",
+               publication_status="published", body="# Title\n\nAll about wombats.\n")
+    bs.prepare_incremental(*args)
+
+    results = indexer.search(indexer.load_index(index_path), "wombats")
+    assert [r["path"] for r in results] == ["assistant/alpha/concept/published-page.md"]
+
+
+def test_prepare_exports_section_chunks_and_refreshes_them_incrementally(
+        tmp_path, fixture_docs, monkeypatch):
+    exporter = bs._import_chunk_exporter()
+    imported = []
+    real_import = exporter._import_utility
+    monkeypatch.setattr(exporter, "_import_utility",
+                        lambda filename, name: imported.append(filename)
+                        or real_import(filename, name))
+    monkeypatch.setattr(bs, "_import_chunk_exporter", lambda: exporter)
+    args = _prepare_args(tmp_path, fixture_docs)
+    summary = bs.prepare(*args)
+    chunks_path = args[2] / "assistant" / "chunks.ndjson"
+    assert "assistant/chunks.ndjson" in summary["pages"]
+    assert "build-site.py" not in imported  # heading_slug is passed in
+    before = exporter.load_chunks(chunks_path)
+    page = "assistant/alpha/concept/published-page.md"
+    assert any(chunk["path"] == page for chunk in before)
+
+    write_page(fixture_docs / "assistant" / "alpha" / "concept" / "published-page.md",
+               publication_status="published", body="# Title\n\nAll about wombats.\n")
+    bs.prepare_incremental(*args)
+
+    after = exporter.load_chunks(chunks_path)
+    diff = exporter.diff_chunks(before, after)
+    assert diff["changed"] == [f"{page}#title"] and not diff["added"] + diff["removed"]
+    assert next(c for c in after if c["path"] == page)["text"] == "All about wombats."
+
+
+def test_watch_sources_reprepares_after_edits(tmp_path, fixture_docs):
+    import threading
+    import time
+
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+    agent_index = args[2] / "index.md"
+    done = threading.Event()
+    watcher = threading.Thread(target=bs.watch_sources, args=args, kwargs={
+        "includes_dir": tmp_path / "includes", "interval": 0.01,
+        "stop": done.is_set,
+    })
+    watcher.start()
+    try:
+        write_page(fixture_docs / "index.md", body="# Edited while watching\n")
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                if "Edited while watching" in agent_index.read_text(encoding="utf-8"):
+                    break
+            except FileNotFoundError:
+                pass  # caught between unlink and rewrite
+            assert time.monotonic() < deadline, "watch did not pick up the edit"
+            time.sleep(0.01)
+    finally:
+        done.set()
+        watcher.join()
+
+
+def test_watch_sources_survives_a_failed_pass(tmp_path, fixture_docs, monkeypatch, capsys):
+    import threading
+    import time
+
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+    agent_index = args[2] / "index.md"
+    real_prepare = bs.prepare_incremental
+    calls = []
+
+    def flaky_prepare(*a, **kw):
+        calls.append(a)
+        if len(calls) == 1:
+            raise FileNotFoundError("docs/.index.md.swp vanished mid-scan")
+        return real_prepare(*a, **kw)
+
+    monkeypatch.setattr(bs, "prepare_incremental", flaky_prepare)
+    done = threading.Event()
+    watcher = threading.Thread(target=bs.watch_sources, args=args, kwargs={
+        "includes_dir": tmp_path / "includes", "interval": 0.01,
+        "stop": done.is_set,
+    })
+    watcher.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not calls:
+            assert time.monotonic() < deadline, "watch never ran a pass"
+            time.sleep(0.01)
+        write_page(fixture_docs / "index.md", body="# Edited after a failure\n")
+        while True:
+            try:
+                if "Edited after a failure" in agent_index.read_text(encoding="utf-8"):
+                    break
+            except FileNotFoundError:
+                pass  # caught between unlink and rewrite
+            assert watcher.is_alive(), "watch stopped after the failed pass"
+            assert time.monotonic() < deadline, "watch did not pick up the edit"
+            time.sleep(0.01)
+    finally:
+        done.set()
+        watcher.join()
+    assert "error: prep failed (docs/.index.md.swp vanished mid-scan)" in capsys.readouterr().err
+
+
+def test_prepare_incremental_strips_changed_pages_on_jobs_workers(
+        tmp_path, fixture_docs, monkeypatch):
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+    real_strip = bs.strip_agent_docs
+    calls = []
+    monkeypatch.setattr(bs, "strip_agent_docs", lambda agent_dir, documents, jobs:
+                        calls.append((sorted(documents), jobs))
+                        or real_strip(agent_dir, documents, jobs))
+
+    write_page(fixture_docs / "index.md",
+               body="# Welcome\n\n![Logo](resources/logo.png)\nNew.\n")
+    bs.prepare_incremental(*args, jobs=3)
+
+    assert calls == [(["index.md"], 3)]
+    assert "![Logo]" not in (args[2] / "index.md").read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("page,target,expected", [
+    ("assistant/alpha/index.md", "concept/x.md#part", "assistant/alpha/concept/x.md"),
+    ("accessmap/index.md", "../assistant/", "assistant"),
+    ("index.md", "#anchor", None),
+    ("index.md", "https://example.com/a.md", None),
+    ("index.md", "../outside.md", None),
+    ("index.md", "tel:+15555550100", None),
+    ("guides/index.md", "my%20page.md?v=2#top", "guides/my page.md"),
+])
+def test_resolve_link_target(page, target, expected):
+    assert bs.resolve_link_target(page, target) == expected
+
+
+def test_link_graph_and_reverse_lookup(fixture_docs):
+    graph = bs.link_graph(bs.scan_documents(fixture_docs))
+
+    assert graph["assistant/alpha/index.md"] == ["assistant/alpha/concept/published-page.md"]
+    referrers = bs.reverse_link_graph(graph)
+    assert referrers["assistant/alpha/concept/published-page.md"] == {
+        "assistant/alpha/index.md"}
+
+
+def test_find_broken_assistant_links_flags_vanished_directory(tmp_path, fixture_docs):
+    write_page(fixture_docs / "other.md", body="[Beta](assistant/beta/)\n")
+    write_page(fixture_docs / "assistant" / "beta" / "index.md",
+               publication_status="draft")
+    human_dir = tmp_path / "human-docs"
+    bs.copy_layers(fixture_docs, human_dir, tmp_path / "agent-docs")
+
+    with pytest.raises(bs.HumanDocsValidationError) as excinfo:
+        bs.filter_human_docs(human_dir)
+
+    assert excinfo.value.errors == [("other.md", "assistant/beta/")]
+
+
+def test_prepare_incremental_rechecks_only_referrers_of_removed_pages(tmp_path, fixture_docs, monkeypatch):
+    write_page(fixture_docs / "unrelated.md", body="[Schema](assistant/schema.md)\n")
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+    (fixture_docs / "assistant" / "alpha" / "concept" / "published-page.md").unlink()
+    checked = []
+    find_broken = bs.find_broken_assistant_links
+
+    def recording_find_broken(human_dir, pages=None, *rest, **kwargs):
+        checked.append(sorted(pages))
+        return find_broken(human_dir, pages, *rest, **kwargs)
+
+    monkeypatch.setattr(bs, "find_broken_assistant_links", recording_find_broken)
+
+    with pytest.raises(bs.HumanDocsValidationError):
+        bs.prepare_incremental(*args)
+
+    assert checked == [["assistant/alpha/index.md"]]
+
+
+@pytest.mark.parametrize("heading,slug", [
+    ("Step 1. Accept the Tester Invitation", "step-1-accept-the-tester-invitation"),
+    ("Screen Reader & Landmark Settings", "screen-reader-landmark-settings"),
+    ("The `highway=footway` tag", "the-highwayfootway-tag"),
+    ("[Linked](page.md) **bold** _text_", "linked-bold-text"),
+    ("Café crossings", "cafe-crossings"),
+    ("snake_case name", "snake_case-name"),
+])
+def test_heading_slug_matches_toc(heading, slug):
+    assert bs.heading_slug(heading) == slug
+
+
+def test_heading_anchors_dedupes_and_honors_explicit_ids():
+    text = (
+        "---\ntitle: T\n---\n\n# Setup\n\n## Setup\n\n## Custom {#my-id}\n\n"
+        "    #### Indented in a tab\n\n<a id=\"raw-anchor\"></a>\n\n"
+        "```bash\n# not a heading\n```\n"
+    )
+
+    assert bs.heading_anchors(text) == [
+        "indented-in-a-tab", "my-id", "raw-anchor", "setup", "setup_1"]
+
+
+def test_link_targets_skip_code_and_titles():
+    text = ('[a](a.md "Title") `[b](b.md)`\n\n```\n[c](c.md)\n```\n'
+            "<!-- [d](d.md) -->\n")
+
+    assert list(bs._iter_markdown_link_targets(text)) == ["a.md"]
+
+
+def test_find_broken_links_checks_targets_and_anchors(fixture_docs):
+    write_page(fixture_docs / "guide.md", body=(
+        "# Guide\n\n## Getting Started\n\n"
+        "[ok](#getting-started) [bad anchor](#nope) [dir](assistant/alpha/#alpha) "
+        "[missing](missing.md) [theme](resources/logo.png#only-dark) "
+        "[wrong](index.md#elsewhere) [web](https://example.com/#x)\n"))
+    # Not published, so checked against the agent layer where support/ exists.
+    write_page(fixture_docs / "assistant" / "alpha" / "concept" / "stub-page.md",
+               publication_status="stub", body="[Support](../../support/index.md#title)\n")
+
+    errors = bs.find_broken_links(bs.scan_source_tree(fixture_docs))
+
+    assert errors == [
+        ("human-docs", "guide.md", "missing.md", "missing target"),
+        ("human-docs", "guide.md", "#nope", "missing anchor"),
+        ("human-docs", "guide.md", "index.md#elsewhere", "missing anchor"),
+    ]
+
+
+def test_prepare_reports_every_broken_link(tmp_path, fixture_docs, capsys):
+    write_page(fixture_docs / "a.md", body="[gone](gone.md)\n")
+    write_page(fixture_docs / "b.md", body="[a](a.md#nowhere)\n")
+
+    with pytest.raises(bs.LinkValidationError) as excinfo:
+        bs.prepare(*_prepare_args(tmp_path, fixture_docs))
+
+    assert excinfo.value.errors == [
+        ("human-docs", "a.md", "gone.md", "missing target"),
+        ("human-docs", "b.md", "a.md#nowhere", "missing anchor"),
+    ]
+    bs._print_validation_errors(excinfo.value)
+    assert "b.md -> a.md#nowhere (missing anchor)" in capsys.readouterr().err
+
+
+def test_prepare_incremental_detects_anchor_broken_by_renamed_heading(tmp_path, fixture_docs):
+    write_page(fixture_docs / "a.md", body="# A\n\n## Details\n")
+    write_page(fixture_docs / "b.md", body="[details](a.md#details)\n")
+    args = _prepare_args(tmp_path, fixture_docs)
+    bs.prepare(*args)
+
+    write_page(fixture_docs / "a.md", body="# A\n\n## More Details\n")
+
+    with pytest.raises(bs.LinkValidationError) as excinfo:
+        bs.prepare_incremental(*args)
+    assert excinfo.value.errors == [
+        ("human-docs", "b.md", "a.md#details", "missing anchor")]
+    assert not (tmp_path / ".build-cache" / "manifest.json").exists()
+
+
+def test_prepare_profiles_each_stage(tmp_path, fixture_docs):
+    profile = bs.new_profile()
+
+    bs.prepare(*_prepare_args(tmp_path, fixture_docs), link_mode="copy",
+               profile=profile)
+
+    stages = {stage["stage"]: stage for stage in profile["stages"]}
+    assert list(stages) == [
+        "scan_source_tree", "clean_generated", "copy_layers", "filter_human_docs",
+        "validate_links", "strip_agent_docs", "generate_dispatch",
+        "build_search_index", "export_section_chunks", "write_build_config",
+        "write_manifest"]
+    source_files = [p for p in fixture_docs.rglob("*") if p.is_file()]
+    source_bytes = sum(p.stat().st_size for p in source_files)
+    assert stages["scan_source_tree"]["files_read"] == len(source_files)
+    assert stages["scan_source_tree"]["bytes_read"] == source_bytes
+    assert stages["copy_layers"]["files_written"] == 2 * len(source_files)
+    assert stages["copy_layers"]["bytes_written"] == 2 * source_bytes
+    assert stages["strip_agent_docs"]["files_written"] == 2
+    assert all(stage["seconds"] >= 0 for stage in stages.values())
+
+
+def test_strip_agent_docs_counts_worker_io(tmp_path, fixture_docs, monkeypatch):
+    documents = bs.scan_documents(fixture_docs)
+    bs.copy_layers(fixture_docs, tmp_path / "h", tmp_path / "a", "copy")
+    monkeypatch.setattr(bs, "PARALLEL_STRIP_MIN_FILES", 1)
+    profile = bs.new_profile()
+
+    with bs.profile_stage(profile, "strip"):
+        rewritten = bs.strip_agent_docs(tmp_path / "a", documents, jobs=2)
+
+    (stage,) = profile["stages"]
+    assert stage["files_written"] == len(rewritten) == 2
+    assert stage["bytes_written"] == sum(
+        (tmp_path / "a" / rel).stat().st_size for rel in rewritten)
+
+
+def test_main_profile_writes_report_and_table(tmp_path, monkeypatch, capsys):
+    def fake_prepare(profile=None, **kwargs):
+        with bs.profile_stage(profile, "fake_stage"):
+            bs._record_io("read", 2_000_000)
+        return {"mode": "full", "pages": []}
+
+    monkeypatch.setattr(bs, "prepare", fake_prepare)
+    report_path = tmp_path / "profile.json"
+
+    assert bs.main(["--profile", str(report_path)]) == 0
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["mode"] == "full"
+    assert [stage["stage"] for stage in report["stages"]] == ["fake_stage"]
+    assert report["total"]["bytes_read"] == 2_000_000
+    out = capsys.readouterr().out
+    assert "files read" in out and "fake_stage" in out
+    assert "total" in out and "2.0" in out
+
+
+def test_main_build_no_clean_keeps_site_and_reports_overlay(monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(bs, "prepare", lambda **kwargs: {"mode": "full", "pages": ["a.md"]})
+    monkeypatch.setattr(bs, "run_zensical_build", lambda clean=True: calls.append(clean))
+    monkeypatch.setattr(bs, "overlay_agent_layer", lambda pages: {
+        "written": pages, "unchanged": ["b.md", "c.md"], "removed": []})
+
+    assert bs.main(["--build", "--no-clean"]) == 0
+
+    assert calls == [False]
+    assert "Overlay: 1 written, 2 unchanged, 0 removed" in capsys.readouterr().out
+
+
+def test_compress_site_files_writes_and_refreshes_sidecars(tmp_path):
+    import gzip
+
+    site_dir = tmp_path / "site"
+    big = "# Page\n\n" + "Some agent-readable text.\n" * 100
+    (site_dir / "a").mkdir(parents=True)
+    (site_dir / "a" / "page.md").write_text(big, encoding="utf-8")
+    (site_dir / "small.md").write_text("# Small\n", encoding="utf-8")
+    (site_dir / "llms.txt").write_text(big, encoding="utf-8")
+    (site_dir / "gone.md.gz").write_bytes(b"stale")
+    (site_dir / "a" / "page.md.br").write_bytes(b"stale")
+
+    first = bs.compress_site_files(site_dir, ["a/page.md", "small.md"],
+                                   suffixes=(".gz",), jobs=2)
+
+    assert first["written"] == ["a/page.md.gz", "llms.txt.gz"]
+    assert first["removed"] == ["a/page.md.br", "gone.md.gz"]
+    assert not (site_dir / "small.md.gz").exists()
+    assert gzip.decompress((site_dir / "a" / "page.md.gz").read_bytes()).decode() == big
+
+    page = site_dir / "a" / "page.md"
+    page.write_text(big + "More.\n", encoding="utf-8")
+    os.utime(page, ns=(2_000_000_000, 2_000_000_000))
+    second = bs.compress_site_files(site_dir, ["a/page.md", "small.md"],
+                                    suffixes=(".gz",))
+
+    assert second == {"written": ["a/page.md.gz"], "unchanged": ["llms.txt.gz"],
+                      "removed": []}
+    assert gzip.decompress((site_dir / "a" / "page.md.gz").read_bytes()).endswith(b"More.\n")
+
+
+def test_compress_site_files_drops_sidecars_of_removed_pages(tmp_path):
+    site_dir = tmp_path / "site"
+    (site_dir / "old").mkdir(parents=True)
+    (site_dir / "old" / "page.md").write_text("x" * 2000, encoding="utf-8")
+    bs.compress_site_files(site_dir, ["old/page.md"], suffixes=(".gz",))
+    (site_dir / "old" / "page.md").unlink()
+
+    result = bs.compress_site_files(site_dir, [], suffixes=(".gz",))
+
+    assert result["removed"] == ["old/page.md.gz"]
+    assert not (site_dir / "old").exists()
+
+
+def test_main_compress_requires_build(capsys):
+    assert bs.main(["--compress"]) == 1
+    assert "--compress requires --build" in capsys.readouterr().err
+
+
+def test_compress_site_files_writes_brotli_when_available(tmp_path):
+    brotli = pytest.importorskip("brotli")
+    site_dir = tmp_path / "site"
+    site_dir.mkdir()
+    (site_dir / "page.md").write_text("y" * 2000, encoding="utf-8")
+
+    result = bs.compress_site_files(site_dir)
+
+    assert result["written"] == ["page.md.br", "page.md.gz"]
+    assert brotli.decompress((site_dir / "page.md.br").read_bytes()) == b"y" * 2000
@@ -0,0 +1,203 @@
+"""Pytest suite for utilities/check-external-links.py.
+
+Every request goes to a local stand-in HTTP server (the `link_server`
+fixture), never the network.
+"""
+
+import asyncio
+import importlib.util
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+MODULE_PATH = Path(__file__).parent / "check-external-links.py"
+spec = importlib.util.spec_from_file_location("check_external_links", MODULE_PATH)
+cel = importlib.util.module_from_spec(spec)
+sys.modules["check_external_links"] = cel
+spec.loader.exec_module(cel)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes: /ok (200), /missing (404), /no-head (405 to HEAD, 200 to GET),
+    /redirect (302 to /ok), /slow (200 after a short delay). Any query
+    string is ignored."""
+
+    def _respond(self):
+        server = self.server
+        path = self.path.partition("?")[0]
+        with server.lock:
+            server.requests.append((self.command, self.path))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            if path == "/slow":
+                time.sleep(0.1)
+        finally:
+            # Before responding: once the client has its response it may
+            # start its next request before this thread runs again.
+            with server.lock:
+                server.in_flight -= 1
+        if path == "/missing":
+            self.send_response(404)
+        elif path == "/no-head" and self.command == "HEAD":
+            self.send_response(405)
+        elif path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/ok")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_HEAD = _respond
+    do_GET = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def link_server():
+    """Serve StandInHandler on an ephemeral localhost port; yields the server.
+
+    server.base_url is the URL prefix; server.requests records every
+    (method, path) received, and server.max_in_flight the peak concurrency.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_collect_external_urls_dedupes_and_skips_code(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "a").mkdir(parents=True)
+    (docs / "index.md").write_text(
+        "[x](https://example.com/) [y](other.md) [z](mailto:a@b.c)\n"
+        "`[code](https://example.com/code)`\n", encoding="utf-8")
+    (docs / "a" / "page.md").write_text(
+        "[x again](https://example.com/ \"Title\") [w](http://example.org/w)\n"
+        "[w part](http://example.org/w#part) [x top](https://example.com/#top)\n",
+        encoding="utf-8")
+
+    assert cel.collect_external_urls(docs) == {
+        "http://example.org/w": ["a/page.md"],
+        "https://example.com/": ["a/page.md", "index.md"],
+    }
+
+
+def test_check_url_statuses(link_server):
+    base = link_server.base_url
+
+    assert cel.check_url(f"{base}/ok")["valid"]
+    assert cel.check_url(f"{base}/redirect")["valid"]
+    missing = cel.check_url(f"{base}/missing")
+    assert not missing["valid"] and missing["status"].startswith("HTTP 404")
+    assert not missing["timeout"]
+
+
+def test_check_url_falls_back_to_get(link_server):
+    result = cel.check_url(f"{link_server.base_url}/no-head")
+
+    assert result == {"valid": True, "status": 200, "timeout": False}
+    assert link_server.requests == [("HEAD", "/no-head"), ("GET", "/no-head")]
+
+
+def test_check_url_skips_listed_domains(link_server):
+    result = cel.check_url("https://docs.google.com/document/d/x")
+
+    assert result["valid"] and result["status"] == cel.SKIPPED_STATUS
+    assert link_server.requests == []
+
+
+def test_check_url_reports_unreachable_host():
+    result = cel.check_url("http://127.0.0.1:9/", timeout=1)
+
+    assert not result["valid"]
+
+
+def test_check_urls_limits_requests_per_host(link_server):
+    # Distinct URLs that all hit the same route.
+    urls = [f"{link_server.base_url}/slow?i={i}" for i in range(6)]
+
+    results = asyncio.run(cel.check_urls(urls, max_concurrency=8, per_host=2))
+
+    assert len(results) == 6 and all(r["valid"] for r in results.values())
+    assert link_server.max_in_flight <= 2
+
+
+def test_check_urls_checks_duplicates_once(link_server):
+    url = f"{link_server.base_url}/ok"
+
+    results = asyncio.run(cel.check_urls([url, url, url]))
+
+    assert list(results) == [url]
+    assert link_server.requests == [("HEAD", "/ok")]
+
+
+def test_check_urls_checks_urls_differing_by_fragment_once(link_server):
+    page = f"{link_server.base_url}/missing"
+
+    results = asyncio.run(cel.check_urls([f"{page}#a", f"{page}#b", page]))
+
+    assert list(results) == [f"{page}#a", f"{page}#b", page]
+    assert all(r["status"].startswith("HTTP 404") for r in results.values())
+    assert link_server.requests == [("HEAD", "/missing"), ("GET", "/missing")]
+
+
+def test_check_with_cache_reuses_fresh_results(tmp_path, link_server):
+    cache_path = tmp_path / "cache.json"
+    ok, missing = f"{link_server.base_url}/ok", f"{link_server.base_url}/missing"
+
+    cache = cel.load_cache(cache_path)
+    results, hits = cel.check_with_cache([ok, missing], cache)
+    cel.save_cache(cache, cache_path)
+    assert hits == 0 and results[ok]["valid"] and not results[missing]["valid"]
+    link_server.requests.clear()
+
+    results, hits = cel.check_with_cache([ok, missing], cel.load_cache(cache_path))
+    assert hits == 2 and not results[missing]["valid"]
+    assert link_server.requests == []
+
+    _, hits = cel.check_with_cache([ok], cel.load_cache(cache_path), use_cache=False)
+    assert hits == 0 and link_server.requests == [("HEAD", "/ok")]
+
+
+def test_is_fresh_expires_and_never_reuses_timeouts():
+    now = 1_000_000.0
+    entry = {"valid": True, "status": 200, "timeout": False, "checked_at": now - 3600}
+
+    assert cel.is_fresh(entry, ttl_hours=12, now=now)
+    assert not cel.is_fresh(entry, ttl_hours=0.5, now=now)
+    assert not cel.is_fresh({**entry, "timeout": True}, ttl_hours=12, now=now)
+
+
+def test_main_reports_broken_links(tmp_path, link_server, capsys):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "index.md").write_text(
+        f"[ok]({link_server.base_url}/ok) [bad]({link_server.base_url}/missing)\n",
+        encoding="utf-8")
+    (docs / "other.md").write_text(
+        f"[bad part]({link_server.base_url}/missing#part)\n", encoding="utf-8")
+
+    exit_code = cel.main(["--docs-dir", str(docs), "--cache", str(tmp_path / "c.json")])
+
+    assert exit_code == 1
+    err = capsys.readouterr().err
+    assert f"{link_server.base_url}/missing (HTTP 404" in err
+    assert "linked from index.md" in err and "linked from other.md" in err
+    assert link_server.requests.count(("GET", "/missing")) == 1
+    assert (tmp_path / "c.json").exists()
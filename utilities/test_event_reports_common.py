@@ -0,0 +1,450 @@
+"""Pytest suite for utilities/event-reports/common.py.
+
+Covers the geometry helpers (the batched way_lengths_m() must agree with the
+scalar way_length_m(), with and without NumPy), the streaming JSON reader,
+the HTTP response cache (against a fake network), and the pooled client
+and mirror racing (against a local server).
+"""
+
+import gzip
+import http.server
+import io
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent / "event-reports"))
+import common  # noqa: E402
+
+
+def _random_ways(count, seed=7):
+    rng = random.Random(seed)
+    ways = []
+    for i in range(count):
+        lat, lon = 47.5 + rng.random(), -122.5 + rng.random()
+        points = []
+        for _ in range(rng.choice([0, 1, 2, 3, 7, 20])):
+            lat += rng.uniform(-1e-3, 1e-3)
+            lon += rng.uniform(-1e-3, 1e-3)
+            points.append({"lat": lat, "lon": lon} if i % 2 else (lat, lon))
+        ways.append(points)
+    return ways
+
+
+def test_way_length_m_accepts_dicts_and_tuples():
+    tuples = [(0.0, 0.0), (0.0, 1.0), (1.0, 1.0)]
+    dicts = [{"lat": lat, "lon": lon} for lat, lon in tuples]
+
+    expected = common.haversine(0, 0, 0, 1) + common.haversine(0, 1, 1, 1)
+    assert common.way_length_m(tuples) == common.way_length_m(dicts) == expected
+    assert common.way_length_m([]) == common.way_length_m(tuples[:1]) == 0.0
+
+
+def test_flatten_ways_offsets():
+    lats, lons, offsets = common.flatten_ways(
+        [[(1, 2), (3, 4)], [], [{"lat": 5, "lon": 6}]])
+
+    assert (lats, lons, offsets) == ([1, 3, 5], [2, 4, 6], [0, 2, 2, 3])
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_way_lengths_m_matches_scalar(use_numpy, monkeypatch):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(common, "np", None)
+    ways = [[], [(1.0, 2.0)]] + _random_ways(500) + [[], [(3.0, 4.0)]]
+
+    lengths = common.way_lengths_m(*common.flatten_ways(ways))
+
+    assert len(lengths) == len(ways)
+    for way, length in zip(ways, lengths):
+        assert length == pytest.approx(common.way_length_m(way), rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("ways", [[], [[]], [[], [(1.0, 2.0)]]])
+def test_way_lengths_m_without_segments(ways):
+    assert common.way_lengths_m(*common.flatten_ways(ways)) == [0.0] * len(ways)
+
+
+OVERPASS_DOC = {
+    "version": 0.6,
+    "osm3s": {"copyright": "OpenStreetMap contributors"},
+    "elements": [
+        {"type": "way", "id": i, "changeset": 100 + i % 3, "user": "ü",
+         "geometry": [{"lat": 47.5 + i / 1e4, "lon": -122.25}], "tags": {}}
+        for i in range(40)
+    ] + [12345, -1.5e10, True, None, "tail"],
+    "remark": "runtime error: partial result",
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, common.STREAM_CHUNK_SIZE])
+@pytest.mark.parametrize("binary", [True, False])
+def test_iter_json_array_streams_items_and_keeps_other_members(chunk_size, binary):
+    text = json.dumps(OVERPASS_DOC, ensure_ascii=False)
+    stream = io.BytesIO(text.encode("utf-8")) if binary else io.StringIO(text)
+    header = {}
+
+    items = list(common.iter_json_array(stream, "elements", header, chunk_size))
+
+    assert items == OVERPASS_DOC["elements"]
+    assert header == {k: v for k, v in OVERPASS_DOC.items() if k != "elements"}
+
+
+@pytest.mark.parametrize("raw", [b"{}", b' {"x": 1, "elements": [] }'])
+def test_iter_json_array_without_items(raw):
+    assert list(common.iter_json_array(io.BytesIO(raw), "elements", chunk_size=2)) == []
+
+
+@pytest.mark.parametrize("raw", [
+    b"", b"<html>busy</html>", b"[1, 2]", b'{"elements": [1 2]}',
+    b'{"elements": [{"a": 1},', b'{"elements": [1,]}', b'{"a" 1}',
+    b'{"elements": []} {}', b'{} x',
+])
+def test_iter_json_array_rejects_bad_json(raw):
+    with pytest.raises(ValueError):
+        list(common.iter_json_array(io.BytesIO(raw), "elements", chunk_size=3))
+
+
+OVERPASS_URL = "https://overpass.example/api/interpreter"
+MIRROR_URL = "https://mirror.example/api/interpreter"
+TASKS_URL = "https://tm.example/backend/api/v2/projects/7/tasks/?as_file=true"
+PRIVATE_URL = "https://workspaces.example/api/v1/workspaces/3/bbox"
+
+
+class FakeResponse(io.BytesIO):
+    status = 200
+    headers = {"Content-Type": "application/json"}
+
+
+@pytest.fixture
+def network(tmp_path, monkeypatch):
+    """Point the cache at tmp_path and serve every URL from a fake network."""
+    monkeypatch.setattr(common, "_cache", dict(common._cache))
+    common.configure_cache(tmp_path / "cache")
+    requests = []
+
+    def fake_urlopen(url, data=None, headers=None):
+        requests.append(url)
+        return FakeResponse(json.dumps({"url": url, "n": len(requests)}).encode())
+
+    monkeypatch.setattr(common, "_urlopen", fake_urlopen)
+    return requests
+
+
+def test_fetch_json_caches_public_endpoints_only(network, tmp_path):
+    first = common.fetch_json(OVERPASS_URL, data=b"query")
+    assert common.fetch_json(MIRROR_URL, data=b"query") == first
+    assert common.fetch_json(OVERPASS_URL, data=b"other") != first
+    common.fetch_json(PRIVATE_URL)
+    common.fetch_json(PRIVATE_URL)
+
+    assert network == [OVERPASS_URL, OVERPASS_URL, PRIVATE_URL, PRIVATE_URL]
+    entries = list((tmp_path / "cache").rglob("*.gz"))
+    assert len(entries) == 2
+    with gzip.open(entries[0], "rb") as f:
+        assert json.loads(f.readline())["content_type"] == "application/json"
+
+
+def test_cache_entries_expire_per_endpoint(network, monkeypatch):
+    common.fetch_json(TASKS_URL)
+    common.fetch_json(OVERPASS_URL, data=b"q")
+    now = time.time()
+    monkeypatch.setattr(common.time, "time", lambda: now + 2 * 3600)
+
+    common.fetch_json(TASKS_URL)  # one-hour TTL: refetched
+    common.fetch_json(OVERPASS_URL, data=b"q")  # one-day TTL: still cached
+
+    assert network == [TASKS_URL, OVERPASS_URL, TASKS_URL]
+
+
+CHANGESETS_URL = "https://api.openstreetmap.org/api/0.6/changesets.json?changesets="
+
+
+def test_changeset_batches_with_open_changesets_get_a_short_ttl(network, monkeypatch):
+    batches = {
+        CHANGESETS_URL + "1,2": [{"id": 1, "open": False}, {"id": 2, "open": False}],
+        CHANGESETS_URL + "3,4": [{"id": 3, "open": False}, {"id": 4, "open": True}],
+    }
+    monkeypatch.setattr(common, "_urlopen", lambda url, data=None, headers=None:
+                        network.append(url)
+                        or FakeResponse(json.dumps({"changesets": batches[url]}).encode()))
+    for url in batches:
+        common.fetch_json(url)
+    now = time.time()
+
+    monkeypatch.setattr(common.time, "time", lambda: now + common.OPEN_CHANGESETS_TTL - 60)
+    for url in batches:
+        common.fetch_json(url)  # both still cached
+    monkeypatch.setattr(common.time, "time", lambda: now + common.OPEN_CHANGESETS_TTL + 60)
+    for url in batches:
+        common.fetch_json(url)  # only the all-closed batch is still cached
+
+    assert network == list(batches) + [CHANGESETS_URL + "3,4"]
+    # A stream's entry header is written before its body is seen.
+    monkeypatch.setattr(common.time, "time", lambda: now + 60 * 86400)
+    with common.open_url(CHANGESETS_URL + "1,2") as resp:
+        assert isinstance(resp, FakeResponse)
+
+
+def test_offline_serves_stale_entries_and_raises_on_misses(network, monkeypatch):
+    cached = common.fetch_json(TASKS_URL)
+    now = time.time()
+    monkeypatch.setattr(common.time, "time", lambda: now + 365 * 86400)
+    common.configure_cache(offline=True)
+
+    assert common.fetch_json(TASKS_URL) == cached
+    for url in (OVERPASS_URL, PRIVATE_URL):
+        with pytest.raises(common.CacheMissError):
+            common.fetch_json(url)
+    assert network == [TASKS_URL]
+
+
+def test_no_cache_never_reads_or_writes(network, tmp_path):
+    common.configure_cache(enabled=False)
+
+    common.fetch_json(TASKS_URL)
+    common.fetch_json(TASKS_URL)
+
+    assert len(network) == 2 and not (tmp_path / "cache").exists()
+
+
+def test_open_url_caches_streams_read_through_iter_json_array(network, monkeypatch):
+    doc = {"elements": [{"id": i} for i in range(5000)], "remark": "fine"}
+    network_body = (json.dumps(doc) + "\n").encode()
+    monkeypatch.setattr(common, "_urlopen",
+                        lambda url, data=None, headers=None: FakeResponse(network_body))
+
+    with common.open_url(OVERPASS_URL, data=b"q") as resp:
+        assert len(list(common.iter_json_array(resp, "elements", chunk_size=4096))) == 5000
+
+    assert common.cache_lookup(OVERPASS_URL, data=b"q")[0] == network_body
+
+
+TIMED_OUT = 'runtime error: Query timed out in "query" at line 3 after 301 seconds.'
+
+
+@pytest.mark.parametrize("remark, error", [
+    (None, None), ("runtime remark: all fine", None), (TIMED_OUT, TIMED_OUT)])
+def test_overpass_error_reads_the_remark(remark, error):
+    assert common.overpass_error({"elements": [], "remark": remark}) == error
+    assert common.overpass_error([1]) is None
+
+
+def test_overpass_results_with_error_remarks_are_not_cached(network, monkeypatch):
+    body = json.dumps({"elements": [{"id": 1}], "remark": TIMED_OUT}).encode()
+    monkeypatch.setattr(common, "_urlopen",
+                        lambda url, data=None, headers=None: FakeResponse(body))
+
+    assert common.fetch_json(OVERPASS_URL, data=b"q")["remark"] == TIMED_OUT
+    with common.open_url(OVERPASS_URL, data=b"q") as resp:
+        header = {}
+        list(common.iter_json_array(resp, "elements", header))
+        assert common.overpass_error(header)
+        common.discard_cached_response(resp)
+
+    assert common.cache_lookup(OVERPASS_URL, data=b"q") is None
+
+
+def test_cache_read_only_serves_but_stores_nothing(network):
+    common.fetch_json(TASKS_URL)
+    with common.cache_read_only():
+        common.fetch_json(TASKS_URL)
+        common.fetch_json(OVERPASS_URL, data=b"q")
+        with common.open_url(OVERPASS_URL, data=b"q") as resp:
+            resp.read()
+    common.fetch_json(OVERPASS_URL, data=b"q")
+
+    assert network == [TASKS_URL, OVERPASS_URL, OVERPASS_URL, OVERPASS_URL]
+
+
+def test_open_url_caches_only_fully_read_streams(network):
+    with common.open_url(OVERPASS_URL, data=b"q") as resp:
+        resp.read(5)
+    with common.open_url(OVERPASS_URL, data=b"q") as resp:
+        body = b"".join(iter(lambda: resp.read(7), b""))
+    with common.open_url(MIRROR_URL, data=b"q") as resp:
+        assert resp.read() == body
+
+    assert network == [OVERPASS_URL, OVERPASS_URL]
+    assert common.fetch_json(OVERPASS_URL, data=b"q") == json.loads(body)
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    """A local keep-alive JSON server.
+
+    ``/fail/<n>/...`` answers 503 n times first; ``/slow/<s>/...`` takes s seconds.
+    """
+    monkeypatch.setattr(common, "_cache", dict(common._cache))
+    common.configure_cache(tmp_path / "cache", enabled=False)
+    monkeypatch.setattr(common, "_retry_delay", lambda attempt, retry_after=None: 0)
+    state = {"connections": set(), "failures": {}, "in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with lock:
+                state["connections"].add(self.client_address)
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.01)
+            parts = self.path.strip("/").split("/")
+            status = 200
+            if parts[0] == "slow":
+                time.sleep(float(parts[1]))
+            if parts[0] == "fail":
+                with lock:
+                    seen = state["failures"].get(self.path, 0)
+                    state["failures"][self.path] = seen + 1
+                if seen < int(parts[1]):
+                    status = 503
+            body = json.dumps({"path": self.path}).encode()
+            with lock:
+                state["in_flight"] -= 1
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if status == 503:
+                self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.handle_error = lambda request, client_address: None  # cancelled races
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05},
+                              daemon=True)
+    thread.start()
+    state["base"] = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield state
+    common.close_connections()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_http_request_reuses_keep_alive_connections(server):
+    for i in range(5):
+        status, _headers, body = common.http_request(f"{server['base']}/item/{i}")
+        assert status == 200 and json.loads(body) == {"path": f"/item/{i}"}
+
+    assert len(server["connections"]) == 1
+
+
+def test_fetch_json_many_keeps_order_and_bounds_concurrency(server):
+    urls = [f"{server['base']}/item/{i}" for i in range(12)]
+
+    results = common.fetch_json_many(urls, max_workers=3)
+
+    assert [r["path"] for r in results] == [f"/item/{i}" for i in range(12)]
+    assert 1 < server["max_in_flight"] <= 3
+    assert len(server["connections"]) <= 3
+
+
+def test_fetch_json_retrying_retries_transient_statuses(server):
+    assert common.fetch_json_retrying(f"{server['base']}/fail/2/a") == {"path": "/fail/2/a"}
+    assert server["failures"]["/fail/2/a"] == 3
+
+    with pytest.raises(RuntimeError, match="HTTP 503"):
+        common.fetch_json_retrying(f"{server['base']}/fail/9/b", attempts=2)
+    assert server["failures"]["/fail/9/b"] == 2
+
+
+def _race(urls, **kwargs):
+    outcomes = {}
+
+    def on_outcome(url, outcome, seconds):
+        outcomes[url.rsplit("/", 1)[-1]] = outcome
+
+    start = time.monotonic()
+    url, result = common.race_requests(urls, on_outcome=on_outcome, **kwargs)
+    return url, result, outcomes, time.monotonic() - start
+
+
+def test_race_requests_takes_first_answer_and_cancels_the_rest(server):
+    urls = [f"{server['base']}/slow/5/a", f"{server['base']}/fail/9/b",
+            f"{server['base']}/slow/0.2/c"]
+
+    url, result, outcomes, elapsed = _race(urls)
+
+    assert url == urls[2] and result == {"path": "/slow/0.2/c"}
+    assert outcomes == {"a": "cancelled", "b": "error", "c": "ok"}
+    assert elapsed < 2
+
+
+def test_race_requests_does_not_send_once_a_connecting_loser_connects(server, monkeypatch):
+    release = threading.Event()
+    sent = []
+    new_connection = common._new_connection
+
+    def slow_connecting(url):
+        conn, path = new_connection(url)
+        if "/hang/" in url:
+            connect, request = conn.connect, conn.request
+
+            def delayed_connect():
+                release.wait(5)
+                connect()
+
+            def recorded_request(*args, **kwargs):
+                sent.append(url)
+                return request(*args, **kwargs)
+            conn.connect, conn.request = delayed_connect, recorded_request
+        return conn, path
+
+    monkeypatch.setattr(common, "_new_connection", slow_connecting)
+    monkeypatch.setattr(common, "_RACE_JOIN_TIMEOUT", 0.1)
+    reported = threading.Event()
+    outcomes = {}
+
+    def on_outcome(url, outcome, seconds):
+        outcomes[url.rsplit("/", 1)[-1]] = outcome
+        if outcome == "cancelled":
+            reported.set()
+
+    url, _result = common.race_requests(
+        [f"{server['base']}/hang/a", f"{server['base']}/item/b"], on_outcome=on_outcome)
+    assert url.endswith("/item/b") and outcomes == {"b": "ok"}
+
+    release.set()
+    assert reported.wait(5)
+    assert outcomes == {"a": "cancelled", "b": "ok"} and sent == []
+
+
+def test_race_requests_staggers_starts_unless_earlier_attempts_failed(server):
+    base = server["base"]
+
+    _url, _result, outcomes, _ = _race([f"{base}/item/a", f"{base}/item/b"], stagger=5)
+    assert outcomes == {"a": "ok"}
+
+    url, _result, outcomes, elapsed = _race(
+        [f"{base}/fail/9/a", f"{base}/fail/9/b", f"{base}/item/c"], stagger=5)
+    assert url.endswith("/item/c") and elapsed < 2
+    assert outcomes == {"a": "error", "b": "error", "c": "ok"}
+
+
+def test_race_requests_bounds_parallel_attempts(server):
+    urls = [f"{server['base']}/slow/0.2/{i}" for i in range(4)]
+
+    _url, _result, outcomes, _ = _race(urls, max_parallel=2)
+
+    assert server["max_in_flight"] <= 2 and len(outcomes) == 2
+
+
+def test_race_requests_streams_and_raises_when_all_fail(server):
+    url, resp, _outcomes, _ = _race([f"{server['base']}/item/a"], stream=True)
+    with resp:
+        assert json.loads(resp.read()) == {"path": "/item/a"}
+
+    with pytest.raises(RuntimeError, match="All 2 servers failed.*HTTP 503"):
+        _race([f"{server['base']}/fail/9/a", f"{server['base']}/fail/9/b"])
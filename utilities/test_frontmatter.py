@@ -0,0 +1,255 @@
+"""Pytest suite for utilities/frontmatter.py.
+
+Besides unit cases on small inline pages, checks the nested parser against
+PyYAML (when installed) on every real page under docs/ and templates/.
+"""
+
+import datetime
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+import frontmatter
+
+REPO_ROOT = Path(__file__).parent.parent
+PAGE_DIRS = (REPO_ROOT / "docs", REPO_ROOT / "templates")
+
+ARTICLE = """---
+title: "What is a curb ramp?" # shown in the page header
+slug: curb-ramp
+doc_type: concept
+questions:
+    - What is a curb ramp?
+    - Where is kerb=lowered used?
+products:
+    - OS-CONNECT
+    - 'AccessMap'
+topics: [os-connect, "curbs, ramps"]
+publication_status: draft
+last_reviewed:
+assistant_behavior:
+    allow_inference: false
+    abstain_if_missing_context: yes
+    do_not_claim:
+        - Every ramp is compliant.
+    max_hops: 3
+related_pages: []
+tags:
+- Assistant
+---
+
+# What is a curb ramp?
+"""
+
+
+def _page(tmp_path, text, name="page.md"):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_parse_flat_keeps_top_level_scalars():
+    assert frontmatter.parse(ARTICLE) == {
+        "title": "What is a curb ramp?",
+        "slug": "curb-ramp",
+        "doc_type": "concept",
+        "topics": '[os-connect, "curbs, ramps"]',
+        "publication_status": "draft",
+        "related_pages": "[]",
+    }
+
+
+def test_parse_nested_reads_lists_maps_and_types():
+    fm = frontmatter.parse(ARTICLE, nested=True)
+
+    assert fm["questions"] == ["What is a curb ramp?", "Where is kerb=lowered used?"]
+    assert fm["products"] == ["OS-CONNECT", "AccessMap"]
+    assert fm["topics"] == ["os-connect", "curbs, ramps"]
+    assert fm["last_reviewed"] is None
+    assert fm["assistant_behavior"] == {
+        "allow_inference": False,
+        "abstain_if_missing_context": True,
+        "do_not_claim": ["Every ramp is compliant."],
+        "max_hops": 3,
+    }
+    assert fm["related_pages"] == [] and fm["tags"] == ["Assistant"]
+
+
+@pytest.mark.parametrize("line,expected", [
+    ('key: plain # comment', "plain"),
+    ('key: C#sharp', "C#sharp"),
+    ('key: "quoted # not a comment" # comment', "quoted # not a comment"),
+    ("key: 'it''s'", "it's"),
+    ('key: "tab\\there \\u00e9 \\"q\\""', 'tab\there \u00e9 "q"'),
+    ('key: "" # blank', None),
+    ('key: # only a comment', None),
+    ('key: https://example.com/a#b', "https://example.com/a#b"),
+])
+def test_parse_scalars_and_comments(line, expected):
+    assert frontmatter.parse(f"---\n{line}\n---\n").get("key") == expected
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("~", None), ("Yes", True), ("off", False), ("42", 42), ("-017", -15),
+    ("0x1F", 31), ("1_000", 1000), ("1.5", 1.5), ("08", "08"),
+    ("2026-07-31", "2026-07-31"), ('"42"', "42"), ("[1, two]", [1, "two"]),
+    ("{a: 1}", {"a": 1}),
+])
+def test_parse_nested_resolves_scalars_like_yaml(value, expected):
+    assert frontmatter.parse(f"---\nkey: {value}\n---\n", nested=True)["key"] == expected
+
+
+def test_parse_nested_reads_maps_inside_list_items():
+    text = "---\nsteps:\n  - name: one\n    done: true\n  - two\n---\n"
+
+    assert frontmatter.parse(text, nested=True) == {
+        "steps": [{"name": "one", "done": True}, "two"]}
+
+
+@pytest.mark.parametrize("block", [
+    "status: draft\n    last_reviewed: 2026-07-31",
+    "a:\n    - x\n  - y",
+    "- not a map",
+    "key: [unterminated",
+])
+def test_parse_nested_rejects_malformed_structure(block):
+    text = f"---\n{block}\n---\n"
+
+    with pytest.raises(frontmatter.FrontmatterError):
+        frontmatter.parse(text, nested=True)
+    frontmatter.parse(text)  # the flat parse never raises
+
+
+def test_parse_lenient_falls_back_to_the_flat_parse(capsys):
+    good = "---\ntitle: A\ntopics:\n  - x\n---\n"
+    bad = "---\ntitle: B\ntopics:\n  stray: indent\n    - x\n---\n"
+
+    assert frontmatter.parse_lenient(good, "good.md") == {"title": "A", "topics": ["x"]}
+    assert capsys.readouterr().err == ""
+    assert frontmatter.parse_lenient(bad, "bad.md") == {"title": "B"}
+    assert capsys.readouterr().err.startswith(
+        "warning: bad.md: malformed frontmatter (line 5: unexpected indentation); "
+        "using its top-level fields only")
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, []), ("one", ["one"]), (3, ["3"]), (["a", None, 2], ["a", "2"]), ([], []),
+])
+def test_as_list(value, expected):
+    assert frontmatter.as_list(value) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "No frontmatter\n---\ntitle: B\n---\n",
+    "---\ntitle: Unclosed\n\n# A\n",
+    "",
+])
+def test_parse_without_frontmatter(text):
+    assert frontmatter.parse(text) == {} and frontmatter.parse(text, nested=True) == {}
+
+
+@pytest.mark.parametrize("text", [
+    "---\ntitle: A\nstatus: x\n---\n\n# A\n" + "Body line.\n" * 500,
+    "---\ntitle: Ünïcode — title\n---   \n\n# A\n",
+    "---\r\ntitle: Windows\r\n---\r\n\r\n# A\r\n",
+    "---\ntitle: At end of file\n---",
+    "---\ntitle: A\n----\nstill: frontmatter\n---\n",
+    "---\ntitle: Unclosed\n\n# A\n",
+    "No frontmatter\n---\ntitle: B\n---\n",
+    "--",
+    "",
+])
+def test_read_header_parses_like_full_text(tmp_path, text):
+    path = tmp_path / "page.md"
+    path.write_bytes(text.encode("utf-8"))
+
+    for chunk_size in (3, 16, frontmatter.READ_SIZE):
+        header = frontmatter.read_header(path, chunk_size)
+        assert frontmatter.parse(header) == frontmatter.parse(text)
+        assert len(header) <= 60
+
+
+def test_load_is_memoized_until_the_file_changes(tmp_path, monkeypatch):
+    path = _page(tmp_path, "---\ntitle: One\n---\n")
+    reads = []
+    original_read_header = frontmatter.read_header
+    monkeypatch.setattr(frontmatter, "read_header",
+                        lambda p: reads.append(p) or original_read_header(p))
+
+    first = frontmatter.load(path)
+    assert frontmatter.load(str(path)) is first and len(reads) == 1
+    assert frontmatter.load(path, nested=True) == {"title": "One"} and len(reads) == 2
+
+    path.write_text("---\ntitle: Two!\n---\n", encoding="utf-8")
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    assert frontmatter.load(path) == {"title": "Two!"} and len(reads) == 3
+
+    frontmatter.cache_clear()
+    frontmatter.load(path)
+    assert len(reads) == 4
+
+
+def _real_pages():
+    for page_dir in PAGE_DIRS:
+        yield from sorted(page_dir.rglob("*.md"))
+
+
+def _as_yaml_would(value):
+    """Return value with dates (and datetimes) as the ISO strings we keep them as."""
+    if isinstance(value, dict):
+        return {key: _as_yaml_would(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_as_yaml_would(item) for item in value]
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+def test_parse_nested_matches_yaml_on_real_pages():
+    yaml = pytest.importorskip("yaml")
+    mismatches = []
+    checked = 0
+    for path in _real_pages():
+        text = path.read_text(encoding="utf-8")
+        match = frontmatter.FRONTMATTER_RE.match(text)
+        if not match:
+            continue
+        try:
+            expected = _as_yaml_would(yaml.safe_load(match.group(1)) or {})
+        except yaml.YAMLError:
+            expected = frontmatter.FrontmatterError
+        try:
+            actual = frontmatter.parse(text, nested=True)
+        except frontmatter.FrontmatterError:
+            actual = frontmatter.FrontmatterError
+        checked += 1
+        if actual != expected:
+            mismatches.append(path.relative_to(REPO_ROOT).as_posix())
+
+    assert checked > 100
+    assert not mismatches, f"frontmatter.parse(nested=True) differs from PyYAML: {mismatches}"
+
+
+def test_parse_nested_is_faster_than_yaml_on_real_pages():
+    yaml = pytest.importorskip("yaml")
+    blocks = [frontmatter.read_header(path) for path in _real_pages()]
+    blocks = [block for block in blocks if block][:200]
+    bodies = [frontmatter.FRONTMATTER_RE.match(block).group(1) for block in blocks]
+
+    def best_of(func, items):
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            for item in items:
+                try:
+                    func(item)
+                except (ValueError, yaml.YAMLError):
+                    pass
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    ours = best_of(lambda block: frontmatter.parse(block, nested=True), blocks)
+    theirs = best_of(yaml.safe_load, bodies)
+    assert ours < theirs, f"nested parse {ours:.3f}s vs yaml.safe_load {theirs:.3f}s"
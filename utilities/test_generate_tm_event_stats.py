@@ -0,0 +1,223 @@
+"""Pytest suite for utilities/event-reports/generate-tm-event-stats.py.
+
+Checks the stats computation offline: changeset lookups are stubbed with a
+fixed set of hashtag matches.  Overpass mirror selection runs against fake
+fetch functions.
+"""
+
+import importlib.util
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+EVENT_REPORTS_DIR = Path(__file__).parent / "event-reports"
+MODULE_PATH = EVENT_REPORTS_DIR / "generate-tm-event-stats.py"
+sys.path.insert(0, str(EVENT_REPORTS_DIR))
+spec = importlib.util.spec_from_file_location("generate_tm_event_stats", MODULE_PATH)
+if spec is None or spec.loader is None:
+    raise ImportError(f"could not load module spec from {MODULE_PATH}")
+tm = importlib.util.module_from_spec(spec)
+sys.modules["generate_tm_event_stats"] = tm
+spec.loader.exec_module(tm)
+
+MATCHED = {101, 103}
+
+
+def _way(i, changeset, **tags):
+    return {"type": "way", "id": i, "changeset": changeset, "user": f"u{changeset}",
+            "geometry": [{"lat": 47.6, "lon": -122.3 + i / 1e3},
+                         {"lat": 47.6 + i / 1e4, "lon": -122.3}],
+            "tags": {"highway": "footway", **tags}}
+
+
+def _node(i, changeset, **tags):
+    return {"type": "node", "id": i, "changeset": changeset, "user": f"u{changeset}",
+            "lat": 47.6, "lon": -122.3, "tags": tags}
+
+
+@pytest.fixture
+def overpass_result():
+    elements = []
+    for i in range(60):
+        changeset = 100 + i % 5
+        kind = i % 6
+        if kind == 0:
+            elements.append(_way(i, changeset, footway="sidewalk"))
+        elif kind == 1:
+            elements.append(_way(i, changeset, footway="crossing"))
+        elif kind == 2:
+            elements.append(_way(i, changeset, highway="steps"))
+        elif kind == 3:
+            elements.append(_way(i, changeset))
+        elif kind == 4:
+            elements.append(_node(i, changeset, highway="crossing"))
+        else:
+            elements.append(_node(i, changeset, barrier="kerb"))
+    elements.append(_way(99, None))
+    return {"version": 0.6, "elements": elements}
+
+
+@pytest.fixture(autouse=True)
+def offline_changesets(monkeypatch):
+    monkeypatch.setattr(tm, "_changesets_with_hashtag",
+                        lambda cs_ids, hashtag: MATCHED & set(cs_ids))
+
+
+@pytest.fixture(autouse=True)
+def response_cache(tmp_path, monkeypatch):
+    common = sys.modules["common"]
+    monkeypatch.setattr(common, "_cache", dict(common._cache))
+    common.configure_cache(tmp_path / "http-cache")
+    return common
+
+
+def test_compute_stats_counts_each_category(overpass_result):
+    stats = tm.compute_stats(tm.filter_by_hashtag(overpass_result))
+
+    assert stats["changesets"] == sorted(MATCHED) and stats["mapper_count"] == 2
+    assert stats["total_elements"] == 24
+    assert (stats["sidewalk_way_count"], stats["crossing_way_count"],
+            stats["steps_count"], stats["footway_way_count"]) == (4, 4, 4, 4)
+    assert (stats["crossing_node_count"], stats["curb_node_count"]) == (4, 4)
+    assert stats["all_footway_length_m"] == pytest.approx(
+        stats["footway_length_m"] + stats["crossing_way_length_m"]
+        + stats["sidewalk_way_length_m"] + stats["steps_length_m"], abs=0.2)
+
+
+@pytest.mark.parametrize("batch_ways", [1, 7, tm.STREAM_BATCH_WAYS])
+def test_compute_stats_streaming_matches_compute_stats(overpass_result, batch_ways):
+    raw = json.dumps(overpass_result).encode("utf-8")
+    elements = tm.iter_json_array(io.BytesIO(raw), "elements", chunk_size=64)
+
+    streamed = tm.compute_stats_streaming(elements, batch_ways=batch_ways)
+
+    assert streamed == tm.compute_stats(tm.filter_by_hashtag(overpass_result))
+
+
+def test_fetch_changesets_batches_ids_concurrently(monkeypatch):
+    calls = []
+
+    def fake_fetch_json_many(urls, max_workers):
+        calls.append((urls, max_workers))
+        return [{"changesets": [{"id": url.rsplit(",", 1)[-1]}]} for url in urls]
+
+    monkeypatch.setattr(tm, "fetch_json_many", fake_fetch_json_many)
+
+    changesets = tm._fetch_changesets(list(range(1, 251)))
+
+    urls, max_workers = calls[0]
+    assert len(urls) == 3 and max_workers == tm._OSM_API_CONCURRENCY
+    assert urls[0].endswith("changesets=" + ",".join(str(i) for i in range(1, 101)))
+    assert [cs["id"] for cs in changesets] == ["100", "200", "250"]
+
+
+def test_mirror_health_orders_by_expected_latency():
+    health = {}
+    for outcome, seconds in [("ok", 10.0), ("ok", 20.0), ("cancelled", 1.0)]:
+        tm.record_mirror_outcome(health, "https://a", outcome, seconds)
+    tm.record_mirror_outcome(health, "https://b", "error", 1.0)
+    tm.record_mirror_outcome(health, "https://c", "ok", 5.0)
+
+    assert health["https://a"]["latency_s"] == 13.0
+    assert (health["https://a"]["ok"], health["https://a"]["cancelled"]) == (2, 1)
+    assert health["https://a"]["last_outcome"] == "cancelled"
+    assert tm.order_mirrors(["https://d", "https://b", "https://a", "https://c"],
+                            health) == ["https://c", "https://a", "https://d", "https://b"]
+
+
+def test_query_overpass_records_attempts_and_tries_healthy_mirrors_first(tmp_path):
+    health_file = tmp_path / "mirrors.json"
+    tried = []
+
+    def fetch(url, data):
+        tried.append(url)
+        if url == tm.OVERPASS_URLS[0]:
+            raise RuntimeError("timed out")
+        return {"elements": [], "url": url}
+
+    assert tm.query_overpass("out;", fetch=fetch, health_file=health_file)["url"] == \
+        tm.OVERPASS_URLS[1]
+    health = tm.load_mirror_health(health_file)
+    assert (health[tm.OVERPASS_URLS[0]]["error"], health[tm.OVERPASS_URLS[1]]["ok"]) == (1, 1)
+
+    tried.clear()
+    tm.query_overpass("out;", fetch=fetch, health_file=health_file)
+    assert tried == [tm.OVERPASS_URLS[1]]
+
+
+def test_race_overpass_races_healthiest_mirrors_and_records_outcomes(tmp_path, monkeypatch):
+    health_file = tmp_path / "mirrors.json"
+    tm.save_mirror_health({tm.OVERPASS_URLS[2]: {"ok": 3, "error": 0, "latency_s": 4.0}},
+                          health_file)
+    calls = []
+
+    def fake_race_requests(urls, data, max_parallel, stagger, stream, on_outcome):
+        calls.append((urls, max_parallel, stagger, stream))
+        on_outcome(urls[0], "ok", 2.0)
+        on_outcome(urls[1], "cancelled", 2.0)
+        return urls[0], {"elements": []}
+
+    monkeypatch.setattr(tm, "race_requests", fake_race_requests)
+
+    assert tm.race_overpass("out;", racers=3, stagger=1.5, health_file=health_file) == {
+        "elements": []}
+    urls, max_parallel, stagger, stream = calls[0]
+    assert urls[0] == tm.OVERPASS_URLS[2] and sorted(urls) == sorted(tm.OVERPASS_URLS)
+    assert (max_parallel, stagger, stream) == (3, 1.5, False)
+    health = tm.load_mirror_health(health_file)
+    assert health[tm.OVERPASS_URLS[2]]["latency_s"] == 3.4
+    assert health[urls[1]]["cancelled"] == 1
+
+
+def test_race_overpass_offline_cache_miss_returns_none(tmp_path, monkeypatch):
+    def fake_race_requests(*args, **kwargs):
+        raise tm.CacheMissError("not cached")
+
+    monkeypatch.setattr(tm, "race_requests", fake_race_requests)
+
+    assert tm.race_overpass("out;", health_file=None) is None
+
+
+def test_query_overpass_serves_cached_answers_without_recording_health(
+        tmp_path, response_cache):
+    health_file = tmp_path / "mirrors.json"
+    body = tm.urllib.parse.urlencode({"data": "out;"}).encode("utf-8")
+    response_cache.cache_store(tm.OVERPASS_URLS[0], body, b'{"elements": []}')
+
+    def fetch(url, data):
+        assert response_cache.is_cached(url, data)
+        return response_cache.fetch_json(url, data=data)
+
+    for _ in range(3):
+        assert tm.query_overpass("out;", fetch=fetch, health_file=health_file) == {
+            "elements": []}
+    assert not health_file.exists()
+
+
+def test_pinned_overpass_urls_are_not_tracked(tmp_path):
+    health_file = tmp_path / "mirrors.json"
+
+    result = tm.query_overpass("out;", urls=["https://pinned.example/api/interpreter"],
+                               fetch=lambda url, data: {"elements": []},
+                               health_file=health_file)
+
+    assert result == {"elements": []} and not health_file.exists()
+
+
+def test_mirror_recorder_saves_a_snapshot(tmp_path, monkeypatch):
+    health = {}
+    record, save = tm._mirror_recorder(health, tmp_path / "mirrors.json")
+    record("https://a", "ok", 1.0)
+    written = []
+
+    def save_while_recording(snapshot, path):
+        record("https://late", "cancelled", 9.0)  # an attempt finishing mid-write
+        written.append(list(snapshot))
+
+    monkeypatch.setattr(tm, "save_mirror_health", save_while_recording)
+    save()
+
+    assert written == [["https://a"]] and set(health) == {"https://a", "https://late"}